@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+import os
+import statistics
+import subprocess
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# measures the import time and the memory of fresh interpreters importing ccxt
+# the exchange classes are imported on first access, 'from ccxt import *' imports all of them
+# usage: python import-time-benchmark.py [runs]
+
+runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+cases = [
+    'import ccxt',
+    'import ccxt; ccxt.binance()',
+    'from ccxt import *',
+    'import ccxt.async_support',
+    'import ccxt.async_support; ccxt.async_support.binance()',
+    'import ccxt.pro',
+    'import ccxt.pro; ccxt.pro.binance()',
+]
+
+child = '''
+import resource, sys, time
+sys.path.insert(0, {path!r})
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+modules = len([name for name in sys.modules if name.startswith('ccxt')])
+print(elapsed * 1000, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, modules)
+'''
+
+for code in cases:
+    results = []
+    for i in range(runs):
+        output = subprocess.check_output([sys.executable, '-c', child.format(path=os.path.join(root, 'python'), code=code)])
+        results.append([float(value) for value in output.split()])
+    milliseconds = statistics.median(result[0] for result in results)
+    megabytes = statistics.median(result[1] for result in results)
+    modules = int(results[0][2])
+    print(f'{code:<56} {milliseconds:7.1f} ms {megabytes:6.1f} MB {modules:4d} ccxt modules')
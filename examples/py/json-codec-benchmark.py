@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from ccxt.base.json_codec import json_codecs, get_json_codec  # noqa: E402
+
+# decodes the recorded REST responses of ts/src/test/static/response with every installed codec
+# the recorded responses have their numbers quoted, numeric values are unquoted back to numbers
+# to get payloads closer to what exchanges send
+# usage: python json-codec-benchmark.py [runs]
+
+runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+payloads = []
+for path in sorted(glob.glob(os.path.join(root, 'ts', 'src', 'test', 'static', 'response', '*.json'))):
+    with open(path) as file:
+        recorded = json.load(file)
+    for method, cases in recorded['methods'].items():
+        for case in cases:
+            response = case.get('httpResponse')
+            if isinstance(response, (dict, list)):
+                payload = json.dumps(response, separators=(',', ':'))
+                unquoted = re.sub(r'(?<=[:\[,])"(-?\d+(?:\.\d+)?)"(?=[,\]}])', r'\1', payload)
+                try:
+                    json.loads(unquoted)
+                    payloads.append(unquoted)
+                except ValueError:
+                    # a string value that looked like a number list, keep it quoted
+                    payloads.append(payload)
+decoded = [json.loads(payload) for payload in payloads]
+size = sum(len(payload) for payload in payloads)
+print(f'{len(payloads)} payloads, {size / 1024:.0f} KiB, {runs} runs')
+
+
+def measure(method, inputs):
+    start = time.perf_counter()
+    for i in range(runs):
+        for value in inputs:
+            method(value)
+    return (time.perf_counter() - start) / runs * 1000
+
+
+for name, (codec, module) in json_codecs.items():
+    if module is None:
+        print(f'{name:>8}: not installed')
+        continue
+    codec = get_json_codec(name)
+    loads = measure(codec.loads, payloads)
+    loads_quoted = measure(codec.loads_quoted, payloads)
+    dumps = measure(codec.dumps, decoded)
+    print(f'{name:>8}: loads {loads:.1f}ms, loads_quoted {loads_quoted:.1f}ms, dumps {dumps:.1f}ms')
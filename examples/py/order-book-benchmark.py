@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from ccxt.async_support.base.ws.order_book import OrderBook, SortedOrderBook  # noqa: E402
+
+# compares the order book engines on random diffs around a deep snapshot
+# the book is resolved (limited) once per message of updates_per_message deltas
+# usage: python order-book-benchmark.py [levels] [updates_per_message] [messages] [depth]
+
+levels = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+updates_per_message = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+messages = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+depth = int(sys.argv[4]) if len(sys.argv) > 4 else None
+
+random.seed(0)
+snapshot = {
+    'bids': [[10000 - i * 0.5, 1.0] for i in range(levels)],
+    'asks': [[10001 + i * 0.5, 1.0] for i in range(levels)],
+}
+deltas = []
+for i in range(updates_per_message * messages):
+    side = random.choice(['bids', 'asks'])
+    offset = random.randint(0, 2 * levels) * 0.25
+    price = 10000 - offset if side == 'bids' else 10001 + offset
+    deltas.append((side, price, random.choice([0, 1.0, 2.0])))
+
+
+def run(engine):
+    book = engine(snapshot, depth)
+    start = time.perf_counter()
+    for i in range(messages):
+        for side, price, size in deltas[i * updates_per_message:(i + 1) * updates_per_message]:
+            book[side].store(price, size)
+        book.limit()
+    elapsed = time.perf_counter() - start
+    print(f'{engine.__name__:>16}: {1000000 * elapsed / messages:.1f}us per message, {1000000000 * elapsed / len(deltas):.0f}ns per delta')
+
+
+print(f'{levels} levels, {updates_per_message} deltas per message, {messages} messages, depth {depth}')
+for engine in [OrderBook, SortedOrderBook]:
+    run(engine)
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+import ccxt  # noqa: E402
+
+# measures set_markets() with thousands of spot, swap and option markets
+# usage: python set-markets-benchmark.py [markets] [runs]
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+
+def market(i):
+    base = 'C' + str(i % (count // 4 + 1))
+    kind = ['spot', 'swap', 'option'][i % 3]
+    symbol = base + '/USDT' + ('' if kind == 'spot' else ':USDT') + ('-240628-' + str(i) + '-C' if kind == 'option' else '')
+    return {
+        'id': symbol.replace('/', '').replace(':', '_'),
+        'symbol': symbol,
+        'base': base,
+        'quote': 'USDT',
+        'settle': None if kind == 'spot' else 'USDT',
+        'baseId': base,
+        'quoteId': 'USDT',
+        'type': kind,
+        'spot': kind == 'spot',
+        'swap': kind == 'swap',
+        'option': kind == 'option',
+        'contract': kind != 'spot',
+        'linear': None if kind == 'spot' else True,
+        'inverse': None if kind == 'spot' else False,
+        'active': True,
+        'precision': {'amount': 0.001, 'price': 0.01},
+        'limits': {'amount': {'min': 0.001, 'max': 1000}, 'cost': {'min': 5}},
+        'info': {'symbol': symbol, 'status': 'TRADING', 'filters': [{'filterType': 'PRICE_FILTER', 'tickSize': '0.01'}]},
+    }
+
+
+markets = [market(i) for i in range(count)]
+for exchange_id in ['binance', 'okx', 'deribit']:
+    results = []
+    for i in range(runs):
+        exchange = getattr(ccxt, exchange_id)()
+        start = time.perf_counter()
+        exchange.set_markets(markets)
+        results.append(time.perf_counter() - start)
+    print(f'{exchange_id:<10} {count} markets {min(results) * 1000:8.1f} ms')
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from ccxt.async_support.base.throttler import Throttler  # noqa: E402
+
+# compares the event loop CPU usage of the throttler modes
+# every throttler emulates one exchange instance sending requests as fast as its rate limit allows
+# usage: python throttler-benchmark.py [num_throttlers] [rate_limit_ms] [duration_seconds]
+
+num_throttlers = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+rate_limit = float(sys.argv[2]) if len(sys.argv) > 2 else 50
+duration = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+
+async def client(throttler, deadline, counter):
+    while time.perf_counter() < deadline:
+        await throttler(1)
+        counter[0] += 1
+
+
+async def run(mode):
+    throttlers = [Throttler({'refillRate': 1 / rate_limit, 'mode': mode}) for _ in range(num_throttlers)]
+    counter = [0]
+    deadline = time.perf_counter() + duration
+    cpu_start = time.process_time()
+    await asyncio.gather(*[client(throttler, deadline, counter) for throttler in throttlers])
+    cpu = time.process_time() - cpu_start
+    print(f'{mode:>8}: {counter[0]} requests in {duration}s ({counter[0] / duration:.0f} req/s), {cpu:.3f}s CPU ({100 * cpu / duration:.1f}% of one core)')
+
+
+async def main():
+    print(f'{num_throttlers} throttlers, rateLimit {rate_limit}ms, {duration}s per mode')
+    for mode in ['polling', 'timer']:
+        await run(mode)
+
+
+asyncio.run(main())
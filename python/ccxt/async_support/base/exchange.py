@@ -15,12 +15,13 @@ import ssl
 import sys
 import yarl
 import math
+import copy
 from typing import Any, List
 from ccxt.base.types import Int, Str, Num
 
 # -----------------------------------------------------------------------------
 
-from ccxt.async_support.base.throttler import Throttler
+from ccxt.async_support.base.throttler import Throttler, MultiThrottler, shared_throttler
 
 # -----------------------------------------------------------------------------
 
@@ -30,6 +31,8 @@ from ccxt.base.types import OrderType, OrderSide, OrderRequest
 # -----------------------------------------------------------------------------
 
 from ccxt.base.exchange import Exchange as BaseExchange, ArgumentsRequired
+from ccxt.base.market_registry import market_registry
+from ccxt.base.decimal_to_precision import TICK_SIZE, DECIMAL_PLACES
 
 # -----------------------------------------------------------------------------
 
@@ -37,6 +40,10 @@ from ccxt.async_support.base.ws.functions import inflate, inflate64, gunzip
 from ccxt.async_support.base.ws.fast_client import FastClient
 from ccxt.async_support.base.ws.future import Future
 from ccxt.async_support.base.ws.order_book import OrderBook, IndexedOrderBook, CountedOrderBook
+from ccxt.async_support.base.ws.order_book import SortedOrderBook, SortedIndexedOrderBook, SortedCountedOrderBook
+from ccxt.async_support.base.ws.order_book import QueuedOrderBook, FixedPointOrderBook, FixedPointCountedOrderBook, FixedPointIndexedOrderBook
+from ccxt.async_support.base.ws.checksum import OrderBookChecksum
+from ccxt.async_support.base.ws.stream import Stream, Callback, current_listener, get_current_listener
 
 
 # -----------------------------------------------------------------------------
@@ -65,6 +72,7 @@ class Exchange(BaseExchange):
     ping = None
     newUpdates = True
     clients = {}
+    tokenBuckets = None  # extra named token buckets for weighted multi-bucket costs
 
     def __init__(self, config={}):
         if 'asyncio_loop' in config:
@@ -78,9 +86,39 @@ class Exchange(BaseExchange):
         self.init_rest_rate_limiter()
         self.markets_loading = None
         self.reloading_markets = False
+        self.markets_refreshing = None
 
     def init_rest_rate_limiter(self):
-        self.throttle = Throttler(self.tokenBucket, self.asyncio_loop)
+        self.throttle = self.create_rate_limiter()
+
+    def create_rate_limiter(self):
+        throttler = self.create_token_bucket(self.tokenBucket)
+        if not self.tokenBuckets:
+            return throttler
+        throttlers = {'default': throttler}
+        for key in self.tokenBuckets:
+            throttlers[key] = self.create_token_bucket(self.extend(self.omit(self.tokenBucket, 'name'), self.tokenBuckets[key]))
+        return MultiThrottler(throttlers, self.asyncio_loop)
+
+    def create_token_bucket(self, config):
+        # a named bucket is shared with the other instances and ws clients using the same name
+        name = config.get('name')
+        if name is None:
+            return Throttler(config, self.asyncio_loop)
+        return shared_throttler(name, config, self.asyncio_loop)
+
+    def token_buckets_cost(self, cost, config={}):
+        # the endpoints charge the extra buckets in their api config, like
+        # 'order': {'cost': 0.2, 'tokenBuckets': {'orders': 1}}
+        # the buckets the instance has not declared in tokenBuckets are not charged
+        costs = self.safe_dict(config, 'tokenBuckets') if self.tokenBuckets else None
+        if not costs:
+            return cost
+        result = {'default': cost}
+        for key in costs:
+            if key in self.tokenBuckets:
+                result[key] = costs[key]
+        return result
 
     def get_event_loop(self):
         return self.asyncio_loop
@@ -106,7 +144,7 @@ class Exchange(BaseExchange):
                 self.asyncio_loop = asyncio.get_running_loop()
             else:
                 self.asyncio_loop = asyncio.get_event_loop()
-            self.throttle.loop = self.asyncio_loop
+            self.throttle.bind(self.asyncio_loop)
 
         if self.ssl_context is None:
             # Create our SSL context object with our CA cert file
@@ -118,6 +156,9 @@ class Exchange(BaseExchange):
             self.session = aiohttp.ClientSession(loop=self.asyncio_loop, connector=connector, trust_env=self.aiohttp_trust_env)
 
     async def close(self):
+        if self.markets_refreshing is not None:
+            self.markets_refreshing.cancel()
+            self.markets_refreshing = None
         await self.ws_close()
         if self.session is not None:
             if self.own_session:
@@ -212,6 +253,8 @@ class Exchange(BaseExchange):
                         headers[header] = raw_headers[header]
                 http_status_code = response.status
                 http_status_text = response.reason
+                if self.adaptiveRateLimit and self.rateLimitHeaders:
+                    self.adapt_rate_limiter(http_status_code, headers, url)
                 http_response = self.on_rest_response(http_status_code, http_status_text, url, method, headers, http_response, request_headers, request_body)
                 json_response = self.parse_json(http_response)
                 if self.enableLastHttpResponse:
@@ -250,17 +293,81 @@ class Exchange(BaseExchange):
             return http_response
         return response.content
 
+    def adapt_rate_limiter(self, status_code, headers, url=None):
+        # the refill rate is rescaled first, the pause ends at a fixed time whatever the rate
+        factor, pause = self.parse_rate_limit_headers(status_code, headers, url)
+        throttler = self.throttle.throttlers['default'] if isinstance(self.throttle, MultiThrottler) else self.throttle
+        if factor is not None:
+            throttler.set_refill_rate(self.tokenBucket['refillRate'] * factor)
+        if pause is not None:
+            throttler.pause(pause)
+
     async def load_markets_helper(self, reload=False, params={}):
         if not reload:
             if self.markets:
                 if not self.markets_by_id:
                     return self.set_markets(self.markets)
                 return self.markets
-        currencies = None
-        if self.has['fetchCurrencies'] is True:
-            currencies = await self.fetch_currencies()
-        markets = await self.fetch_markets(params)
-        return self.set_markets(markets, currencies)
+        key = self.markets_key(params) if (self.markets_cache or self.shareMarkets) else None
+        if key is not None and not reload:
+            if await self.wait_shared_markets(key):
+                return self.markets
+            if self.markets_cache:
+                # with refresh, an expired cache file is used while the markets are fetched again in the background
+                options = copy.deepcopy(self.options)
+                age = self.read_markets_cache(key, None if self.markets_cache.refresh else self.markets_cache.ttl)
+                if age is not None:
+                    if age >= self.markets_cache.ttl:
+                        self.markets_refreshing = asyncio.ensure_future(self.refresh_markets(key, params, options))
+                    if self.safe_bool(self.options, 'adjustForTimeDifference'):
+                        # the time difference stored with the markets is outdated
+                        await self.load_time_difference()
+                    return self.markets
+        loading = None
+        if key is not None and self.shareMarkets:
+            # the other instances wait for these markets, see wait_shared_markets
+            loading = (asyncio.get_running_loop(), asyncio.Event())
+            market_registry.loading[(self.id, key)] = loading
+        try:
+            options = copy.deepcopy(self.options) if key is not None else None
+            currencies = None
+            if self.has['fetchCurrencies'] is True:
+                currencies = await self.fetch_currencies()
+            markets = await self.fetch_markets(params)
+            result = self.set_markets(markets, currencies)
+            if key is not None:
+                self.markets_loaded(key, self.changed_options(options))
+        finally:
+            if loading is not None:
+                if market_registry.loading.get((self.id, key)) is loading:
+                    del market_registry.loading[(self.id, key)]
+                loading[1].set()
+        return result
+
+    async def wait_shared_markets(self, key):
+        # sets the markets loaded or being fetched by another instance of the event loop, returns False if there are none
+        if not self.shareMarkets:
+            return False
+        loading = market_registry.loading.get((self.id, key))
+        if loading is not None and loading[0] is asyncio.get_running_loop():
+            await loading[1].wait()
+        return self.read_shared_markets(key)
+
+    async def refresh_markets(self, key, params={}, options={}):
+        # replaces the markets read from an expired cache file, they are kept if they cannot be fetched
+        # options are the options before the file was read, to find the ones changed by fetching the markets
+        try:
+            currencies = None
+            if self.has['fetchCurrencies'] is True:
+                currencies = await self.fetch_currencies()
+            markets = await self.fetch_markets(params)
+        except Exception as e:
+            self.logger.warning(self.id + ' could not refresh the cached markets: ' + str(e))
+            return
+        finally:
+            self.markets_refreshing = None
+        self.set_markets(markets, currencies)
+        self.markets_loaded(key, self.changed_options(options))
 
     async def load_markets(self, reload=False, params={}):
         if (reload and not self.reloading_markets) or not self.markets_loading:
@@ -354,17 +461,82 @@ class Exchange(BaseExchange):
         return gunzip(data)
 
     def order_book(self, snapshot={}, depth=None):
+        engine = self.handle_option('watchOrderBook', 'orderBookEngine')
+        if engine == 'sorted':
+            return SortedOrderBook(snapshot, depth)
+        elif engine == 'fixed':
+            decimals = self.fixed_point_decimals(snapshot)
+            if decimals is not None:
+                return FixedPointOrderBook(snapshot, depth, *decimals)
         return OrderBook(snapshot, depth)
 
     def indexed_order_book(self, snapshot={}, depth=None):
+        engine = self.handle_option('watchOrderBook', 'orderBookEngine')
+        if engine == 'sorted':
+            return SortedIndexedOrderBook(snapshot, depth)
+        elif engine == 'queued':
+            return QueuedOrderBook(snapshot, depth)
+        elif engine == 'fixed':
+            decimals = self.fixed_point_decimals(snapshot)
+            if decimals is not None:
+                return FixedPointIndexedOrderBook(snapshot, depth, *decimals)
         return IndexedOrderBook(snapshot, depth)
 
+    def queued_order_book(self, snapshot={}, depth=None):
+        return QueuedOrderBook(snapshot, depth)
+
+    def fixed_point_order_book(self, symbol, snapshot={}, depth=None):
+        precision = self.market(symbol)['precision']
+        return FixedPointOrderBook(snapshot, depth, self.precision_decimals(precision['price']), self.precision_decimals(precision['amount']))
+
+    def order_book_checksum(self, config={}):
+        every = self.handle_option('watchOrderBook', 'checksumEvery', 1)
+        return OrderBookChecksum(self.extend({'every': every}, config))
+
+    def verify_order_book_checksum(self, orderbook, expected, config={}):
+        # keeps the formatted levels of the last check on the orderbook
+        if orderbook.checksum is None:
+            orderbook.checksum = self.order_book_checksum(config)
+        return orderbook.checksum.verify(orderbook, expected)
+
+    def precision_decimals(self, precision):
+        # the number of decimals of a market precision, for fixed point representations
+        if precision is None:
+            raise NotSupported(self.id + ' fixed point order books require the market precision')
+        if self.precisionMode == TICK_SIZE:
+            return max(self.precision_from_string(self.number_to_string(precision)), 0)
+        elif self.precisionMode == DECIMAL_PLACES:
+            return int(precision)
+        raise NotSupported(self.id + ' fixed point order books require the TICK_SIZE or DECIMAL_PLACES precision mode')
+
     def counted_order_book(self, snapshot={}, depth=None):
+        engine = self.handle_option('watchOrderBook', 'orderBookEngine')
+        if engine == 'sorted':
+            return SortedCountedOrderBook(snapshot, depth)
+        elif engine == 'fixed':
+            decimals = self.fixed_point_decimals(snapshot)
+            if decimals is not None:
+                return FixedPointCountedOrderBook(snapshot, depth, *decimals)
         return CountedOrderBook(snapshot, depth)
 
-    def client(self, url):
+    def fixed_point_decimals(self, snapshot):
+        # the decimals of the precision of the market of a snapshot
+        # None if the symbol or its precision is not known, the 'fixed' engine then creates a float book
+        symbol = snapshot.get('symbol') if snapshot else None
+        market = self.markets.get(symbol) if (symbol is not None) and self.markets else None
+        precision = self.safe_dict(market, 'precision', {})
+        if (precision.get('price') is None) or (precision.get('amount') is None):
+            return None
+        return self.precision_decimals(precision['price']), self.precision_decimals(precision['amount'])
+
+    def client(self, url, shard=None):
+        # the exchange code takes the client of a url without a shard to authenticate or to keep state on it
+        # that connection is pinned, see pooled_client
+        pinned = shard is None
+        shard = shard or 0
         self.clients = self.clients or {}
-        if url not in self.clients:
+        key = self.client_key(url, shard)
+        if key not in self.clients:
             on_message = self.handle_message
             on_error = self.on_error
             on_close = self.on_close
@@ -375,12 +547,64 @@ class Exchange(BaseExchange):
                 'log': getattr(self, 'log'),
                 'ping': getattr(self, 'ping', None),
                 'verbose': self.verbose,
-                'throttle': Throttler(self.tokenBucket, self.asyncio_loop),
+                'throttle': self.create_rate_limiter(),
+                'json_codec': self.json_codec,
                 'asyncio_loop': self.asyncio_loop,
+                'shard': shard,
             }, ws_options)
-            self.clients[url] = FastClient(url, on_message, on_error, on_close, on_connected, options)
-            self.clients[url].proxy = self.get_ws_proxy()
-        return self.clients[url]
+            self.clients[key] = FastClient(url, on_message, on_error, on_close, on_connected, options)
+            self.clients[key].proxy = self.get_ws_proxy()
+        if pinned:
+            self.clients[key].pinned = True
+        return self.clients[key]
+
+    @staticmethod
+    def client_key(url, shard=0):
+        # the first connection to a url is keyed by the url in self.clients
+        return url if not shard else url + '#' + str(shard)
+
+    def pooled_client(self, url, subscribe_hashes, message_hashes=[]):
+        # connection sharding, spreads the subscriptions to a url over several connections
+        # streaming/options['ws'] maxStreamsPerConnection opens a new connection when the others are full
+        # connectionsPerUrl spreads the subscriptions over that many connections from the start
+        ws_options = self.safe_value(self.options, 'ws', {})
+        max_streams = self.safe_integer(ws_options, 'maxStreamsPerConnection', self.safe_integer(self.streaming, 'maxStreamsPerConnection'))
+        connections = self.safe_integer(ws_options, 'connectionsPerUrl', self.safe_integer(self.streaming, 'connectionsPerUrl', 1))
+        if max_streams is None and connections <= 1:
+            return self.client(url, 0)
+        # the requests that subscribe to nothing (authentication, ws orders) are sent over the first connection
+        subscribe_hashes = [subscribe_hash for subscribe_hash in subscribe_hashes if subscribe_hash is not None]
+        self.clients = self.clients or {}
+        shards = {}
+        for client in self.clients.values():
+            if client.url == url:
+                shards[client.shard] = client
+        # a subscription stays on the connection it was sent over
+        for client in shards.values():
+            for subscribe_hash in subscribe_hashes:
+                if subscribe_hash in client.subscriptions:
+                    return client
+            for message_hash in message_hashes:
+                if message_hash in client.futures:
+                    return client
+        # the new subscriptions to a url whose first connection was authenticated by the exchange follow it
+        # an exchange authenticates the connection it takes with client(url), the other ones are public
+        if not subscribe_hashes or (0 in shards and shards[0].pinned):
+            return self.client(url, 0)
+        # otherwise the least loaded connection, the subscriptions of a closed connection
+        # are spread over the remaining ones as they are watched again
+        best = None
+        best_streams = None
+        for shard in sorted(set(range(connections)) | set(shards)):
+            streams = len(shards[shard].subscriptions) if shard in shards else 0
+            if best is None or streams < best_streams:
+                best = shard
+                best_streams = streams
+        if max_streams is not None and best_streams and best_streams + len(subscribe_hashes) > max_streams:
+            best = connections
+            while best in shards:
+                best += 1
+        return self.client(url, best)
 
     def get_ws_proxy(self):
         httpProxy, httpsProxy, socksProxy = self.check_ws_proxy_settings()
@@ -395,6 +619,17 @@ class Exchange(BaseExchange):
     def delay(self, timeout, method, *args):
         return self.asyncio_loop.call_later(timeout / 1000, self.spawn, method, *args)
 
+    def route_message(self, client, message, event):
+        # the transpiled route_message with a plain dict lookup, it runs for every message
+        table = self.messageRoutesTable
+        if table is None:
+            table = self.messageRoutesTable = self.message_routes()
+        handler = table.get(event)
+        if handler is None:
+            return False
+        handler(client, message)
+        return True
+
     def handle_message(self, client, message):
         always = True
         if always:
@@ -405,7 +640,10 @@ class Exchange(BaseExchange):
         # base exchange self.open starts the aiohttp Session in an async context
         self.open()
         backoff_delay = 0
-        client = self.client(url)
+        client = self.pooled_client(url, subscribe_hashes or [], message_hashes)
+        listener = get_current_listener()
+        if listener is not None:
+            listener.attach(client, message_hashes)
 
         future = Future.race([client.future(message_hash) for message_hash in message_hashes])
 
@@ -444,7 +682,10 @@ class Exchange(BaseExchange):
         # base exchange self.open starts the aiohttp Session in an async context
         self.open()
         backoff_delay = 0
-        client = self.client(url)
+        client = self.pooled_client(url, [subscribe_hash], [message_hash])
+        listener = get_current_listener()
+        if listener is not None:
+            listener.attach(client, [message_hash])
         if subscribe_hash is None and message_hash in client.futures:
             return client.futures[message_hash]
         future = client.future(message_hash)
@@ -478,14 +719,71 @@ class Exchange(BaseExchange):
 
         return future
 
+    async def stream(self, method, *args, max_size=None, overflow=None):
+        # an async iterator over every update of a watch method, instead of calling it in a loop, see Stream
+        # options['stream'] sets the default maxSize and overflow policy: 'dropOldest', 'coalesce' or 'block'
+        options = self.safe_value(self.options, 'stream', {})
+        max_size = max_size or self.safe_integer(options, 'maxSize', 1000)
+        overflow = overflow or self.safe_string(options, 'overflow', 'dropOldest')
+        if overflow not in Stream.overflows:
+            raise NotSupported(self.id + ' stream() overflow must be one of ' + ', '.join(Stream.overflows))
+        await self.load_markets()
+        return await self.listen(Stream(max_size, overflow, self.listened_symbol(args)), method, args)
+
+    async def on(self, method, callback, *args):
+        # calls callback(value) on every update of a watch method, from the message handler, see Callback
+        await self.load_markets()
+        return await self.listen(Callback(callback, self.listened_symbol(args)), method, args)
+
+    async def on_order_book(self, symbol, callback, limit=None, params={}):
+        return await self.on('watch_order_book', callback, symbol, limit, params)
+
+    async def on_trades(self, symbol, callback, since=None, limit=None, params={}):
+        return await self.on('watch_trades', callback, symbol, since, limit, params)
+
+    async def on_ticker(self, symbol, callback, params={}):
+        return await self.on('watch_ticker', callback, symbol, params)
+
+    async def on_ohlcv(self, symbol, callback, timeframe='1m', since=None, limit=None, params={}):
+        return await self.on('watch_ohlcv', callback, symbol, timeframe, since, limit, params)
+
+    def listened_symbol(self, args):
+        return args[0] if args and isinstance(args[0], str) and args[0] in self.markets else None
+
+    async def listen(self, listener, method, args):
+        # attaches the listener to the message hashes of the last watch call of the method
+        # the first update is passed on as well
+        listener.task = asyncio.current_task()
+        token = current_listener.set(listener)
+        try:
+            await getattr(self, method)(*args)
+        except Exception:
+            listener.detach()
+            raise
+        finally:
+            current_listener.reset(token)
+            listener.task = None
+        if not listener.clients:
+            raise NotSupported(self.id + ' ' + method + '() cannot be listened to')
+        return listener
+
+    def ws_metrics(self):
+        # the metrics of the connections opened with the collectMetrics streaming option, by url, see ConnectionMetrics
+        result = {}
+        for key, client in (self.clients or {}).items():
+            if client.metrics is not None:
+                result[key] = client.metrics.snapshot()
+        return result
+
     def on_connected(self, client, message=None):
         # for user hooks
         # print('Connected to', client.url)
         pass
 
     def on_error(self, client, error):
-        if client.url in self.clients and self.clients[client.url].error:
-            del self.clients[client.url]
+        key = self.client_key(client.url, client.shard)
+        if key in self.clients and self.clients[key].error:
+            del self.clients[key]
 
     def on_close(self, client, error):
         if client.error:
@@ -493,8 +791,9 @@ class Exchange(BaseExchange):
             pass
         else:
             # server disconnected a working connection
-            if client.url in self.clients:
-                del self.clients[client.url]
+            key = self.client_key(client.url, client.shard)
+            if key in self.clients:
+                del self.clients[key]
 
     async def ws_close(self):
         if self.clients:
@@ -522,7 +821,7 @@ class Exchange(BaseExchange):
                     return
                 tries += 1
             client.reject(ExchangeError(self.id + ' nonce is behind cache after ' + str(maxRetries) + ' tries.'), messageHash)
-            del self.clients[client.url]
+            del self.clients[self.client_key(client.url, client.shard)]
         except BaseError as e:
             client.reject(e, messageHash)
             await self.load_order_book(client, messageHash, symbol, limit, params)
@@ -804,7 +1103,7 @@ class Exchange(BaseExchange):
     async def fetch2(self, path, api: Any = 'public', method='GET', params={}, headers: Any = None, body: Any = None, config={}):
         if self.enableRateLimit:
             cost = self.calculate_rate_limiter_cost(api, method, path, params, config)
-            await self.throttle(cost)
+            await self.throttle(self.token_buckets_cost(cost, config))
         self.lastRestRequestTimestamp = self.milliseconds()
         request = self.sign(path, api, method, params, headers, body)
         self.last_request_headers = request['headers']
@@ -13,17 +13,40 @@ class Throttler:
             'tokens': 0,
             'maxCapacity': 2000,
             'capacity': 1.0,
+            # 'polling' wakes up every `delay` seconds to refill the bucket
+            # 'timer' sleeps once until the tokens for the next request are available
+            'mode': 'polling',
+            # an external token bucket like SharedMemoryTokenBucket, shared with other processes
+            'backend': None,
         }
         self.config.update(config)
         self.queue = collections.deque()
         self.running = False
+        self.waiter = None
+        self.timestamp = None
+        self.paused_until = 0
+
+    def refill(self):
+        # adds the tokens refilled since the last call up to the capacity, nothing is refilled during a pause
+        now = time() * 1000
+        if self.timestamp is not None and self.config['tokens'] < self.config['capacity']:
+            elapsed = now - max(self.timestamp, self.paused_until)
+            if elapsed > 0:
+                self.config['tokens'] = min(self.config['tokens'] + elapsed * self.config['refillRate'], self.config['capacity'])
+        self.timestamp = now
 
     async def looper(self):
-        last_timestamp = time() * 1000
+        self.refill()
         while self.running:
             future, cost = self.queue[0]
             cost = self.config['cost'] if cost is None else cost
-            if self.config['tokens'] >= 0:
+            if future.cancelled():
+                # the caller gave up waiting, the request is never sent so it costs nothing
+                self.queue.popleft()
+                if len(self.queue) == 0:
+                    self.running = False
+            elif self.config['tokens'] >= 0 and not self.paused():
+                self.refill()
                 self.config['tokens'] -= cost
                 if not future.done():
                     future.set_result(None)
@@ -33,14 +56,95 @@ class Throttler:
                 if len(self.queue) == 0:
                     self.running = False
             else:
-                await asyncio.sleep(self.config['delay'])
-                now = time() * 1000
-                elapsed = now - last_timestamp
-                last_timestamp = now
-                self.config['tokens'] = min(self.config['tokens'] + elapsed * self.config['refillRate'], self.config['capacity'])
+                if self.config['mode'] == 'timer':
+                    await self.sleep_until_refilled(future)
+                else:
+                    await asyncio.sleep(self.config['delay'])
+                self.refill()
+
+    async def sleep_until_refilled(self, head):
+        # the tokens are negative or the queue is paused here, the bucket is refilled at refillRate tokens per millisecond
+        # so we know exactly when the head of the queue can proceed and schedule a single wakeup
+        delay = max(-self.config['tokens'] / self.config['refillRate'], self.paused_until - time() * 1000) / 1000
+        loop = self.loop or asyncio.get_event_loop()
+        self.waiter = loop.create_future()
+        handle = loop.call_later(max(delay, self.config['delay']), self.wakeup)
+        # wake up early if the head of the queue is cancelled
+        head.add_done_callback(self.wakeup)
+        try:
+            await self.waiter
+        finally:
+            handle.cancel()
+            head.remove_done_callback(self.wakeup)
+            self.waiter = None
+
+    def wakeup(self, *args):
+        # interrupts the timer sleep, the looper recalculates the delay
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(None)
+
+    def pause(self, milliseconds):
+        # holds back every queued request for the given time, used for retry-after responses
+        # the end of the pause does not depend on the refill rate, set_refill_rate() does not move it
+        self.refill()
+        self.paused_until = max(self.paused_until, time() * 1000 + milliseconds)
+        self.wakeup()
+
+    def paused(self):
+        return self.paused_until > time() * 1000
+
+    def set_refill_rate(self, refill_rate):
+        self.refill()
+        self.config['refillRate'] = refill_rate
+        # a pending timer sleep was computed with the old rate
+        self.wakeup()
+
+    def bind(self, loop):
+        # a throttler serves the futures of one event loop, a shared one is bound by the first instance to open
+        # and rebound only once that loop is closed
+        if loop is None or loop is self.loop:
+            return
+        if self.loop is not None and not self.loop.is_closed():
+            raise RuntimeError('throttler is already bound to another running event loop, use another token bucket name for each event loop')
+        self.loop = loop
+
+    def available(self):
+        # true if a request can be sent right now
+        if self.paused():
+            return False
+        if self.config['backend'] is not None:
+            return self.config['backend'].reserve(0) <= 0
+        self.refill()
+        return self.config['tokens'] >= 0
+
+    def charge(self, cost):
+        # takes the tokens without waiting, the caller has checked available()
+        cost = self.config['cost'] if cost is None else cost
+        if self.config['backend'] is not None:
+            self.config['backend'].reserve(cost)
+        else:
+            self.refill()
+            self.config['tokens'] -= cost
+
+    def reserve(self, future, cost):
+        # the backend hands out the delay, there is nothing to loop over
+        cost = self.config['cost'] if cost is None else cost
+        delay = max(self.config['backend'].reserve(cost), self.paused_until - time() * 1000)
+        if delay > 0:
+            loop = self.loop or asyncio.get_event_loop()
+            loop.call_later(delay / 1000, self.resolve, future)
+        else:
+            self.resolve(future)
+        return future
+
+    def resolve(self, future):
+        if not future.done():
+            future.set_result(None)
 
     def __call__(self, cost=None):
         future = asyncio.Future()
+        if self.config['backend'] is not None:
+            return self.reserve(future, cost)
         if len(self.queue) > self.config['maxCapacity']:
             raise RuntimeError('throttle queue is over maxCapacity (' + str(int(self.config['maxCapacity'])) + '), see https://github.com/ccxt/ccxt/issues/11645#issuecomment-1195695526')
         self.queue.append((future, cost))
@@ -48,3 +152,57 @@ class Throttler:
             self.running = True
             asyncio.ensure_future(self.looper(), loop=self.loop)
         return future
+
+
+# -----------------------------------------------------------------------------
+# named token buckets shared by all exchange instances and ws clients in the process
+# use the same name for the instances that spend the same budget (same account or egress ip)
+
+shared_throttlers = {}
+
+
+def shared_throttler(name, config, loop=None):
+    # the first instance to register the name defines the bucket config
+    if name not in shared_throttlers:
+        shared_throttlers[name] = Throttler(config)
+    shared_throttlers[name].bind(loop)
+    return shared_throttlers[name]
+
+
+# -----------------------------------------------------------------------------
+# charges a request against several token buckets at once
+# a numeric cost is charged to the 'default' bucket
+# a dict cost like {'default': 5, 'orders': 1} is charged to each of the named buckets
+
+
+class MultiThrottler:
+    def __init__(self, throttlers, loop=None):
+        self.throttlers = throttlers
+        self.loop = None
+        self.bind(loop)
+
+    def bind(self, loop):
+        for key in self.throttlers:
+            self.throttlers[key].bind(loop)
+        self.loop = loop or self.loop
+
+    async def acquire(self, cost):
+        # no bucket is charged while the request waits on another one
+        # each bucket is probed in turn with a zero cost, then all of them are charged at once if they all still have tokens
+        throttlers = [self.throttlers[key] for key in cost]
+        while True:
+            for throttler in throttlers:
+                await throttler(0)
+            if all(throttler.available() for throttler in throttlers):
+                break
+        for key in cost:
+            self.throttlers[key].charge(cost[key])
+
+    def __call__(self, cost=None):
+        if not isinstance(cost, dict):
+            return self.throttlers['default'](cost)
+        for key in cost:
+            if key not in self.throttlers:
+                raise RuntimeError('throttle cost refers to an unknown token bucket ' + str(key))
+        # the request proceeds once every bucket has enough tokens
+        return asyncio.ensure_future(self.acquire(cost), loop=self.loop)
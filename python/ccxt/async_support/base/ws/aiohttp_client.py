@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
 
-import json
-from asyncio import sleep, ensure_future
+from asyncio import ensure_future
+from time import perf_counter
 from aiohttp import WSMsgType
-from .functions import milliseconds, iso8601, is_json_encoded_object
+from .functions import milliseconds, iso8601, is_json_encoded_object, is_json_encoded_bytes
 from ccxt.async_support.base.ws.client import Client
-from ccxt.async_support.base.ws.functions import gunzip, inflate
+from ccxt.async_support.base.ws.heartbeat import get_heartbeat
+from ccxt.async_support.base.ws.functions import ungzip, inflate
 from ccxt import NetworkError, RequestTimeout, ExchangeClosedByUser
 
 
@@ -23,10 +24,28 @@ class AiohttpClient(Client):
     def handle_text_or_binary_message(self, data):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'message', data)
+        metrics = self.metrics
+        if metrics is not None:
+            started = metrics.receive(data)
         if isinstance(data, bytes):
-            data = data.decode()
-        decoded = json.loads(data) if is_json_encoded_object(data) else data
-        self.on_message_callback(self, decoded)
+            # json is parsed from the bytes directly, other payloads are passed on as text
+            # and the binary ones that are not text are passed on unchanged
+            if is_json_encoded_bytes(data):
+                decoded = self.json_codec.loads(data)
+            else:
+                try:
+                    decoded = data.decode()
+                except UnicodeDecodeError:
+                    decoded = data
+        else:
+            decoded = self.json_codec.loads(data) if is_json_encoded_object(data) else data
+        if metrics is not None:
+            decoded_at = perf_counter()
+            metrics.decode.add((decoded_at - started) * 1000000)
+            self.on_message_callback(self, decoded)
+            metrics.handler.add((perf_counter() - decoded_at) * 1000000)
+        else:
+            self.on_message_callback(self, decoded)
 
     def handle_message(self, message):
         # self.log(iso8601(milliseconds()), message)
@@ -35,7 +54,7 @@ class AiohttpClient(Client):
         elif message.type == WSMsgType.BINARY:
             data = message.data
             if self.gunzip:
-                data = gunzip(data)
+                data = ungzip(data)
             elif self.inflate:
                 data = inflate(data)
             self.handle_text_or_binary_message(data)
@@ -80,17 +99,14 @@ class AiohttpClient(Client):
     async def send(self, message):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'sending', message)
-        return await self.connection.send_str(message if isinstance(message, str) else json.dumps(message, separators=(',', ':')))
+        return await self.connection.send_str(message if isinstance(message, str) else self.json_codec.dumps(message))
 
     async def close(self, code=1000):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'closing', code)
         if not self.closed():
             await self.connection.close()
-        # these will end automatically once self.closed() = True
-        # so we don't need to cancel them
-        if self.ping_looper:
-            self.ping_looper.cancel()
+        get_heartbeat(self.asyncio_loop).remove(self)
         if self.receive_looper:
             self.receive_looper.cancel()  # cancel all pending futures stored in self.futures
         for key in self.futures:
@@ -100,25 +116,31 @@ class AiohttpClient(Client):
                     future.cancel()  # this is an "internal" future so we want to cancel it silently
                 else:
                     future.reject(ExchangeClosedByUser('Connection closed by the user'))
+        # the streams end once their queued values are consumed
+        for streams in list(self.streams.values()):
+            for stream in streams[:]:
+                stream.close()
 
-    async def ping_loop(self):
+    def keep_alive(self):
+        # called by the heartbeat every keepAlive ms, see Client.open
         if self.verbose:
-            self.log(iso8601(milliseconds()), 'ping loop')
-        while self.keepAlive and not self.closed():
-            now = milliseconds()
-            self.lastPong = now if self.lastPong is None else self.lastPong
-            if (self.lastPong + self.keepAlive * self.maxPingPongMisses) < now:
-                self.on_error(RequestTimeout('Connection to ' + self.url + ' timed out due to a ping-pong keepalive missing on time'))
-            # the following ping-clause is not necessary with aiohttp's built-in ws
-            # since it has a heartbeat option (see create_connection above)
-            # however some exchanges require a text-type ping message
-            # therefore we need this clause anyway
+            self.log(iso8601(milliseconds()), 'keep alive')
+        now = milliseconds()
+        self.lastPong = now if self.lastPong is None else self.lastPong
+        if (self.lastPong + self.keepAlive * self.maxPingPongMisses) < now:
+            self.on_error(RequestTimeout('Connection to ' + self.url + ' timed out due to a ping-pong keepalive missing on time'))
+        else:
+            ensure_future(self.send_ping(), loop=self.asyncio_loop)
+
+    async def send_ping(self):
+        # the following ping-clause is not necessary with aiohttp's built-in ws
+        # since it has a heartbeat option (see create_connection above)
+        # however some exchanges require a text-type ping message
+        # therefore we need this clause anyway
+        try:
+            if self.ping:
+                await self.send(self.ping(self))
             else:
-                if self.ping:
-                    try:
-                        await self.send(self.ping(self))
-                    except Exception as e:
-                        self.on_error(e)
-                else:
-                    await self.connection.ping()
-            await sleep(self.keepAlive / 1000)
+                await self.connection.ping()
+        except Exception as e:
+            self.on_error(e)
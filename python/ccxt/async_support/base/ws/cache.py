@@ -23,11 +23,15 @@ class BaseCache(list):
     __contains__ = Delegate('__contains__', '_deque')
     __reversed__ = Delegate('__reversed__', '_deque')
     clear = Delegate('clear', '_deque')
+    max_changes = 1000  # the changes kept by the caches without a max_size
 
     def __init__(self, max_size=None):
         super(BaseCache, self).__init__()
         self.max_size = max_size
         self._deque = collections.deque([], max_size)
+        # the number of append() calls and the entries they appended or updated, most recent last, see Listener
+        self.appends = 0
+        self.changes = collections.deque([], max_size or self.max_changes)
 
     def __eq__(self, other):
         return list(self) == other
@@ -83,6 +87,8 @@ class ArrayCache(BaseCache):
             return new_updates_value
 
     def append(self, item):
+        self.appends += 1
+        self.changes.append(item)
         self._deque.append(item)
         if self._clear_all_updates:
             self._clear_all_updates = False
@@ -111,11 +117,14 @@ class ArrayCacheByTimestamp(BaseCache):
         return min(self._new_updates, limit)
 
     def append(self, item):
+        self.appends += 1
         if item[0] in self.hashmap:
             reference = self.hashmap[item[0]]
             if reference != item:
                 reference[0:len(item)] = item
+            self.changes.append(reference)
         else:
+            self.changes.append(item)
             self.hashmap[item[0]] = item
             if len(self._deque) == self._deque.maxlen:
                 delete_reference = self._deque.popleft()
@@ -136,6 +145,7 @@ class ArrayCacheBySymbolById(ArrayCache):
         self._index = collections.deque([], max_size)
 
     def append(self, item):
+        self.appends += 1
         by_id = self.hashmap.setdefault(item['symbol'], {})
         if item['id'] in by_id:
             reference = by_id[item['id']]
@@ -151,6 +161,7 @@ class ArrayCacheBySymbolById(ArrayCache):
             delete_item = self._deque.popleft()
             self._index.popleft()
             del self.hashmap[delete_item['symbol']][delete_item['id']]
+        self.changes.append(item)
         self._deque.append(item)
         self._index.append(item['id'])
         if self._clear_all_updates:
@@ -178,6 +189,7 @@ class ArrayCacheBySymbolBySide(ArrayCache):
         self._index = collections.deque([], max_size)
 
     def append(self, item):
+        self.appends += 1
         by_side = self.hashmap.setdefault(item['symbol'], {})
         if item['side'] in by_side:
             reference = by_side[item['side']]
@@ -193,6 +205,7 @@ class ArrayCacheBySymbolBySide(ArrayCache):
             delete_item = self._deque.popleft()
             self._index.popleft()
             del self.hashmap[delete_item['symbol']][delete_item['side']]
+        self.changes.append(item)
         self._deque.append(item)
         self._index.append(item['side'])
         if self._clear_all_updates:
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+from binascii import crc32
+from ccxt.base.decimal_to_precision import number_to_string
+
+# -----------------------------------------------------------------------------
+# crc32 checksums of the top levels of an order book, as sent by okx, bitget, bitfinex, kraken, etc.
+# the payload is rebuilt from the formatted level strings of the previous check
+# only the levels that changed since then are formatted again
+# with 'every': k the checksum is only verified on every k-th update
+
+
+def format_level(side, levels, index, separator):
+    # the fixed point sides format with the decimals of the market precision
+    if hasattr(levels, 'price_string'):
+        return levels.price_string(index) + separator + levels.amount_string(index)
+    level = levels[index]
+    return number_to_string(level[0]) + separator + number_to_string(level[1])
+
+
+def format_ticks(side, levels, index, separator):
+    # kraken: the price and the amount without the decimal point and the leading zeros
+    # which are the ticks of a fixed point side with the decimals of the market precision
+    return str(levels.price_ticks(index)) + separator + str(levels.amount_ticks(index))
+
+
+class OrderBookChecksum:
+    def __init__(self, config={}):
+        self.config = {
+            'depth': 25,
+            'every': 1,
+            # the order of the sides in the payload
+            'sides': ['bids', 'asks'],
+            # bid, ask, bid, ask... or all the bids then all the asks
+            'interleave': True,
+            'separator': ':',
+            'signed': True,
+            # format(side, levels, index, separator) -> str
+            'format': format_level,
+        }
+        self.config.update(config)
+        self.updates = 0
+        # side -> [(level, string)] of the levels in the last payload
+        self.strings = {side: [] for side in self.config['sides']}
+
+    def side_strings(self, side, levels):
+        depth = self.config['depth']
+        format = self.config['format']
+        separator = self.config['separator']
+        cached = self.strings[side]
+        cached_length = len(cached)
+        # maps the cached strings by price because a new level shifts the ones below it
+        by_price = None
+        result = []
+        strings = []
+        for i in range(min(depth, len(levels))):
+            level = levels[i]
+            if i < cached_length and cached[i][0] == level:
+                entry = cached[i]
+            else:
+                if by_price is None:
+                    by_price = {entry[0][0]: entry for entry in cached}
+                entry = by_price.get(level[0])
+                if entry is None or entry[0] != level:
+                    # levels are updated in place, keep a copy
+                    entry = (list(level), format(side, levels, i, separator))
+            result.append(entry)
+            strings.append(entry[1])
+        self.strings[side] = result
+        return strings
+
+    def payload(self, orderbook):
+        first, second = [self.side_strings(side, orderbook[side]) for side in self.config['sides']]
+        if self.config['interleave']:
+            strings = []
+            for i in range(max(len(first), len(second))):
+                if i < len(first):
+                    strings.append(first[i])
+                if i < len(second):
+                    strings.append(second[i])
+        else:
+            strings = first + second
+        return self.config['separator'].join(strings)
+
+    def checksum(self, orderbook):
+        unsigned = crc32(self.payload(orderbook).encode('utf8'))
+        if self.config['signed'] and unsigned >= 0x80000000:
+            return unsigned - 0x100000000
+        return unsigned
+
+    def verify(self, orderbook, expected):
+        # True if the checksum matches or was not sampled on this update
+        self.updates += 1
+        if self.updates % self.config['every']:
+            return True
+        return self.checksum(orderbook) == expected
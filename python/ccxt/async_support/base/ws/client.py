@@ -4,6 +4,9 @@ from asyncio import sleep, ensure_future, wait_for, TimeoutError
 from .functions import milliseconds, iso8601, deep_extend
 from ccxt import NetworkError, RequestTimeout, NotSupported
 from ccxt.async_support.base.ws.future import Future
+from ccxt.async_support.base.ws.heartbeat import get_heartbeat
+from ccxt.async_support.base.ws.metrics import ConnectionMetrics
+from ccxt.base.json_codec import JsonCodec
 
 
 class Client(object):
@@ -14,6 +17,9 @@ class Client(object):
     options = {}  # ws-specific options
     subscriptions = {}
     rejections = {}
+    streams = {}  # message hash -> streams, see Stream
+    paused = None  # Future resolved when the reads paused by a full stream resume
+    pauses = 0
     on_message_callback = None
     on_error_callback = None
     on_close_callback = None
@@ -34,10 +40,15 @@ class Client(object):
     gunzip = False
     inflate = False
     throttle = None
+    json_codec = JsonCodec()
     connecting = False
     asyncio_loop = None
-    ping_looper = None
     receive_looper = None
+    collectMetrics = False  # latency and throughput metrics, see ConnectionMetrics
+    metricsWindow = 1024  # samples kept by the histograms of the metrics
+    metrics = None
+    shard = 0  # the index of the connection among the connections to the same url, see Exchange.pooled_client
+    pinned = False  # taken by the exchange code with Exchange.client(url), the new subscriptions to the url stay on it
 
     def __init__(self, url, on_message_callback, on_error_callback, on_close_callback, on_connected_callback, config={}):
         defaults = {
@@ -45,6 +56,7 @@ class Client(object):
             'futures': {},
             'subscriptions': {},
             'rejections': {},
+            'streams': {},
             'on_message_callback': on_message_callback,
             'on_error_callback': on_error_callback,
             'on_close_callback': on_close_callback,
@@ -60,6 +72,8 @@ class Client(object):
                 setattr(self, key, settings[key])
         # connection-related Future
         self.connected = Future()
+        if self.collectMetrics:
+            self.metrics = ConnectionMetrics(self.metricsWindow)
 
     def future(self, message_hash):
         if message_hash not in self.futures or self.futures[message_hash].cancelled():
@@ -73,6 +87,13 @@ class Client(object):
     def resolve(self, result, message_hash):
         if self.verbose and message_hash is None:
             self.log(iso8601(milliseconds()), 'resolve received None messageHash')
+        if self.metrics is not None:
+            self.metrics.resolve(result, message_hash)
+        streams = self.streams.get(message_hash)
+        if streams:
+            # a callback that raises detaches itself from the list
+            for stream in streams[:]:
+                stream.put(self, result)
         if message_hash in self.futures:
             future = self.futures[message_hash]
             future.resolve(result)
@@ -81,6 +102,8 @@ class Client(object):
 
     def reject(self, result, message_hash=None):
         if message_hash:
+            for stream in self.streams.get(message_hash, [])[:]:
+                stream.reject(result)
             if message_hash in self.futures:
                 future = self.futures[message_hash]
                 future.reject(result)
@@ -91,13 +114,30 @@ class Client(object):
             message_hashes = list(self.futures.keys())
             for message_hash in message_hashes:
                 self.reject(result, message_hash)
+            for streams in list(self.streams.values()):
+                for stream in streams[:]:
+                    stream.reject(result)
         return result
 
+    def pause_reading(self):
+        # until as many resume_reading() calls, see Stream
+        self.pauses += 1
+        if self.pauses == 1:
+            self.paused = Future()
+
+    def resume_reading(self):
+        self.pauses -= 1
+        if self.pauses == 0:
+            self.paused.resolve()
+            self.paused = None
+
     async def receive_loop(self):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'receive loop')
         while not self.closed():
             try:
+                if self.paused is not None:
+                    await self.paused
                 message = await self.receive()
                 # self.log(iso8601(milliseconds()), 'received', message)
                 self.handle_message(message)
@@ -124,8 +164,8 @@ class Client(object):
                 self.log(iso8601(milliseconds()), 'connected')
             self.connected.resolve(self.url)
             self.on_connected_callback(self)
-            # run both loops forever
-            self.ping_looper = ensure_future(self.ping_loop(), loop=self.asyncio_loop)
+            # the pings of all the clients are sent by the shared heartbeat of the event loop
+            get_heartbeat(self.asyncio_loop).add(self)
             self.receive_looper = ensure_future(self.receive_loop(), loop=self.asyncio_loop)
         except TimeoutError:
             # connection timeout
@@ -149,6 +189,8 @@ class Client(object):
     def on_error(self, error):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'on_error', error)
+        if self.metrics is not None:
+            self.metrics.errors += 1
         self.error = error
         self.reset(error)
         self.on_error_callback(self, error)
@@ -167,9 +209,10 @@ class Client(object):
     def reset(self, error):
         self.reject(error)
 
-    async def ping_loop(self):
+    def keep_alive(self):
+        # called by the heartbeat every keepAlive ms
         if self.verbose:
-            self.log(iso8601(milliseconds()), 'ping loop')
+            self.log(iso8601(milliseconds()), 'keep alive')
 
     def receive(self):
         raise NotSupported('receive() not implemented')
@@ -3,11 +3,16 @@
 import asyncio
 import socket
 import collections
+import time
 from ccxt.async_support.base.ws.aiohttp_client import AiohttpClient
 
 
 class FastClient(AiohttpClient):
     transport = None
+    # how many queued messages are handled per event loop iteration, and for how many microseconds at most
+    # 1 yields to the other tasks after every message, larger budgets drain bursts with less scheduling
+    drainMessages = 1
+    drainTime = None
 
     def __init__(self, url, on_message_callback, on_error_callback, on_close_callback, on_connected_callback, config={}):
         super(FastClient, self).__init__(url, on_message_callback, on_error_callback, on_close_callback, on_connected_callback, config)
@@ -15,24 +20,69 @@ class FastClient(AiohttpClient):
         # https://github.com/aio-libs/aiohttp/blob/1d296d549050aa335ef542421b8b7dad788246d5/aiohttp/streams.py#L534
         self.stack = collections.deque()
         self.callback_scheduled = False
+        # queue metrics
+        self.messages_queued = 0
+        self.messages_handled = 0
+        self.drain_calls = 0
+        self.max_queue_depth = 0
 
-    def receive_loop(self):
-        def handler():
-            if not self.stack:
-                self.callback_scheduled = False
-                return
-            message = self.stack.popleft()
+    def feed(self, message):
+        if not self.callback_scheduled:
+            self.callback_scheduled = True
+            self.asyncio_loop.call_soon(self.drain)
+        self.stack.append(message)
+        self.messages_queued += 1
+        depth = len(self.stack)
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+        if self.metrics is not None:
+            self.metrics.queue_depth.add(depth)
+
+    def drain(self):
+        # handles up to drainMessages messages or drainTime microseconds, then yields to the event loop
+        stack = self.stack
+        budget = self.drainMessages
+        deadline = time.perf_counter() + self.drainTime / 1000000 if self.drainTime else None
+        handled = 0
+        while stack and handled < budget:
+            message = stack.popleft()
+            handled += 1
             try:
                 self.handle_message(message)
             except Exception as error:
                 self.reject(error)
-            self.asyncio_loop.call_soon(handler)
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        self.messages_handled += handled
+        self.drain_calls += 1
+        if stack:
+            self.asyncio_loop.call_soon(self.drain)
+        else:
+            self.callback_scheduled = False
+
+    def queue_stats(self):
+        return {
+            'depth': len(self.stack),
+            'maxDepth': self.max_queue_depth,
+            'queued': self.messages_queued,
+            'handled': self.messages_handled,
+            'drains': self.drain_calls,
+        }
 
+    def pause_reading(self):
+        # the messages are pushed by the transport, pause it instead of the receive loop
+        self.pauses += 1
+        if self.pauses == 1 and self.transport:
+            self.transport.pause_reading()
+
+    def resume_reading(self):
+        self.pauses -= 1
+        if self.pauses == 0 and self.transport:
+            self.transport.resume_reading()
+
+    def receive_loop(self):
         def feed_data(message, size):
-            if not self.callback_scheduled:
-                self.callback_scheduled = True
-                self.asyncio_loop.call_soon(handler)
-            self.stack.append(message)
+            self.feed(message)
 
         def feed_eof():
             if self._close_code == 1000:  # OK close
@@ -44,6 +94,7 @@ class FastClient(AiohttpClient):
             def parse_frame(buf):
                 while self.stack:
                     self.handle_message(self.stack.popleft())
+                    self.messages_handled += 1
                 return func(buf)
             return parse_frame
 
@@ -2,8 +2,6 @@
 
 from zlib import decompress, MAX_WBITS
 from base64 import b64decode
-from gzip import GzipFile
-from io import BytesIO
 import time
 import datetime
 
@@ -17,7 +15,12 @@ def inflate64(data):
 
 
 def gunzip(data):
-    return GzipFile('', 'rb', 9, BytesIO(data)).read().decode('utf-8')
+    return ungzip(data).decode('utf-8')
+
+
+def ungzip(data):
+    # one gzip member per message, decompressed in a single buffer
+    return decompress(data, 16 + MAX_WBITS)
 
 
 #  Tmp : added methods below to avoid circular imports between exchange.py and aiohttp.py
@@ -46,6 +49,11 @@ def is_json_encoded_object(input):
             ((input[0] == '{') or (input[0] == '[')))
 
 
+def is_json_encoded_bytes(input):
+    # 123 is '{' and 91 is '['
+    return (len(input) >= 2) and ((input[0] == 123) or (input[0] == 91))
+
+
 def deep_extend(*args):
     result = None
     for arg in args:
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+import weakref
+from asyncio import get_event_loop
+
+# -----------------------------------------------------------------------------
+# the keepalive pings of all the clients of an event loop are sent from a single timer
+# the clients are kept in a timer wheel of `resolution` ms slots, the timer only runs
+# while there are clients in the wheel and ticks at the start of every slot
+# a client is put in the slot its next ping falls in, so pings are sent up to one slot early, never late
+
+
+class Heartbeat:
+    resolution = 1000  # ms
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.slots = {}  # slot -> {client: None}
+        self.client_slots = {}  # client -> slot
+        self.timer = None
+        self.ticks = 0
+
+    def add(self, client):
+        # pings right away then every client.keepAlive ms until the client is closed or removed
+        if not client.keepAlive:
+            return
+        if self.ping(client):
+            self.schedule(client, self.time() + client.keepAlive)
+
+    def remove(self, client):
+        slot = self.client_slots.pop(client, None)
+        if slot is not None:
+            clients = self.slots[slot]
+            del clients[client]
+            if not clients:
+                del self.slots[slot]
+
+    def schedule(self, client, when):
+        self.remove(client)
+        slot = int(when // self.resolution)
+        self.client_slots[client] = slot
+        if slot in self.slots:
+            self.slots[slot][client] = None
+        else:
+            self.slots[slot] = {client: None}
+        if self.timer is None:
+            self.start()
+
+    def time(self):
+        # ms, the clock of the event loop timers
+        return self.loop.time() * 1000
+
+    def start(self):
+        current = self.time() // self.resolution
+        self.timer = self.loop.call_at((current + 1) * self.resolution / 1000, self.tick)
+
+    def ping(self, client):
+        # a failed ping is an error of that client only, it is not rescheduled and the other clients are still pinged
+        try:
+            client.keep_alive()
+            return True
+        except Exception as e:
+            try:
+                client.on_error(e)
+            except Exception as error:
+                self.loop.call_exception_handler({
+                    'message': 'heartbeat failed to reject a client',
+                    'exception': error,
+                })
+            return False
+
+    def tick(self):
+        self.timer = None
+        self.ticks += 1
+        try:
+            now = self.time()
+            current = now // self.resolution
+            due = [slot for slot in self.slots if slot <= current]
+            for slot in due:
+                for client in self.slots.pop(slot):
+                    del self.client_slots[client]
+                    if client.keepAlive and not client.closed():
+                        if self.ping(client) and not client.closed():
+                            self.schedule(client, now + client.keepAlive)
+        finally:
+            if self.slots and self.timer is None:
+                self.start()
+
+    def __len__(self):
+        return len(self.client_slots)
+
+
+heartbeats = weakref.WeakKeyDictionary()
+
+
+def get_heartbeat(loop=None):
+    """Returns the heartbeat of the event loop, created on first use"""
+    loop = loop or get_event_loop()
+    heartbeat = heartbeats.get(loop)
+    if heartbeat is None:
+        heartbeat = heartbeats[loop] = Heartbeat(loop)
+    return heartbeat
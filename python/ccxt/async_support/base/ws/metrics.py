@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+# -----------------------------------------------------------------------------
+# per connection latency and throughput metrics, enabled with the collectMetrics streaming option
+# the histograms keep the last `window` samples, their percentiles are computed when they are read
+
+
+class Histogram:
+    def __init__(self, window=1024):
+        self.window = window
+        self.samples = []
+        self.index = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if len(self.samples) < self.window:
+            self.samples.append(value)
+        else:
+            self.samples[self.index] = value
+            self.index = (self.index + 1) % self.window
+
+    def percentile(self, p, ordered=None):
+        ordered = ordered or sorted(self.samples)
+        if not ordered:
+            return None
+        return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)]
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        return {
+            'count': self.count,
+            'p50': self.percentile(50, ordered),
+            'p99': self.percentile(99, ordered),
+            'max': ordered[-1] if ordered else None,
+        }
+
+
+def event_timestamp(result):
+    # the timestamp of the unified structure, or of the last entry of a list of them
+    if isinstance(result, list):
+        if not len(result):
+            return None
+        result = result[-1]
+    if isinstance(result, dict):
+        timestamp = result.get('timestamp')
+        if isinstance(timestamp, (int, float)):
+            return timestamp
+    return None
+
+
+class ConnectionMetrics:
+    def __init__(self, window=1024):
+        self.window = window
+        self.messages = 0
+        self.bytes = 0
+        self.errors = 0
+        self.received = None  # ms, when the message being handled was received
+        self.decode = Histogram(window)  # us
+        self.handler = Histogram(window)  # us
+        self.queue_depth = Histogram(window)
+        # message hash -> [updates, latency histogram in ms from the exchange timestamp to the resolve]
+        self.message_hashes = {}
+
+    def receive(self, data):
+        self.messages += 1
+        self.bytes += len(data)
+        self.received = time.time() * 1000
+        return time.perf_counter()
+
+    def resolve(self, result, message_hash):
+        entry = self.message_hashes.get(message_hash)
+        if entry is None:
+            entry = self.message_hashes[message_hash] = [0, Histogram(self.window)]
+        entry[0] += 1
+        timestamp = event_timestamp(result)
+        if timestamp is not None:
+            entry[1].add(time.time() * 1000 - timestamp)
+
+    def snapshot(self):
+        return {
+            'messages': self.messages,
+            'bytes': self.bytes,
+            'errors': self.errors,
+            'received': self.received,
+            'decode': self.decode.summary(),
+            'handler': self.handler.summary(),
+            'queueDepth': self.queue_depth.summary(),
+            'messageHashes': {
+                message_hash: {'updates': updates, 'latency': latency.summary()}
+                for message_hash, (updates, latency) in self.message_hashes.items()
+            },
+        }
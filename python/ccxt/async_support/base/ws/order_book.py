@@ -8,6 +8,8 @@ import sys
 class OrderBook(dict):
     def __init__(self, snapshot={}, depth=None):
         self.cache = []
+        # the OrderBookChecksum of verify_order_book_checksum
+        self.checksum = None
         depth = depth or sys.maxsize
         defaults = {
             'bids': [],
@@ -32,15 +34,33 @@ class OrderBook(dict):
         self['bids'].limit()
         return self
 
+    def top(self, n):
+        # live views of the best n levels, use instead of limit() to read the top without trimming
+        return {
+            'asks': self['asks'].top(n),
+            'bids': self['bids'].top(n),
+        }
+
+    def snapshot(self):
+        # a plain copy of the book, the levels are updated in place so they are copied too
+        result = dict(self)
+        result['asks'] = [list(level) for level in self['asks']]
+        result['bids'] = [list(level) for level in self['bids']]
+        return result
+
+    def best_ask(self):
+        return self['asks'].best()
+
+    def best_bid(self):
+        return self['bids'].best()
+
     def reset(self, snapshot={}):
         self['asks']._index.clear()
         self['asks'].clear()
-        for ask in snapshot.get('asks', []):
-            self['asks'].storeArray(ask)
+        self['asks'].store_deltas(snapshot.get('asks', []))
         self['bids']._index.clear()
         self['bids'].clear()
-        for bid in snapshot.get('bids', []):
-            self['bids'].storeArray(bid)
+        self['bids'].store_deltas(snapshot.get('bids', []))
         self['nonce'] = snapshot.get('nonce')
         self['timestamp'] = snapshot.get('timestamp')
         self['datetime'] = Exchange.iso8601(self['timestamp'])
@@ -76,3 +96,82 @@ class IndexedOrderBook(OrderBook):
             'bids': order_book_side.IndexedBids(snapshot.get('bids', []), depth),
         })
         super(IndexedOrderBook, self).__init__(copy, depth)
+
+# -----------------------------------------------------------------------------
+# prices indexed by integer ticks of the market precision (see FixedPointOrderBookSide)
+
+
+class FixedPointOrderBook(OrderBook):
+    def __init__(self, snapshot={}, depth=None, price_decimals=8, amount_decimals=8):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.FixedPointAsks(snapshot.get('asks', []), depth, price_decimals, amount_decimals),
+            'bids': order_book_side.FixedPointBids(snapshot.get('bids', []), depth, price_decimals, amount_decimals),
+        })
+        super(FixedPointOrderBook, self).__init__(copy, depth)
+
+
+class FixedPointCountedOrderBook(OrderBook):
+    def __init__(self, snapshot={}, depth=None, price_decimals=8, amount_decimals=8):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.FixedPointCountedAsks(snapshot.get('asks', []), depth, price_decimals, amount_decimals),
+            'bids': order_book_side.FixedPointCountedBids(snapshot.get('bids', []), depth, price_decimals, amount_decimals),
+        })
+        super(FixedPointCountedOrderBook, self).__init__(copy, depth)
+
+
+class FixedPointIndexedOrderBook(OrderBook):
+    def __init__(self, snapshot={}, depth=None, price_decimals=8, amount_decimals=8):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.FixedPointIndexedAsks(snapshot.get('asks', []), depth, price_decimals, amount_decimals),
+            'bids': order_book_side.FixedPointIndexedBids(snapshot.get('bids', []), depth, price_decimals, amount_decimals),
+        })
+        super(FixedPointIndexedOrderBook, self).__init__(copy, depth)
+
+# -----------------------------------------------------------------------------
+# the same books backed by the sorted engine, O(log n) updates for deep books
+
+
+class SortedOrderBook(OrderBook):
+    def __init__(self, snapshot={}, depth=None):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.SortedAsks(snapshot.get('asks', []), depth),
+            'bids': order_book_side.SortedBids(snapshot.get('bids', []), depth),
+        })
+        super(SortedOrderBook, self).__init__(copy, depth)
+
+
+class SortedCountedOrderBook(OrderBook):
+    def __init__(self, snapshot={}, depth=None):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.SortedCountedAsks(snapshot.get('asks', []), depth),
+            'bids': order_book_side.SortedCountedBids(snapshot.get('bids', []), depth),
+        })
+        super(SortedCountedOrderBook, self).__init__(copy, depth)
+
+
+class SortedIndexedOrderBook(OrderBook):
+    def __init__(self, snapshot={}, depth=None):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.SortedIndexedAsks(snapshot.get('asks', []), depth),
+            'bids': order_book_side.SortedIndexedBids(snapshot.get('bids', []), depth),
+        })
+        super(SortedIndexedOrderBook, self).__init__(copy, depth)
+
+# -----------------------------------------------------------------------------
+# L3 books, orders are queued in arrival order at each price level (see QueuedOrderBookSide)
+
+
+class QueuedOrderBook(OrderBook):
+    def __init__(self, snapshot={}, depth=None):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.QueuedAsks(snapshot.get('asks', []), depth),
+            'bids': order_book_side.QueuedBids(snapshot.get('bids', []), depth),
+        })
+        super(QueuedOrderBook, self).__init__(copy, depth)
+
+    def aggregate(self, n=None):
+        # L2 view of the L3 book
+        return {
+            'asks': self['asks'].aggregate(n),
+            'bids': self['bids'].aggregate(n),
+        }
@@ -2,6 +2,13 @@
 
 import sys
 import bisect
+import itertools
+from ccxt.base.errors import NotSupported
+
+try:
+    from sortedcontainers import SortedKeyList
+except ImportError:
+    SortedKeyList = None
 
 """Author: Carlo Revelli"""
 """Fast bisect bindings"""
@@ -11,6 +18,8 @@ import bisect
 
 class OrderBookSide(list):
     side = None  # set to True for bids and False for asks
+    # store_deltas merges a batch when it has at least one delta per bulk_ratio levels
+    bulk_ratio = 1
 
     def __init__(self, deltas=[], depth=None):
         super(OrderBookSide, self).__init__()
@@ -39,6 +48,61 @@ class OrderBookSide(list):
     def store(self, price, size):
         self.storeArray([price, size])
 
+    def store_many(self, prices, sizes):
+        self.store_deltas(list(map(list, zip(prices, sizes))))
+
+    def store_deltas(self, deltas):
+        # applies the deltas in order, same as calling storeArray on each of them
+        # a batch at least as large as the side (snapshots, bursts) is sorted and merged in one pass
+        # smaller batches are cheaper to insert one by one, list.insert is a memmove
+        if len(deltas) * self.bulk_ratio < len(self._index):
+            store = self.storeArray
+            for delta in deltas:
+                store(delta)
+            return
+        # only the last delta at a price matters
+        updates = dict(zip(self.index_prices(deltas), deltas))
+        index = self._index
+        is_level = self.is_level
+        if not index:
+            new_index = [index_price for index_price in sorted(updates) if is_level(updates[index_price])]
+            new_levels = list(map(updates.__getitem__, new_index))
+        else:
+            levels = list(self)
+            new_index = []
+            new_levels = []
+            start = 0
+            for index_price in sorted(updates):
+                position = bisect.bisect_left(index, index_price, start)
+                new_index += index[start:position]
+                new_levels += levels[start:position]
+                exists = position < len(index) and index[position] == index_price
+                delta = updates[index_price]
+                if is_level(delta):
+                    if exists:
+                        level = levels[position]
+                        self.update_level(level, delta)
+                    else:
+                        level = delta
+                    new_index.append(index_price)
+                    new_levels.append(level)
+                start = position + 1 if exists else position
+            new_index += index[start:]
+            new_levels += levels[start:]
+        self._index = new_index
+        super(OrderBookSide, self).__setitem__(slice(None), new_levels)
+
+    def index_prices(self, deltas):
+        if self.side:
+            return [-delta[0] for delta in deltas]
+        return [delta[0] for delta in deltas]
+
+    def is_level(self, delta):
+        return delta[1]
+
+    def update_level(self, level, delta):
+        level[1] = delta[1]
+
     def limit(self):
         difference = len(self) - self._depth
         for _ in range(difference):
@@ -53,12 +117,22 @@ class OrderBookSide(list):
         return min(length, self._n)
 
     def __getitem__(self, item):
-        if isinstance(item, slice):
+        if isinstance(item, slice) and self._n < super(OrderBookSide, self).__len__():
             start, stop, step = item.indices(len(self))
             return [self[i] for i in range(start, stop, step)]
         else:
             return super(OrderBookSide, self).__getitem__(item)
 
+    def top(self, n):
+        # a live view of the best n levels, nothing is copied or trimmed
+        return OrderBookSideView(self, n)
+
+    def best(self):
+        try:
+            return self[0]
+        except IndexError:
+            return None
+
     def __eq__(self, other):
         if isinstance(other, list):
             return list(self) == other
@@ -67,6 +141,42 @@ class OrderBookSide(list):
     def __repr__(self):
         return str(list(self))
 
+# -----------------------------------------------------------------------------
+# a read-only window over the first n levels of a side, it follows the updates of the side
+
+
+class OrderBookSideView(object):
+    __slots__ = ('_side', '_n')
+
+    def __init__(self, side, n):
+        self._side = side
+        self._n = n
+
+    def __len__(self):
+        return min(len(self._side), self._n)
+
+    def __iter__(self):
+        return itertools.islice(self._side, self._n)
+
+    def __getitem__(self, item):
+        length = len(self)
+        if isinstance(item, slice):
+            start, stop, step = item.indices(length)
+            if step == 1:
+                return self._side[start:max(start, stop)]
+            return [self._side[i] for i in range(start, stop, step)]
+        if item < 0:
+            item += length
+        if item < 0 or item >= length:
+            raise IndexError('order book view index out of range')
+        return self._side[item]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return str(list(self))
+
 # -----------------------------------------------------------------------------
 # overwrites absolute volumes at price levels
 # or deletes price levels based on order counts (3rd value in a bidask delta)
@@ -97,6 +207,77 @@ class CountedOrderBookSide(OrderBookSide):
     def store(self, price, size, count):
         self.storeArray([price, size, count])
 
+    def store_many(self, prices, sizes, counts):
+        self.store_deltas(list(map(list, zip(prices, sizes, counts))))
+
+    def is_level(self, delta):
+        return delta[1] and delta[2]
+
+    def update_level(self, level, delta):
+        level[1] = delta[1]
+        level[2] = delta[2]
+
+# -----------------------------------------------------------------------------
+# prices are indexed by integer multiples of 10 ** -price_decimals instead of floats
+# the levels are [price, amount] floats as usual, the integers give exact price keys
+# and let checksums rebuild the price and amount strings from the precision of the market
+
+
+def fixed_to_string(value, decimals):
+    if decimals <= 0:
+        return str(value)
+    sign = '-' if value < 0 else ''
+    integer, fraction = divmod(abs(value), 10 ** decimals)
+    return '%s%d.%0*d' % (sign, integer, decimals, fraction)
+
+
+class FixedPointSide(object):
+    def __init__(self, deltas=[], depth=None, price_decimals=8, amount_decimals=8):
+        self._price_decimals = price_decimals
+        self._price_scale = 10 ** price_decimals
+        self._amount_decimals = amount_decimals
+        self._amount_scale = 10 ** amount_decimals
+        super(FixedPointSide, self).__init__(deltas, depth)
+
+    def price_ticks(self, index):
+        return round(self[index][0] * self._price_scale)
+
+    def amount_ticks(self, index):
+        return round(self[index][1] * self._amount_scale)
+
+    def price_string(self, index):
+        return fixed_to_string(self.price_ticks(index), self._price_decimals)
+
+    def amount_string(self, index):
+        return fixed_to_string(self.amount_ticks(index), self._amount_decimals)
+
+
+class FixedPointOrderBookSide(FixedPointSide, OrderBookSide):
+    def storeArray(self, delta):
+        price = delta[0]
+        size = delta[1]
+        ticks = round(price * self._price_scale)
+        index_price = -ticks if self.side else ticks
+        index = bisect.bisect_left(self._index, index_price)
+        if size:
+            if index < len(self._index) and self._index[index] == index_price:
+                self[index][1] = size
+            else:
+                self._index.insert(index, index_price)
+                self.insert(index, delta)
+        elif index < len(self._index) and self._index[index] == index_price:
+            del self._index[index]
+            del self[index]
+
+    def index_prices(self, deltas):
+        scale = self._price_scale
+        if self.side:
+            return [-round(delta[0] * scale) for delta in deltas]
+        return [round(delta[0] * scale) for delta in deltas]
+
+    def price_ticks(self, index):
+        return abs(self._index[index])
+
 # -----------------------------------------------------------------------------
 # indexed by order ids (3rd value in a bidask delta)
 
@@ -160,6 +341,379 @@ class IndexedOrderBookSide(OrderBookSide):
     def store(self, price, size, order_id):
         self.storeArray([price, size, order_id])
 
+    def store_many(self, prices, sizes, order_ids):
+        self.store_deltas(list(map(list, zip(prices, sizes, order_ids))))
+
+    def store_deltas(self, deltas):
+        for delta in deltas:
+            self.storeArray(delta)
+
+    def clear(self):
+        self._hashmap.clear()
+        super(IndexedOrderBookSide, self).clear()
+
+# -----------------------------------------------------------------------------
+# the counted and indexed sides of the fixed point books round the prices to integer ticks of the market precision
+# the same number of ticks always gives the same float, so their float price index is exact
+
+
+class FixedPointRoundedSide(FixedPointSide):
+    def round_price(self, delta):
+        if delta[0] is not None:
+            delta[0] = round(delta[0] * self._price_scale) / self._price_scale
+        return delta
+
+    def storeArray(self, delta):
+        super(FixedPointRoundedSide, self).storeArray(self.round_price(delta))
+
+    def store_deltas(self, deltas):
+        super(FixedPointRoundedSide, self).store_deltas([self.round_price(delta) for delta in deltas])
+
+
+class FixedPointCountedOrderBookSide(FixedPointRoundedSide, CountedOrderBookSide):
+    pass
+
+
+class FixedPointIndexedOrderBookSide(FixedPointRoundedSide, IndexedOrderBookSide):
+    pass
+
+# -----------------------------------------------------------------------------
+# an alternative engine for deep books with O(log n) updates
+# the levels are kept in a SortedKeyList and indexed by key in a dict instead of two parallel lists
+# reads are served from the sorted structure, the list itself is a snapshot refreshed by limit()
+# so that code accessing the raw list (json.dumps) sees the book as it was last resolved
+
+
+class SortedOrderBookSide(OrderBookSide):
+    def __init__(self, deltas=[], depth=None):
+        if SortedKeyList is None:
+            raise NotSupported('the sorted order book engine requires the "sortedcontainers" module that can be installed by "pip install sortedcontainers"')
+        super(OrderBookSide, self).__init__()
+        self._depth = depth or sys.maxsize
+        self._n = sys.maxsize
+        # key -> level
+        self._levels = {}
+        self._index = SortedKeyList(key=self.key)
+        # whether the raw list is behind the sorted structure
+        self._dirty = False
+        for delta in deltas:
+            self.storeArray(list(delta))
+
+    def key(self, level):
+        return -level[0] if self.side else level[0]
+
+    def insert_level(self, key, level):
+        if key in self._levels:
+            self.remove_level(key)
+        self._levels[key] = level
+        self._index.add(level)
+        self._dirty = True
+
+    def remove_level(self, key):
+        if key in self._levels:
+            del self._levels[key]
+            del self._index[self._index.bisect_key_left(key)]
+            self._dirty = True
+
+    def storeArray(self, delta):
+        price = delta[0]
+        size = delta[1]
+        index_price = -price if self.side else price
+        if size:
+            level = self._levels.get(index_price)
+            if level is None:
+                self.insert_level(index_price, delta)
+            else:
+                level[1] = size
+        else:
+            self.remove_level(index_price)
+
+    def store_deltas(self, deltas):
+        # every update is O(log n) already
+        for delta in deltas:
+            self.storeArray(delta)
+
+    def limit(self):
+        if len(self._index) > self._depth:
+            for level in self._index.islice(self._depth):
+                del self._levels[self.key(level)]
+                self.remove_index(level)
+            del self._index[self._depth:]
+            self._dirty = True
+        if self._dirty:
+            super(OrderBookSide, self).__setitem__(slice(None), self._index)
+            self._dirty = False
+
+    def clear(self):
+        self._levels.clear()
+        self._index.clear()
+        super(SortedOrderBookSide, self).clear()
+
+    def __len__(self):
+        return min(len(self._index), self._n)
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __getitem__(self, item):
+        return self._index[item]
+
+# -----------------------------------------------------------------------------
+
+
+class SortedCountedOrderBookSide(SortedOrderBookSide):
+    def storeArray(self, delta):
+        price = delta[0]
+        size = delta[1]
+        count = delta[2]
+        index_price = -price if self.side else price
+        if size and count:
+            level = self._levels.get(index_price)
+            if level is None:
+                self.insert_level(index_price, delta)
+            else:
+                level[1] = size
+                level[2] = count
+        else:
+            self.remove_level(index_price)
+
+    def store(self, price, size, count):
+        self.storeArray([price, size, count])
+
+    def store_many(self, prices, sizes, counts):
+        self.store_deltas(list(map(list, zip(prices, sizes, counts))))
+
+# -----------------------------------------------------------------------------
+# orders are keyed by (index price, order id), same ordering as IndexedOrderBookSide
+
+
+class SortedIndexedOrderBookSide(SortedOrderBookSide):
+    def __init__(self, deltas=[], depth=None):
+        self._hashmap = {}
+        super(SortedIndexedOrderBookSide, self).__init__(deltas, depth)
+
+    def key(self, level):
+        return (-level[0] if self.side else level[0], level[2])
+
+    def storeArray(self, delta):
+        price = delta[0]
+        if price is not None:
+            index_price = -price if self.side else price
+        else:
+            index_price = None
+        size = delta[1]
+        order_id = delta[2]
+        if size:
+            if order_id in self._hashmap:
+                old_price = self._hashmap[order_id]
+                index_price = index_price or old_price
+                # in case the price is not defined
+                delta[0] = abs(index_price)
+                self.remove_level((old_price, order_id))
+            self._hashmap[order_id] = index_price
+            self.insert_level((index_price, order_id), delta)
+        elif order_id in self._hashmap:
+            self.remove_level((self._hashmap[order_id], order_id))
+            del self._hashmap[order_id]
+
+    def remove_index(self, order):
+        order_id = order[2]
+        if order_id in self._hashmap:
+            del self._hashmap[order_id]
+
+    def clear(self):
+        self._hashmap.clear()
+        super(SortedIndexedOrderBookSide, self).clear()
+
+    def store(self, price, size, order_id):
+        self.storeArray([price, size, order_id])
+
+    def store_many(self, prices, sizes, order_ids):
+        self.store_deltas(list(map(list, zip(prices, sizes, order_ids))))
+
+# -----------------------------------------------------------------------------
+# L3 books, indexed by order ids (3rd value in a bidask delta) and queued in arrival order at each price level
+# price level -> {order id -> delta}, dicts keep the insertion order so every level is a FIFO queue
+# modifying or cancelling an order is O(1), adding or emptying a price level is a bisect and a shift of the sorted prices
+# the best orders are read from the queues, limit() splices the changed levels into the flat list of orders
+
+
+class QueuedOrderBookSide(OrderBookSide):
+    # refresh() rebuilds the flat list instead of splicing it when more levels have changed
+    splice_limit = 32
+
+    def __init__(self, deltas=[], depth=None):
+        super(OrderBookSide, self).__init__()
+        self._depth = depth or sys.maxsize
+        self._n = sys.maxsize
+        # sorted index prices
+        self._index = []
+        # index price -> {order id -> delta}
+        self._levels = {}
+        # order id -> index price
+        self._hashmap = {}
+        # index price -> the number of its orders in the flat list, for the levels changed since it was built
+        self._changed = {}
+        for delta in deltas:
+            self.storeArray(list(delta))
+
+    def touch(self, index_price):
+        # called before a level is changed
+        if index_price not in self._changed:
+            queue = self._levels.get(index_price)
+            self._changed[index_price] = len(queue) if queue else 0
+
+    def storeArray(self, delta):
+        price = delta[0]
+        if price is not None:
+            index_price = -price if self.side else price
+        else:
+            index_price = None
+        size = delta[1]
+        order_id = delta[2]
+        if size:
+            if order_id in self._hashmap:
+                old_price = self._hashmap[order_id]
+                index_price = index_price or old_price
+                # in case the price is not defined
+                delta[0] = abs(index_price)
+                if index_price == old_price:
+                    # keeps the place in the queue
+                    self.touch(old_price)
+                    self._levels[old_price][order_id] = delta
+                    return
+                self.remove_order(old_price, order_id)
+            elif index_price is None:
+                return
+            self.touch(index_price)
+            self._hashmap[order_id] = index_price
+            queue = self._levels.get(index_price)
+            if queue is None:
+                queue = self._levels[index_price] = {}
+                bisect.insort(self._index, index_price)
+            queue[order_id] = delta
+        elif order_id in self._hashmap:
+            self.remove_order(self._hashmap.pop(order_id), order_id)
+
+    def remove_order(self, index_price, order_id):
+        self.touch(index_price)
+        queue = self._levels[index_price]
+        del queue[order_id]
+        if not queue:
+            del self._levels[index_price]
+            del self._index[bisect.bisect_left(self._index, index_price)]
+
+    def store(self, price, size, order_id):
+        self.storeArray([price, size, order_id])
+
+    def store_many(self, prices, sizes, order_ids):
+        self.store_deltas(list(map(list, zip(prices, sizes, order_ids))))
+
+    def store_deltas(self, deltas):
+        for delta in deltas:
+            self.storeArray(delta)
+
+    def orders(self, start=0):
+        # the orders from the level at position start in the book, without building the flat list
+        levels = self._levels
+        for index_price in itertools.islice(self._index, start, None):
+            yield from levels[index_price].values()
+
+    def refresh(self):
+        # the orders of the changed levels replace their old orders in the flat list, the other levels are not copied
+        # the offsets are counted over the levels, not over the orders
+        if not self._changed:
+            return
+        changed = self._changed
+        levels = self._levels
+        index = self._index
+        if len(changed) > self.splice_limit:
+            # a snapshot or a large batch, the flat list is rebuilt from the first changed level
+            position = bisect.bisect_left(index, min(changed))
+            offset = sum(len(levels[index_price]) for index_price in itertools.islice(index, position))
+            super(OrderBookSide, self).__setitem__(slice(offset, None), list(self.orders(position)))
+            changed.clear()
+            return
+        splices = []
+        offset = 0
+        position = 0
+        for index_price in sorted(changed):
+            while position < len(index) and index[position] < index_price:
+                offset += len(levels[index[position]])
+                position += 1
+            count = changed[index_price]
+            queue = levels.get(index_price)
+            splices.append((offset, offset + count, list(queue.values()) if queue else []))
+            offset += count
+            if position < len(index) and index[position] == index_price:
+                position += 1
+        # from the worst level so that the offsets of the better ones still hold
+        for start, stop, orders in reversed(splices):
+            super(OrderBookSide, self).__setitem__(slice(start, stop), orders)
+        changed.clear()
+
+    def limit(self):
+        # drops the latest orders at the worst prices first
+        difference = len(self._hashmap) - self._depth
+        for _ in range(difference):
+            index_price = self._index[-1]
+            queue = self._levels[index_price]
+            self.touch(index_price)
+            order_id, order = queue.popitem()
+            del self._hashmap[order_id]
+            if not queue:
+                del self._levels[index_price]
+                self._index.pop()
+        self.refresh()
+
+    def queue(self, price):
+        # the orders at a price level in the order they were placed
+        queue = self._levels.get(-price if self.side else price)
+        return list(queue.values()) if queue else []
+
+    def aggregate(self, n=None):
+        # L2 levels [price, size, count] of the best n prices
+        result = []
+        for index_price in self._index[:n]:
+            queue = self._levels[index_price]
+            size = 0
+            for order in queue.values():
+                size += order[1]
+            result.append([abs(index_price), size, len(queue)])
+        return result
+
+    def best(self):
+        if not self._index:
+            return None
+        return next(iter(self._levels[self._index[0]].values()))
+
+    def clear(self):
+        self._index.clear()
+        self._levels.clear()
+        self._hashmap.clear()
+        self._changed.clear()
+        super(QueuedOrderBookSide, self).clear()
+
+    def __len__(self):
+        return min(len(self._hashmap), self._n)
+
+    def __iter__(self):
+        if not self._changed:
+            return super(QueuedOrderBookSide, self).__iter__()
+        return self.orders()
+
+    def __getitem__(self, item):
+        # the best orders are read from the queues, the flat list is rebuilt for the other reads
+        if self._changed:
+            if isinstance(item, slice):
+                start, stop, step = item.indices(len(self))
+                if step > 0:
+                    return list(itertools.islice(self.orders(), start, max(start, stop), step))
+            elif 0 <= item < len(self):
+                return next(itertools.islice(self.orders(), item, None))
+            self.refresh()
+        return super(QueuedOrderBookSide, self).__getitem__(item)
+
 # -----------------------------------------------------------------------------
 # a more elegant syntax is possible here, but native inheritance is portable
 
@@ -169,3 +723,17 @@ class CountedAsks(CountedOrderBookSide): side = False                       # no
 class CountedBids(CountedOrderBookSide): side = True                        # noqa
 class IndexedAsks(IndexedOrderBookSide): side = False                       # noqa
 class IndexedBids(IndexedOrderBookSide): side = True                        # noqa
+class SortedAsks(SortedOrderBookSide): side = False                         # noqa
+class SortedBids(SortedOrderBookSide): side = True                          # noqa
+class SortedCountedAsks(SortedCountedOrderBookSide): side = False           # noqa
+class SortedCountedBids(SortedCountedOrderBookSide): side = True            # noqa
+class SortedIndexedAsks(SortedIndexedOrderBookSide): side = False           # noqa
+class SortedIndexedBids(SortedIndexedOrderBookSide): side = True            # noqa
+class QueuedAsks(QueuedOrderBookSide): side = False                         # noqa
+class QueuedBids(QueuedOrderBookSide): side = True                          # noqa
+class FixedPointAsks(FixedPointOrderBookSide): side = False                 # noqa
+class FixedPointBids(FixedPointOrderBookSide): side = True                  # noqa
+class FixedPointCountedAsks(FixedPointCountedOrderBookSide): side = False   # noqa
+class FixedPointCountedBids(FixedPointCountedOrderBookSide): side = True    # noqa
+class FixedPointIndexedAsks(FixedPointIndexedOrderBookSide): side = False   # noqa
+class FixedPointIndexedBids(FixedPointIndexedOrderBookSide): side = True    # noqa
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+
+import collections
+from asyncio import current_task
+from contextvars import ContextVar
+from ccxt.base.errors import NotSupported
+from ccxt.async_support.base.ws.cache import BaseCache
+from ccxt.async_support.base.ws.future import Future
+from ccxt.async_support.base.ws.order_book import OrderBook
+
+# -----------------------------------------------------------------------------
+# listeners receive every value resolved for their message hashes, see Client.resolve
+# for the caches of trades, ohlcvs, orders, etc, each value is the list of the entries appended or updated since the previous one
+# other values (order books, tickers, balances) are passed on as they are resolved
+
+
+class Listener:
+    def __init__(self, symbol=None):
+        # only the cache entries of that symbol are passed on
+        self.symbol = symbol
+        self.clients = {}  # client -> message hashes
+        self.error = None
+        # cache id -> number of appends when the previous value was passed on
+        self.appends = {}
+        # the task of the watch call the listener is attached from, see Exchange.listen
+        self.task = None
+
+    def attach(self, client, message_hashes):
+        self.detach()
+        self.clients[client] = message_hashes
+        for message_hash in message_hashes:
+            client.streams.setdefault(message_hash, []).append(self)
+
+    def detach(self):
+        for client, message_hashes in self.clients.items():
+            for message_hash in message_hashes:
+                streams = client.streams.get(message_hash)
+                if streams and self in streams:
+                    streams.remove(self)
+                    if not streams:
+                        del client.streams[message_hash]
+        self.clients = {}
+
+    def new_value(self, value):
+        # the value to pass on, None if a cache has no new entries
+        if isinstance(value, BaseCache):
+            key = id(value)
+            new_appends = value.appends - self.appends.get(key, 0)
+            self.appends[key] = value.appends
+            if new_appends <= 0:
+                return None
+            # a candle or an order updated several times is passed on once, where it was last updated
+            changes = value.changes
+            entries = {}
+            for index in range(max(len(changes) - new_appends, 0), len(changes)):
+                entry = changes[index]
+                entries.pop(id(entry), None)
+                entries[id(entry)] = entry
+            value = list(entries.values())
+            if self.symbol is not None:
+                value = [entry for entry in value if not isinstance(entry, dict) or entry.get('symbol') == self.symbol]
+                if not value:
+                    return None
+        return value
+
+    def put(self, client, value):
+        # called by Client.resolve with every value resolved for the message hashes, see Stream and Callback
+        raise NotSupported('put() not implemented')
+
+    def reject(self, error):
+        self.detach()
+        if self.error is None:
+            self.error = error
+
+    def close(self):
+        self.reject(StopAsyncIteration())
+
+
+# -----------------------------------------------------------------------------
+# a stream queues the values in a bounded queue consumed with async for
+# instead of a future that is resolved once and replaced on every watch call
+#
+# when the queue is full:
+#   'dropOldest' drops the oldest value
+#   'coalesce'   replaces the newest value, the right policy for order books and other values updated in place
+#                the newest slot of a full queue holds the order book itself, copied when it is read or followed by another value
+#   'block'      pauses the reads from the connection until the consumer catches up,
+#                the values of the messages already received are still queued
+
+
+class Stream(Listener):
+    overflows = ['dropOldest', 'coalesce', 'block']
+
+    def __init__(self, max_size=1000, overflow='dropOldest', symbol=None):
+        super(Stream, self).__init__(symbol)
+        self.max_size = max_size
+        self.overflow = overflow
+        self.queue = collections.deque()
+        self.waiter = None
+        self.blocking = False
+        self.blocking_client = None
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.blocked = 0
+        self.max_depth = 0
+        # the order book queued without a copy in the newest slot, under 'coalesce'
+        self.live = None
+
+    def detach(self):
+        super(Stream, self).detach()
+        if self.blocking:
+            self.unblock()
+
+    def put(self, client, value):
+        value = self.new_value(value)
+        if value is None:
+            return
+        self.received += 1
+        queue = self.queue
+        coalesce = self.overflow == 'coalesce'
+        if self.live is not None:
+            if value is self.live:
+                # the newest slot already holds the book as it is now
+                self.coalesced += 1
+                return
+            if len(queue) < self.max_size:
+                # the slot is not replaced by the next value, it keeps the book as it was
+                queue[-1] = self.live.snapshot()
+            self.live = None
+        if isinstance(value, OrderBook):
+            if coalesce and len(queue) >= self.max_size - 1:
+                # the newest slot of a full queue, the book is copied only if that slot is not replaced
+                self.live = value
+            else:
+                # the book is updated in place by the next messages, the queued values are copies
+                value = value.snapshot()
+        if len(queue) >= self.max_size:
+            if coalesce:
+                queue[-1] = value
+                self.coalesced += 1
+                return
+            elif self.overflow == 'block':
+                if not self.blocking:
+                    self.blocking = True
+                    self.blocked += 1
+                    self.blocking_client = client
+                    client.pause_reading()
+            else:
+                queue.popleft()
+                self.dropped += 1
+        queue.append(value)
+        if len(queue) > self.max_depth:
+            self.max_depth = len(queue)
+        self.wake()
+
+    def reject(self, error):
+        # the queued values are still delivered before the error is raised
+        super(Stream, self).reject(error)
+        self.wake()
+
+    def wake(self):
+        if self.waiter is not None:
+            self.waiter.resolve()
+            self.waiter = None
+
+    def unblock(self):
+        self.blocking = False
+        self.blocking_client.resume_reading()
+        self.blocking_client = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        queue = self.queue
+        while not queue:
+            if self.error is not None:
+                raise self.error
+            if self.waiter is None:
+                self.waiter = Future()
+            await self.waiter
+        value = queue.popleft()
+        if value is self.live:
+            value = value.snapshot()
+            self.live = None
+        self.delivered += 1
+        if self.blocking and len(queue) < self.max_size:
+            self.unblock()
+        return value
+
+    def queue_stats(self):
+        return {
+            'depth': len(self.queue),
+            'maxDepth': self.max_depth,
+            'received': self.received,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'coalesced': self.coalesced,
+            'blocked': self.blocked,
+        }
+
+
+# -----------------------------------------------------------------------------
+# a callback is called synchronously from the message handler, right after the unified structure is updated
+# it skips the future and the wakeup of the awaiting task, errors raised by the callback end it
+# done is resolved when the callback ends, or rejected with the error that ended it
+
+
+class Callback(Listener):
+    def __init__(self, callback, symbol=None):
+        super(Callback, self).__init__(symbol)
+        self.callback = callback
+        self.calls = 0
+        self.done = Future()
+
+    def put(self, client, value):
+        value = self.new_value(value)
+        if value is None:
+            return
+        self.calls += 1
+        try:
+            self.callback(value)
+        except Exception as error:
+            self.reject(error)
+
+    def reject(self, error):
+        super(Callback, self).reject(error)
+        self.done.reject(error)
+
+    def close(self):
+        self.detach()
+        self.done.resolve(self.calls)
+
+
+# the listener that the watch calls of the current task attach to, see Exchange.listen
+current_listener = ContextVar('current_listener', default=None)
+
+
+def get_current_listener():
+    # the tasks and callbacks started by the watch call inherit its context, they do not attach to the listener
+    listener = current_listener.get()
+    if listener is None or listener.task is None or listener.task is not current_task():
+        return None
+    return listener
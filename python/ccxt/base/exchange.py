@@ -31,6 +31,9 @@ from ccxt.base.decimal_to_precision import decimal_to_precision
 from ccxt.base.decimal_to_precision import DECIMAL_PLACES, TICK_SIZE, NO_PADDING, TRUNCATE, ROUND, ROUND_UP, ROUND_DOWN, SIGNIFICANT_DIGITS
 from ccxt.base.decimal_to_precision import number_to_string
 from ccxt.base.precise import Precise
+from ccxt.base.json_codec import get_json_codec
+from ccxt.base.markets_cache import get_markets_cache, market_attributes
+from ccxt.base.market_registry import market_registry
 from ccxt.base.types import BalanceAccount, Currency, IndexType, OrderSide, OrderType, Trade, OrderRequest, Market, MarketType, Str, Num
 
 # -----------------------------------------------------------------------------
@@ -73,12 +76,14 @@ import base64
 import binascii
 import calendar
 import collections
+import copy
 import datetime
 from email.utils import parsedate
 # import functools
 import gzip
 import hashlib
 import hmac
+import inspect
 import io
 import json
 import math
@@ -387,6 +392,11 @@ class Exchange(object):
     minFundingAddressLength = 1  # used in check_address
     substituteCommonCurrencyCodes = True
     quoteJsonNumbers = True
+    jsonCodec = None  # 'json', 'orjson', 'msgspec' or 'ujson', see ccxt.base.json_codec
+    marketsCache = None  # True, a directory or {'path', 'ttl', 'refresh'} to keep the loaded markets on disk, see ccxt.base.markets_cache
+    shareMarkets = False  # the instances with the same markets share them, see ccxt.base.market_registry
+    market_table = None  # the shared markets held by the instance
+    messageRoutesTable = None  # the handlers of message_routes(), see route_message
     number: Num = float  # or str (a pointer to a class)
     handleContentTypeApplicationZip = False
     # whether fees should be summed by currency code
@@ -398,6 +408,10 @@ class Exchange(object):
     rateLimitTokens = 16
     rateLimitMaxTokens = 16
     rateLimitUpdateTime = 0
+    adaptiveRateLimit = False  # follow the usage reported in the rateLimitHeaders of the responses, see adapt_rate_limiter
+    rateLimitHeaders = None  # response headers reporting the rate limit usage, see parse_rate_limit_headers
+    rateLimitFactor = 1.0  # the share of the rateLimit the sync rate limiter runs at, see adapt_rate_limiter
+    rateLimitPausedUntil = 0  # the timestamp the sync requests are held back until, see adapt_rate_limiter
     enableLastHttpResponse = True
     enableLastJsonResponse = True
     enableLastResponseHeaders = True
@@ -449,7 +463,7 @@ class Exchange(object):
         self.origin = self.uuid()
         self.userAgent = default_user_agent()
 
-        settings = self.deep_extend(self.describe(), config)
+        settings = self.describe_settings(config)
 
         for key in settings:
             if hasattr(self, key) and isinstance(getattr(self, key), dict):
@@ -463,22 +477,23 @@ class Exchange(object):
         self.after_construct()
 
         # convert all properties from underscore notation foo_bar to camelcase notation fooBar
+        # the methods are aliased on the class once, the other properties on every instance
         cls = type(self)
-        for name in dir(self):
-            if name[0] != '_' and name[-1] != '_' and '_' in name:
-                parts = name.split('_')
-                # fetch_ohlcv → fetchOHLCV (not fetchOhlcv!)
-                exceptions = {'ohlcv': 'OHLCV', 'le': 'LE', 'be': 'BE'}
-                camelcase = parts[0] + ''.join(exceptions.get(i, self.capitalize(i)) for i in parts[1:])
-                attr = getattr(self, name)
-                if isinstance(attr, types.MethodType):
-                    setattr(cls, camelcase, getattr(cls, name))
-                else:
-                    if hasattr(self, camelcase):
-                        if attr is not None:
-                            setattr(self, camelcase, attr)
-                    else:
+        names = self.camelcase_table()
+        instance_names = [name for name in self.__dict__ if name[0] != '_' and name[-1] != '_' and '_' in name]
+        if instance_names:
+            names = sorted(set(names).union(instance_names))
+        for name in names:
+            camelcase = self.camelcase(name)
+            attr = getattr(self, name)
+            if isinstance(attr, types.MethodType):
+                setattr(cls, camelcase, getattr(cls, name))
+            else:
+                if hasattr(self, camelcase):
+                    if attr is not None:
                         setattr(self, camelcase, attr)
+                else:
+                    setattr(self, camelcase, attr)
 
         self.tokenBucket = self.extend({
             'refillRate': 1.0 / self.rateLimit if self.rateLimit > 0 else float('inf'),
@@ -487,6 +502,11 @@ class Exchange(object):
             'defaultCost': 1.0,
         }, getattr(self, 'tokenBucket', {}))
 
+        self.json_codec = get_json_codec(self.jsonCodec)
+        self.markets_cache = get_markets_cache(self.marketsCache)
+        # the options the markets are keyed by, taken before load_markets() changes them, see markets_key
+        self.markets_options = self.markets_options_snapshot() if (self.markets_cache or self.shareMarkets) else None
+
         if not self.session and self.synchronous:
             self.session = Session()
             self.session.trust_env = self.requests_trust_env
@@ -508,15 +528,152 @@ class Exchange(object):
     def describe(self):
         return {}
 
+    def describe_skeleton(self):
+        # describe() does not depend on the instance, it is built once per class
+        # the methods bound to the instance it is built with are replaced with their functions
+        # and listed with the lists of the skeleton, see describe_settings
+        cls = type(self)
+        skeleton = cls.__dict__.get('_describe_skeleton')
+        if skeleton is None:
+            describe = self.describe()
+            paths = []
+            stack = [((), describe)]
+            while stack:
+                path, node = stack.pop()
+                for key, value in node.items():
+                    if isinstance(value, dict):
+                        stack.append((path + (key,), value))
+                    elif isinstance(value, list):
+                        paths.append((path + (key,), value, False))
+                    elif isinstance(value, types.MethodType) and value.__self__ is self:
+                        node[key] = value.__func__
+                        paths.append((path + (key,), value.__func__, True))
+            skeleton = cls._describe_skeleton = (describe, paths)
+        return skeleton
+
+    def describe_settings(self, config={}):
+        # same as self.deep_extend(self.describe(), config)
+        # deep_extend copies the dicts of the skeleton, the lists are copied and the methods bound here
+        describe, paths = self.describe_skeleton()
+        settings = self.deep_extend(describe, config)
+        for path, value, bound in paths:
+            node = settings
+            for key in path[:-1]:
+                node = node.get(key)
+                if not isinstance(node, dict):
+                    break
+            else:
+                key = path[-1]
+                # unless the config has replaced it
+                if node.get(key) is value:
+                    node[key] = types.MethodType(value, self) if bound else copy.deepcopy(value)
+        return settings
+
+    @classmethod
+    def camelcase_table(cls):
+        # the underscore names of the class that are not aliased on the class, built once per class
+        # the methods, static methods and class methods of the class are aliased on the class here
+        table = cls.__dict__.get('_camelcase_table')
+        if table is None:
+            table = []
+            for name in dir(cls):
+                if name[0] != '_' and name[-1] != '_' and '_' in name:
+                    attr = inspect.getattr_static(cls, name)
+                    if isinstance(attr, (staticmethod, classmethod)):
+                        setattr(cls, cls.camelcase(name), attr)
+                    elif isinstance(getattr(cls, name), types.FunctionType):
+                        # methods and Entry api methods
+                        setattr(cls, cls.camelcase(name), getattr(cls, name))
+                    else:
+                        table.append(name)
+            cls._camelcase_table = table
+        return table
+
+    @staticmethod
+    def camelcase(name):
+        # fetch_ohlcv → fetchOHLCV (not fetchOhlcv!)
+        parts = name.split('_')
+        exceptions = {'ohlcv': 'OHLCV', 'le': 'LE', 'be': 'BE'}
+        return parts[0] + ''.join(exceptions.get(i, Exchange.capitalize(i)) for i in parts[1:])
+
     def throttle(self, cost=None):
+        paused = self.rateLimitPausedUntil - self.milliseconds()
+        if paused > 0:
+            time.sleep(paused / 1000.0)
+        backend = self.tokenBucket.get('backend')
+        if backend is not None:
+            # a token bucket shared with other processes
+            delay = backend.reserve(1 if cost is None else cost)
+            if delay > 0:
+                time.sleep(delay / 1000.0)
+            return
         now = float(self.milliseconds())
         elapsed = now - self.lastRestRequestTimestamp
         cost = 1 if cost is None else cost
-        sleep_time = self.rateLimit * cost
+        sleep_time = self.rateLimit * cost / self.rateLimitFactor
         if elapsed < sleep_time:
             delay = sleep_time - elapsed
             time.sleep(delay / 1000.0)
 
+    def parse_rate_limit_headers(self, status_code, headers, url=None):
+        # reads the usage reported by the exchange, for example
+        # 'rateLimitHeaders': {'usedHeader': 'x-mbx-used-weight-1m', 'limit': 6000, 'window': 60000}
+        # 'rateLimitHeaders': {'remainingHeader': 'x-ratelimit-remaining', 'limitHeader': 'x-ratelimit-limit', 'window': 1000}
+        # the endpoints that count against different limits are set by the url prefix of the request, without the scheme
+        # 'rateLimitHeaders': {'usedHeader': ..., 'endpoints': {'api.binance.com/api/': {'limit': 6000}, ...}}
+        # the responses of the other endpoints are not used
+        # returns the factor of the configured rate to run at and the milliseconds to pause for, None if unknown
+        config = self.extend({
+            'retryAfterHeader': 'retry-after',  # seconds
+            'target': 0.9,  # the share of the exchange limit to run at
+            'minFactor': 0.1,  # bounds of the adjusted rate relative to the configured one
+            'maxFactor': 2.0,
+        }, self.rateLimitHeaders)
+        endpoints = config.get('endpoints')
+        if endpoints is not None:
+            endpoint = None
+            for prefix in endpoints:
+                # also behind a proxyUrl that prepends its own address
+                if url and ('://' + prefix) in url:
+                    endpoint = endpoints[prefix]
+                    break
+            if endpoint is None:
+                return None, None
+            config = self.extend(config, endpoint)
+        lowercase = {}
+        for key in headers:
+            lowercase[key.lower()] = headers[key]
+        pause = None
+        if status_code == 429 or status_code == 418:
+            retry_after = self.safe_float(lowercase, config['retryAfterHeader'].lower())
+            if retry_after is not None:
+                pause = retry_after * 1000
+        limit = self.safe_float(lowercase, config['limitHeader'].lower()) if 'limitHeader' in config else self.safe_float(config, 'limit')
+        used = None
+        if limit and 'usedHeader' in config:
+            used = self.safe_float(lowercase, config['usedHeader'].lower())
+        elif limit and 'remainingHeader' in config:
+            remaining = self.safe_float(lowercase, config['remainingHeader'].lower())
+            used = None if remaining is None else limit - remaining
+        if used is None:
+            return None, pause
+        # speed up while the exchange reports spare capacity, slow down when approaching the limit
+        usage = used / limit
+        factor = (1 - usage) / (1 - config['target'])
+        factor = min(max(factor, config['minFactor']), config['maxFactor'])
+        if usage >= 1 and 'window' in config:
+            # the budget is spent, wait for the used weight to age out of the window back to the target
+            pause = max(pause or 0, (used - limit * config['target']) * config['window'] / limit)
+        return factor, pause
+
+    def adapt_rate_limiter(self, status_code, headers, url=None):
+        # corrects the rate limiter with the usage reported in the response headers, see rateLimitHeaders
+        factor, pause = self.parse_rate_limit_headers(status_code, headers, url)
+        if factor is not None:
+            self.rateLimitFactor = factor
+        if pause is not None:
+            self.rateLimitPausedUntil = max(self.rateLimitPausedUntil, self.milliseconds() + pause)
+
     @staticmethod
     def gzip_deflate(response, text):
         encoding = response.info().get('Content-Encoding')
@@ -549,9 +706,9 @@ class Exchange(object):
 
     def on_json_response(self, response_body):
         if self.quoteJsonNumbers:
-            return json.loads(response_body, parse_float=str, parse_int=str)
+            return self.json_codec.loads_quoted(response_body)
         else:
-            return json.loads(response_body)
+            return self.json_codec.loads(response_body)
 
     def fetch(self, url, method='GET', headers=None, body=None):
         """Perform a HTTP request and return decoded JSON data"""
@@ -615,6 +772,8 @@ class Exchange(object):
             headers = response.headers
             http_status_code = response.status_code
             http_status_text = response.reason
+            if self.adaptiveRateLimit and self.rateLimitHeaders:
+                self.adapt_rate_limiter(http_status_code, headers, url)
             http_response = self.on_rest_response(http_status_code, http_status_text, url, method, headers, response.text, request_headers, request_body)
             json_response = self.parse_json(http_response)
             # FIXME remove last_x_responses from subclasses
@@ -970,14 +1129,37 @@ class Exchange(object):
         result = None
         for arg in args:
             if isinstance(arg, dict):
-                if not isinstance(result, dict):
-                    result = {}
-                for key in arg:
-                    result[key] = Exchange.deep_extend(result[key] if key in result else None, arg[key])
+                if isinstance(result, dict):
+                    # result is a copy made here, it is merged in place
+                    Exchange.deep_merge(result, arg)
+                else:
+                    result = Exchange.deep_copy(arg)
             else:
                 result = arg
         return result
 
+    @staticmethod
+    def deep_copy(dictionary):
+        # copies the nested dicts, the other values are shared
+        result = dict(dictionary)
+        for key, value in result.items():
+            if isinstance(value, dict):
+                result[key] = Exchange.deep_copy(value)
+        return result
+
+    @staticmethod
+    def deep_merge(target, source):
+        # target is changed in place, the nested dicts of source are copied
+        for key, value in source.items():
+            if isinstance(value, dict):
+                current = target.get(key)
+                if isinstance(current, dict):
+                    Exchange.deep_merge(current, value)
+                else:
+                    target[key] = Exchange.deep_copy(value)
+            else:
+                target[key] = value
+
     @staticmethod
     def filter_by(array, key, value=None):
         array = Exchange.to_array(array)
@@ -1491,11 +1673,100 @@ class Exchange(object):
                 if not self.markets_by_id:
                     return self.set_markets(self.markets)
                 return self.markets
+        key = self.markets_key(params) if (self.markets_cache or self.shareMarkets) else None
+        if key is not None and not reload:
+            if self.read_shared_markets(key):
+                return self.markets
+            if self.markets_cache and self.read_markets_cache(key, self.markets_cache.ttl) is not None:
+                if self.safe_bool(self.options, 'adjustForTimeDifference'):
+                    # the time difference stored with the markets is outdated
+                    self.load_time_difference()
+                return self.markets
+        options = copy.deepcopy(self.options) if key is not None else None
         currencies = None
         if self.has['fetchCurrencies'] is True:
             currencies = self.fetch_currencies()
         markets = self.fetch_markets(params)
-        return self.set_markets(markets, currencies)
+        result = self.set_markets(markets, currencies)
+        if key is not None:
+            self.markets_loaded(key, self.changed_options(options))
+        return result
+
+    def markets_options_snapshot(self):
+        try:
+            return json.dumps(self.options, sort_keys=True, default=str)
+        except TypeError:
+            # keys of different types cannot be sorted
+            return None
+
+    def markets_key(self, params={}):
+        # the markets depend on the endpoints, the options at construction, the number type and the params of fetch_markets,
+        # not on the credentials, the accounts of an exchange share their markets
+        # fetching the markets changes some options, the key does not change with them
+        if self.markets_options is None:
+            return None
+        try:
+            request = json.dumps([self.urls.get('api'), self.markets_options, str(self.number), self.precisionMode, params], sort_keys=True, default=str)
+        except TypeError:
+            return None
+        return self.hash(self.encode(request), 'md5')
+
+    def read_markets_cache(self, key, max_age=None):
+        # sets the markets of the cache file and returns its age in ms, None if there is no valid file younger than max_age ms
+        cached = self.markets_cache.read(self.id, key, __version__)
+        if cached is None:
+            return None
+        timestamp, data = cached
+        age = self.milliseconds() - timestamp
+        if max_age is not None and age >= max_age:
+            return None
+        for name in market_attributes:
+            setattr(self, name, data[name])
+        self.options.update(data['options'])
+        self.publish_markets(key, data['options'])
+        return age
+
+    def read_shared_markets(self, key):
+        # sets the markets loaded by another instance, returns False if there are none
+        if not self.shareMarkets:
+            return False
+        table = market_registry.get(self.id, key)
+        if table is None:
+            return False
+        for name in market_attributes:
+            setattr(self, name, table[name])
+        # the options are not shared, each instance changes its own
+        self.options.update(copy.deepcopy(table['options']))
+        self.market_table = table
+        return True
+
+    def publish_markets(self, key, options={}):
+        # the other instances with the same markets use these ones and the options changed by fetching them
+        # set_markets() replaces them with new ones
+        if self.shareMarkets:
+            data = {name: getattr(self, name) for name in market_attributes}
+            data['options'] = options
+            self.market_table = market_registry.set(self.id, key, data)
+
+    def changed_options(self, options):
+        # the options set by fetch_markets() and fetch_currencies(), like the network ids or the time difference,
+        # they are kept with the markets and set again when the markets are read instead of fetched
+        return {key: value for key, value in self.options.items() if key not in options or options[key] != value}
+
+    def markets_loaded(self, key, options={}):
+        # called with the fetched markets and the options changed by fetching them
+        self.publish_markets(key, options)
+        if self.markets_cache:
+            self.write_markets_cache(key, options)
+
+    def write_markets_cache(self, key, options={}):
+        data = {name: getattr(self, name) for name in market_attributes}
+        data['options'] = options
+        try:
+            self.markets_cache.write(self.id, key, __version__, self.milliseconds(), data)
+        except Exception as e:
+            # the markets are loaded, they will be fetched again next time
+            self.logger.warning(self.id + ' could not write the markets cache: ' + str(e))
 
     def load_fees(self, reload=False):
         if not reload:
@@ -1863,6 +2134,21 @@ class Exchange(object):
         # return the first index of the cache that can be applied to the orderbook or -1 if not possible
         return -1
 
+    def message_routes(self):
+        # event -> handler method, for the exchanges that dispatch their messages with routeMessage
+        return {}
+
+    def route_message(self, client, message, event):
+        # calls the handler of the event, the table of messageRoutes() is built once on the first message
+        # returns False if there is no handler for the event
+        if self.messageRoutesTable is None:
+            self.messageRoutesTable = self.message_routes()
+        handler = self.safe_value(self.messageRoutesTable, event)
+        if handler is None:
+            return False
+        handler(client, message)
+        return True
+
     def find_timeframe(self, timeframe, timeframes=None):
         if timeframes is None:
             timeframes = self.timeframes
@@ -2454,20 +2740,23 @@ class Exchange(object):
 
     def set_markets(self, markets, currencies=None):
         values = []
+        self.markets = {}
         self.markets_by_id = {}
         # handle marketId conflicts
         # we insert spot markets first
         marketValues = self.sort_by(self.to_array(markets), 'spot', True, True)
+        # the defaults shared by all the markets are merged once
+        marketStructure = self.deep_extend(self.safe_market_structure(), {
+            'precision': self.precision,
+            'limits': self.limits,
+        }, self.fees['trading'])
         for i in range(0, len(marketValues)):
             value = marketValues[i]
             if value['id'] in self.markets_by_id:
                 (self.markets_by_id[value['id']]).append(value)
             else:
                 self.markets_by_id[value['id']] = [value]
-            market = self.deep_extend(self.safe_market_structure(), {
-                'precision': self.precision,
-                'limits': self.limits,
-            }, self.fees['trading'], value)
+            market = self.deep_extend(marketStructure, value)
             if market['linear']:
                 market['subType'] = 'linear'
             elif market['inverse']:
@@ -2475,7 +2764,8 @@ class Exchange(object):
             else:
                 market['subType'] = None
             values.append(market)
-        self.markets = self.index_by(values, 'symbol')
+            if market['symbol'] is not None:
+                self.markets[market['symbol']] = market
         marketsSortedBySymbol = self.keysort(self.markets)
         marketsSortedById = self.keysort(self.markets_by_id)
         self.symbols = list(marketsSortedBySymbol.keys())
@@ -2484,11 +2774,14 @@ class Exchange(object):
             # currencies is always None when called in constructor but not when called from loadMarkets
             self.currencies = self.deep_extend(self.currencies, currencies)
         else:
-            baseCurrencies = []
-            quoteCurrencies = []
+            # the currency with the highest precision of each code, the base currencies first
+            baseCurrencies = {}
+            quoteCurrencies = {}
+            baseCodes = {}
+            quoteCodes = {}
+            defaultCurrencyPrecision = 8 if (self.precisionMode == DECIMAL_PLACES) else self.parse_number('1e-8')
             for i in range(0, len(values)):
                 market = values[i]
-                defaultCurrencyPrecision = 8 if (self.precisionMode == DECIMAL_PLACES) else self.parse_number('1e-8')
                 marketPrecision = self.safe_dict(market, 'precision', {})
                 if 'base' in market:
                     currency = self.safe_currency_structure({
@@ -2497,7 +2790,7 @@ class Exchange(object):
                         'code': self.safe_string(market, 'base'),
                         'precision': self.safe_value_2(marketPrecision, 'base', 'amount', defaultCurrencyPrecision),
                     })
-                    baseCurrencies.append(currency)
+                    self.set_market_currency(currency, baseCurrencies, baseCodes)
                 if 'quote' in market:
                     currency = self.safe_currency_structure({
                         'id': self.safe_string_2(market, 'quoteId', 'quote'),
@@ -2505,33 +2798,40 @@ class Exchange(object):
                         'code': self.safe_string(market, 'quote'),
                         'precision': self.safe_value_2(marketPrecision, 'quote', 'price', defaultCurrencyPrecision),
                     })
-                    quoteCurrencies.append(currency)
-            baseCurrencies = self.sort_by(baseCurrencies, 'code', False, '')
-            quoteCurrencies = self.sort_by(quoteCurrencies, 'code', False, '')
+                    self.set_market_currency(currency, quoteCurrencies, quoteCodes)
             self.baseCurrencies = self.index_by(baseCurrencies, 'code')
             self.quoteCurrencies = self.index_by(quoteCurrencies, 'code')
-            allCurrencies = self.array_concat(baseCurrencies, quoteCurrencies)
-            groupedCurrencies = self.group_by(allCurrencies, 'code')
-            codes = list(groupedCurrencies.keys())
-            resultingCurrencies = []
+            codes = list(self.keysort(self.extend(baseCodes, quoteCodes)).keys())
+            resultingCurrencies = {}
             for i in range(0, len(codes)):
                 code = codes[i]
-                groupedCurrenciesCode = self.safe_list(groupedCurrencies, code, [])
-                highestPrecisionCurrency = self.safe_value(groupedCurrenciesCode, 0)
-                for j in range(1, len(groupedCurrenciesCode)):
-                    currentCurrency = groupedCurrenciesCode[j]
-                    if self.precisionMode == TICK_SIZE:
-                        highestPrecisionCurrency = currentCurrency if (currentCurrency['precision'] < highestPrecisionCurrency['precision']) else highestPrecisionCurrency
-                    else:
-                        highestPrecisionCurrency = currentCurrency if (currentCurrency['precision'] > highestPrecisionCurrency['precision']) else highestPrecisionCurrency
-                resultingCurrencies.append(highestPrecisionCurrency)
-            sortedCurrencies = self.sort_by(resultingCurrencies, 'code')
-            self.currencies = self.deep_extend(self.currencies, self.index_by(sortedCurrencies, 'code'))
+                baseCurrency = self.safe_dict(baseCodes, code)
+                quoteCurrency = self.safe_dict(quoteCodes, code)
+                if (baseCurrency is None) or ((quoteCurrency is not None) and self.is_higher_currency_precision(quoteCurrency, baseCurrency)):
+                    resultingCurrencies[code] = quoteCurrency
+                else:
+                    resultingCurrencies[code] = baseCurrency
+            self.currencies = self.deep_extend(self.currencies, resultingCurrencies)
         self.currencies_by_id = self.index_by(self.currencies, 'id')
         currenciesSortedByCode = self.keysort(self.currencies)
         self.codes = list(currenciesSortedByCode.keys())
         return self.markets
 
+    def set_market_currency(self, currency, currenciesByCode, highestPrecisionByCode):
+        # the last currency of a code and the first one with its highest precision
+        code = currency['code']
+        if code is None:
+            return
+        currenciesByCode[code] = currency
+        highestPrecision = self.safe_dict(highestPrecisionByCode, code)
+        if (highestPrecision is None) or self.is_higher_currency_precision(currency, highestPrecision):
+            highestPrecisionByCode[code] = currency
+
+    def is_higher_currency_precision(self, currency, other):
+        if self.precisionMode == TICK_SIZE:
+            return currency['precision'] < other['precision']
+        return currency['precision'] > other['precision']
+
     def get_describe_for_extended_ws_exchange(self, currentRestInstance: Any, parentRestInstance: Any, wsBaseDescribe: dict):
         extendedRestDescribe = self.deep_extend(parentRestInstance.describe(), currentRestInstance.describe())
         superWithRestDescribe = self.deep_extend(extendedRestDescribe, wsBaseDescribe)
@@ -3589,7 +3889,7 @@ class Exchange(object):
     def fetch2(self, path, api: Any = 'public', method='GET', params={}, headers: Any = None, body: Any = None, config={}):
         if self.enableRateLimit:
             cost = self.calculate_rate_limiter_cost(api, method, path, params, config)
-            self.throttle(cost)
+            self.throttle(self.token_buckets_cost(cost, config))
         self.lastRestRequestTimestamp = self.milliseconds()
         request = self.sign(path, api, method, params, headers, body)
         self.last_request_headers = request['headers']
@@ -4002,6 +4302,10 @@ class Exchange(object):
     def calculate_rate_limiter_cost(self, api, method, path, params, config={}):
         return self.safe_value(config, 'cost', 1)
 
+    def token_buckets_cost(self, cost, config={}):
+        # the async python exchanges with extra tokenBuckets also charge the costs in config['tokenBuckets']
+        return cost
+
     def fetch_ticker(self, symbol: str, params={}):
         if self.has['fetchTickers']:
             self.load_markets()
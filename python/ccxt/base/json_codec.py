@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+"""JSON encoders/decoders used for the REST responses and the WebSocket messages"""
+
+import json
+
+from ccxt.base.errors import NotSupported
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'JsonCodec',
+    'OrjsonCodec',
+    'MsgspecCodec',
+    'UjsonCodec',
+    'json_codecs',
+    'get_json_codec',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class JsonCodec:
+    """The standard library json module
+
+    loads_quoted() keeps the numbers as strings the way they were sent, for quoteJsonNumbers.
+    The other codecs cannot hook the parsing of numbers without losing their text,
+    so they use this one for loads_quoted()."""
+
+    name = 'json'
+
+    def loads(self, string):
+        return json.loads(string)
+
+    def loads_quoted(self, string):
+        return json.loads(string, parse_float=str, parse_int=str)
+
+    def dumps(self, data):
+        return json.dumps(data, separators=(',', ':'))
+
+
+class OrjsonCodec(JsonCodec):
+    name = 'orjson'
+
+    def loads(self, string):
+        try:
+            return orjson.loads(string)
+        except ValueError:
+            # NaN, integers over 64 bits
+            return json.loads(string)
+
+    def dumps(self, data):
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # Decimal and other types orjson does not serialize
+            return json.dumps(data, separators=(',', ':'))
+
+
+class MsgspecCodec(JsonCodec):
+    name = 'msgspec'
+
+    def __init__(self):
+        self.decoder = msgspec.json.Decoder()
+        self.encoder = msgspec.json.Encoder()
+
+    def loads(self, string):
+        try:
+            return self.decoder.decode(string)
+        except msgspec.DecodeError:
+            return json.loads(string)
+
+    def dumps(self, data):
+        try:
+            return self.encoder.encode(data).decode()
+        except TypeError:
+            return json.dumps(data, separators=(',', ':'))
+
+
+class UjsonCodec(JsonCodec):
+    name = 'ujson'
+
+    def loads(self, string):
+        try:
+            return ujson.loads(string)
+        except ValueError:
+            return json.loads(string)
+
+    def dumps(self, data):
+        try:
+            return ujson.dumps(data, ensure_ascii=False, escape_forward_slashes=False)
+        except (TypeError, OverflowError):
+            # integers over 64 bits and the types ujson does not serialize
+            return json.dumps(data, separators=(',', ':'))
+
+
+json_codecs = {
+    'json': (JsonCodec, json),
+    'orjson': (OrjsonCodec, orjson),
+    'msgspec': (MsgspecCodec, msgspec),
+    'ujson': (UjsonCodec, ujson),
+}
+
+
+def get_json_codec(codec=None):
+    """Returns a codec instance from its name ('json', 'orjson', 'msgspec', 'ujson'), None means 'json'"""
+    if codec is None:
+        codec = 'json'
+    if not isinstance(codec, str):
+        return codec
+    if codec not in json_codecs:
+        raise NotSupported('unknown jsonCodec "' + codec + '", supported codecs are: ' + ', '.join(json_codecs))
+    cls, module = json_codecs[codec]
+    if module is None:
+        raise NotSupported('jsonCodec "' + codec + '" requires the "' + codec + '" module that can be installed by "pip install ' + codec + '"')
+    return cls()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+"""Imports the exchange classes of the ccxt, ccxt.async_support and ccxt.pro packages on first access"""
+
+import importlib
+import sys
+import types
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'LazyExchangesModule',
+    'lazy_load_exchanges',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class LazyExchangesModule(types.ModuleType):
+    """A package whose exchange classes, listed in its `exchanges`, are imported from their modules on first access"""
+
+    def __getattr__(self, name):
+        # only called for the names that are not set yet
+        if name in self.__dict__.get('_exchange_ids', ()):
+            module = importlib.import_module(self.__name__ + '.' + name)
+            setattr(self, name, module)
+            return self.__dict__[name]
+        raise AttributeError('module ' + repr(self.__name__) + ' has no attribute ' + repr(name))
+
+    def __setattr__(self, name, value):
+        # importing ccxt.binance sets ccxt.binance to the module, the package exposes the class instead
+        if isinstance(value, types.ModuleType) and name in self.__dict__.get('_exchange_ids', ()):
+            value = getattr(value, name)
+        super(LazyExchangesModule, self).__setattr__(name, value)
+
+    def __dir__(self):
+        return sorted(set(super(LazyExchangesModule, self).__dir__()) | self._exchange_ids)
+
+
+def lazy_load_exchanges(module_name):
+    module = sys.modules[module_name]
+    module._exchange_ids = frozenset(module.exchanges)
+    module.__class__ = LazyExchangesModule
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+"""Process-wide markets shared by the exchange instances with the same markets, see Exchange.shareMarkets"""
+
+import weakref
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'MarketTable',
+    'MarketRegistry',
+    'market_registry',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class MarketTable(dict):
+    """The attributes set by set_markets(), held by all the instances sharing them, they must not be changed
+
+    'options' holds the options changed by fetching the markets, each instance sets a copy of them."""
+
+    __slots__ = ('__weakref__',)
+
+
+class MarketRegistry:
+    """The tables of markets by exchange id and markets key, see Exchange.markets_key()
+
+    A table is dropped when no exchange instance holds it anymore.
+    An async instance fetching the markets registers an event, the others wait for it instead of fetching them too."""
+
+    def __init__(self):
+        self.tables = weakref.WeakValueDictionary()  # (exchange id, markets key) -> MarketTable
+        self.loading = {}  # (exchange id, markets key) -> (event loop, asyncio.Event)
+
+    def get(self, exchange_id, key):
+        return self.tables.get((exchange_id, key))
+
+    def set(self, exchange_id, key, data):
+        table = MarketTable(data)
+        self.tables[(exchange_id, key)] = table
+        return table
+
+    def clear(self):
+        self.tables.clear()
+
+    def __len__(self):
+        return len(self.tables)
+
+
+market_registry = MarketRegistry()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+"""Persists the markets and currencies loaded by load_markets() to local files, see Exchange.marketsCache"""
+
+import os
+import pickle
+import tempfile
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'MarketsCache',
+    'get_markets_cache',
+    'market_attributes',
+]
+
+# -----------------------------------------------------------------------------
+
+# the exchange attributes set by set_markets()
+market_attributes = [
+    'markets',
+    'markets_by_id',
+    'symbols',
+    'ids',
+    'currencies',
+    'currencies_by_id',
+    'codes',
+    'baseCurrencies',
+    'quoteCurrencies',
+]
+
+
+class MarketsCache:
+    """A directory of pickle files, one per exchange id and markets key
+
+    A file holds a header, checked before the markets are unpickled, then the market attributes
+    and the options changed by fetching the markets.
+    The files written by another version of ccxt or of this format are ignored.
+    Files younger than ttl ms are used instead of fetching the markets, older ones are used
+    while the markets are fetched again in the background by the async exchanges, if refresh is set.
+    The files are only read from the local cache directory, pickle must not load untrusted files."""
+
+    version = 2
+    ttl = 3600000  # 1 hour
+
+    def __init__(self, path=None, ttl=None, refresh=True):
+        if path is None:
+            base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+            path = os.path.join(base, 'ccxt', 'markets')
+        self.path = path
+        self.ttl = self.ttl if ttl is None else ttl
+        self.refresh = refresh
+
+    def file(self, exchange_id, key):
+        return os.path.join(self.path, exchange_id + '-' + key + '.pickle')
+
+    def read(self, exchange_id, key, ccxt_version):
+        # returns the timestamp and the market attributes of the file, None if there is no valid file
+        try:
+            with open(self.file(exchange_id, key), 'rb') as f:
+                header = pickle.load(f)
+                if header.get('version') != self.version or header.get('ccxt') != ccxt_version:
+                    return None
+                return header['timestamp'], pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, KeyError, ValueError, TypeError):
+            return None
+
+    def write(self, exchange_id, key, ccxt_version, timestamp, data):
+        # written to a temporary file first, the readers never see a partial file
+        os.makedirs(self.path, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=self.path, prefix='.' + exchange_id + '-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                header = {'version': self.version, 'ccxt': ccxt_version, 'id': exchange_id, 'timestamp': timestamp}
+                pickle.dump(header, f, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, self.file(exchange_id, key))
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+def get_markets_cache(settings):
+    """Returns the cache for the marketsCache setting: None or False, True, a directory or {'path', 'ttl', 'refresh'}"""
+    if not settings:
+        return None
+    if isinstance(settings, MarketsCache):
+        return settings
+    if settings is True:
+        return MarketsCache()
+    if isinstance(settings, str):
+        return MarketsCache(settings)
+    return MarketsCache(settings.get('path'), settings.get('ttl'), settings.get('refresh', True))
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+"""A token bucket kept in shared memory so that several processes can spend one rate limit"""
+
+import mmap
+import os
+import struct
+from time import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'SharedMemoryTokenBucket',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class SharedMemoryTokenBucket:
+    """Token bucket state (tokens, last refill timestamp) mapped from a file, guarded by a file lock.
+
+    Every process on the host that opens the same path shares the bucket, for example
+    SharedMemoryTokenBucket('/dev/shm/ccxt-binance', {'refillRate': 1 / 50})
+    The first process to open the file initializes it with the config tokens."""
+
+    # magic, tokens, timestamp (milliseconds)
+    layout = struct.Struct('<Qdd')
+    magic = 0x6363787462756b74  # 'ccxtbukt'
+
+    def __init__(self, path, config={}):
+        self.path = path
+        self.config = {
+            'refillRate': 1.0,
+            'capacity': 1.0,
+            'tokens': 0,
+        }
+        self.config.update(config)
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self.lock()
+        try:
+            if os.fstat(self.fd).st_size < self.layout.size:
+                os.ftruncate(self.fd, self.layout.size)
+            self.memory = mmap.mmap(self.fd, self.layout.size)
+            magic, tokens, timestamp = self.layout.unpack_from(self.memory)
+            if magic != self.magic:
+                self.layout.pack_into(self.memory, 0, self.magic, self.config['tokens'], time() * 1000)
+        finally:
+            self.unlock()
+
+    def lock(self):
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            os.lseek(self.fd, 0, os.SEEK_SET)
+            msvcrt.locking(self.fd, msvcrt.LK_LOCK, 1)
+
+    def unlock(self):
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            os.lseek(self.fd, 0, os.SEEK_SET)
+            msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+
+    def reserve(self, cost=1.0):
+        """Spends cost tokens and returns the delay in milliseconds before the request may be sent.
+
+        Tokens are taken immediately, so concurrent callers queue up behind each other,
+        a request proceeds once the tokens left by the previous requests are back to zero."""
+        self.lock()
+        try:
+            magic, tokens, timestamp = self.layout.unpack_from(self.memory)
+            now = time() * 1000
+            elapsed = max(now - timestamp, 0)
+            tokens = min(tokens + elapsed * self.config['refillRate'], self.config['capacity'])
+            delay = 0 if tokens >= 0 else -tokens / self.config['refillRate']
+            self.layout.pack_into(self.memory, 0, magic, tokens - cost, now)
+        finally:
+            self.unlock()
+        return delay
+
+    def close(self):
+        if self.memory is not None:
+            self.memory.close()
+            self.memory = None
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
@@ -16,6 +16,11 @@ class binanceus(binance, ImplicitAPI):
             'countries': ['US'],  # US
             'hostname': 'binance.us',
             'rateLimit': 50,  # 1200 req per min
+            'rateLimitHeaders': {
+                'endpoints': {
+                    'api.binance.us/api/': {'limit': 1200},
+                },
+            },
             'certified': False,
             'pro': True,
             'urls': {
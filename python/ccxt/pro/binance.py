@@ -2720,21 +2720,8 @@ class binance(ccxt.async_support.binance):
         if self.safe_string(code, 0) == '5':
             client.reset(message)
 
-    def handle_message(self, client: Client, message):
-        # handle WebSocketAPI
-        status = self.safe_string(message, 'status')
-        error = self.safe_value(message, 'error')
-        if (error is not None) or (status is not None and status != '200'):
-            self.handle_ws_error(client, message)
-            return
-        id = self.safe_string(message, 'id')
-        subscriptions = self.safe_value(client.subscriptions, id)
-        method = self.safe_value(subscriptions, 'method')
-        if method is not None:
-            method(client, message)
-            return
-        # handle other APIs
-        methods = {
+    def message_routes(self):
+        return {
             'depthUpdate': self.handle_order_book,
             'trade': self.handle_trade,
             'aggTrade': self.handle_trade,
@@ -2752,12 +2739,26 @@ class binance(ccxt.async_support.binance):
             'executionReport': self.handle_order_update,
             'ORDER_TRADE_UPDATE': self.handle_order_update,
         }
+
+    def handle_message(self, client: Client, message):
+        # handle WebSocketAPI
+        status = self.safe_string(message, 'status')
+        error = self.safe_value(message, 'error')
+        if (error is not None) or (status is not None and status != '200'):
+            self.handle_ws_error(client, message)
+            return
+        id = self.safe_string(message, 'id')
+        subscriptions = self.safe_value(client.subscriptions, id)
+        method = self.safe_value(subscriptions, 'method')
+        if method is not None:
+            method(client, message)
+            return
+        # handle other APIs
         event = self.safe_string(message, 'e')
         if isinstance(message, list):
             data = message[0]
             event = self.safe_string(data, 'e') + '@arr'
-        method = self.safe_value(methods, event)
-        if method is None:
+        if not self.route_message(client, message, event):
             requestId = self.safe_string(message, 'id')
             if requestId is not None:
                 self.handle_subscription_status(client, message)
@@ -2776,5 +2777,3 @@ class binance(ccxt.async_support.binance):
             if event is None:
                 self.handle_ticker(client, message)
                 self.handle_tickers(client, message)
-        else:
-            method(client, message)
@@ -0,0 +1,61 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import gzip  # noqa: E402
+import zlib  # noqa: E402
+from types import SimpleNamespace  # noqa: E402
+from aiohttp import WSMsgType  # noqa: E402
+from ccxt.async_support.base.ws.aiohttp_client import AiohttpClient  # noqa: E402
+from ccxt.async_support.base.ws.functions import ungzip, gunzip, inflate, is_json_encoded_bytes  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+message = b'{"e":"trade","p":"0.1","q":[1,2]}'
+assert ungzip(gzip.compress(message)) == message
+assert gunzip(gzip.compress(message)) == message.decode()
+deflate = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+assert inflate(deflate.compress(message) + deflate.flush()) == message
+
+assert is_json_encoded_bytes(message)
+assert is_json_encoded_bytes(b'[1]')
+assert not is_json_encoded_bytes(b'{')
+assert not is_json_encoded_bytes(b'pong')
+assert not is_json_encoded_bytes(b'')
+
+# ----------------------------------------------------------------------------
+
+
+def binary(data):
+    return SimpleNamespace(type=WSMsgType.BINARY, data=data)
+
+
+async def main():
+    received = []
+    client = AiohttpClient('wss://example.com', lambda client, message: received.append(message), None, None, None, {'asyncio_loop': asyncio.get_running_loop()})
+    # a gzip frame
+    client.gunzip = True
+    client.handle_message(binary(gzip.compress(message)))
+    # a raw deflate frame
+    client.gunzip = False
+    client.inflate = True
+    deflate = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    client.handle_message(binary(deflate.compress(message) + deflate.flush()))
+    # plain json bytes
+    client.inflate = False
+    client.handle_message(binary(message))
+    # a text frame that is not json, and a frame that is not text at all
+    protobuf = b'\x08\x96\x01\x12\x07BTCUSDT\xff'
+    client.handle_message(binary(b'pong'))
+    client.handle_message(binary(protobuf))
+    trade = {'e': 'trade', 'p': '0.1', 'q': [1, 2]}
+    assert received == [trade, trade, trade, 'pong', protobuf]
+    assert received[-1] is protobuf
+
+
+asyncio.run(main())
@@ -0,0 +1,69 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+
+url = 'wss://stream.example.com/ws'
+
+
+def subscribe(exchange, subscribe_hash):
+    client = exchange.pooled_client(url, [subscribe_hash], [subscribe_hash])
+    client.subscriptions[subscribe_hash] = True
+    return client
+
+
+async def main():
+    # no sharding by default
+    exchange = Exchange({})
+    clients = [subscribe(exchange, 'book:' + str(i)) for i in range(10)]
+    assert all(client is exchange.client(url) for client in clients)
+    # a new connection when the others are full
+    exchange = Exchange({'options': {'ws': {'maxStreamsPerConnection': 3}}})
+    clients = [subscribe(exchange, 'book:' + str(i)) for i in range(7)]
+    assert [client.shard for client in clients] == [0, 0, 0, 1, 1, 1, 2]
+    assert clients[0] is exchange.client(url)
+    assert sorted(exchange.clients) == [url, url + '#1', url + '#2']
+    # a subscription stays on its connection
+    assert subscribe(exchange, 'book:4') is clients[4]
+    # spread from the start
+    exchange = Exchange({'streaming': {'connectionsPerUrl': 3}})
+    clients = [subscribe(exchange, 'book:' + str(i)) for i in range(6)]
+    assert [client.shard for client in clients] == [0, 1, 2, 0, 1, 2]
+    # the subscriptions of a closed connection go to the least loaded ones
+    exchange.on_close(clients[1], 1006)
+    assert len(exchange.clients) == 2
+    clients = [subscribe(exchange, 'book:' + str(i)) for i in [1, 4, 6]]
+    assert [client.shard for client in clients] == [1, 1, 0]
+    # watch_multiple puts its subscriptions on one connection
+    exchange = Exchange({'options': {'ws': {'maxStreamsPerConnection': 3}}})
+    subscribe(exchange, 'book:0')
+    client = exchange.pooled_client(url, ['book:1', 'book:2', 'book:3'], [])
+    assert client.shard == 1
+    # the requests that subscribe to nothing go to the first connection
+    exchange = Exchange({'streaming': {'connectionsPerUrl': 3}})
+    subscribe(exchange, 'book:0')
+    assert exchange.pooled_client(url, [None], ['request:1']).shard == 0
+    assert exchange.pooled_client(url, [None], ['request:2']).shard == 0
+    assert subscribe(exchange, 'book:1').shard == 1
+    # the private subscriptions follow the connection the exchange authenticated with client(url)
+    exchange = Exchange({'streaming': {'connectionsPerUrl': 3}})
+    public = subscribe(exchange, 'book:0')
+    assert not public.pinned
+    authenticated = exchange.client(url)
+    assert authenticated is public and authenticated.pinned
+    assert [subscribe(exchange, 'orders:' + str(i)).shard for i in range(3)] == [0, 0, 0]
+    # the public subscriptions of the other connections stay on them
+    exchange = Exchange({'streaming': {'connectionsPerUrl': 3}})
+    clients = [subscribe(exchange, 'book:' + str(i)) for i in range(3)]
+    exchange.client(url)
+    assert subscribe(exchange, 'book:2') is clients[2]
+    assert subscribe(exchange, 'orders').shard == 0
+
+
+asyncio.run(main())
@@ -0,0 +1,61 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import time  # noqa: E402
+from ccxt.async_support.base.ws.fast_client import FastClient  # noqa: E402
+
+
+async def drain(config, messages=1000, handler_time=0):
+    loop = asyncio.get_running_loop()
+    received = []
+
+    def on_message(client, message):
+        if handler_time:
+            time.sleep(handler_time)
+        received.append(message)
+
+    client = FastClient('wss://example.com', on_message, None, None, None, dict(config, asyncio_loop=loop))
+    client.handle_message = lambda message: client.on_message_callback(client, message)
+    # another task running alongside the feed
+    ticks = 0
+
+    async def other_task():
+        nonlocal ticks
+        while len(received) < messages:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    task = asyncio.ensure_future(other_task())
+    for i in range(messages):
+        client.feed(i)
+    await task
+    assert received == list(range(messages))
+    stats = client.queue_stats()
+    assert stats['depth'] == 0
+    assert stats['maxDepth'] == messages
+    assert stats['queued'] == messages
+    assert stats['handled'] == messages
+    return stats['drains'], ticks
+
+
+async def main():
+    # one message per event loop iteration by default
+    drains, ticks = await drain({})
+    assert drains == 1000
+    # up to 100 messages per iteration, the other task still runs in between
+    drains, ticks = await drain({'drainMessages': 100})
+    assert drains == 10
+    assert ticks >= 9
+    # a time budget of 2ms with 1ms handlers
+    drains, ticks = await drain({'drainMessages': 1000, 'drainTime': 2000}, 20, 0.001)
+    assert 7 <= drains <= 11
+    assert ticks >= drains - 1
+
+
+asyncio.run(main())
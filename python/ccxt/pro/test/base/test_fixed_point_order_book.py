@@ -0,0 +1,97 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import random  # noqa: E402
+import ccxt.pro  # noqa: E402
+from ccxt.async_support.base.ws.order_book import OrderBook, FixedPointOrderBook, FixedPointCountedOrderBook, FixedPointIndexedOrderBook  # noqa: E402
+from ccxt.async_support.base.ws.order_book_side import fixed_to_string  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+assert fixed_to_string(123450, 2) == '1234.50'
+assert fixed_to_string(5, 3) == '0.005'
+assert fixed_to_string(-5, 3) == '-0.005'
+assert fixed_to_string(42, 0) == '42'
+
+book = FixedPointOrderBook({
+    'bids': [[0.3, 1.5], [0.2, 2]],
+    'asks': [[0.4, 0.001]],
+}, None, 2, 3)
+# prices are matched by ticks, not by float equality
+book['bids'].store(0.1 + 0.2, 3)
+assert book['bids'] == [[0.3, 3], [0.2, 2]]
+assert book['bids']._index == [-30, -20]
+book['bids'].store(0.1 + 0.2, 0)
+assert book['bids'] == [[0.2, 2]]
+assert book['bids'].price_string(0) == '0.20'
+assert book['bids'].amount_string(0) == '2.000'
+assert book['asks'].price_string(0) == '0.40'
+assert book['asks'].amount_string(0) == '0.001'
+assert book['asks'].price_ticks(0) == 40
+assert book['asks'].amount_ticks(0) == 1
+
+# ----------------------------------------------------------------------------
+# prices on the tick grid must leave the same book as the float engine
+
+random.seed(1)
+for depth in [None, 10]:
+    fixed_book = FixedPointOrderBook({}, depth, 2, 4)
+    float_book = OrderBook({}, depth)
+    for i in range(200):
+        side = random.choice(['bids', 'asks'])
+        deltas = [[random.randint(1, 300) / 100, random.choice([0, 0, 1, 2.5, 0.0001])] for j in range(random.choice([1, 3, 200]))]
+        fixed_book[side].store_deltas([list(delta) for delta in deltas])
+        float_book[side].store_deltas([list(delta) for delta in deltas])
+        fixed_book.limit()
+        float_book.limit()
+        assert fixed_book == float_book
+    for side in ['bids', 'asks']:
+        for index, level in enumerate(fixed_book[side]):
+            assert float(fixed_book[side].price_string(index)) == level[0]
+            assert float(fixed_book[side].amount_string(index)) == level[1]
+
+# ----------------------------------------------------------------------------
+# the counted and indexed fixed point books round the prices to the ticks
+
+counted_book = FixedPointCountedOrderBook({'bids': [[0.3, 1, 2]]}, None, 2, 3)
+counted_book['bids'].store(0.1 + 0.2, 2, 5)
+assert counted_book['bids'] == [[0.3, 2, 5]] and counted_book['bids'].price_string(0) == '0.30'
+counted_book['bids'].store(0.1 + 0.2, 2, 0)
+assert counted_book['bids'] == []
+
+indexed_book = FixedPointIndexedOrderBook({'asks': [[0.3, 1, 'a'], [0.4, 1, 'b']]}, None, 2, 3)
+indexed_book['asks'].store(0.1 + 0.2, 2, 'c')
+indexed_book['asks'].store(None, 3, 'a')
+assert indexed_book['asks'] == [[0.3, 3, 'a'], [0.3, 2, 'c'], [0.4, 1, 'b']]
+assert indexed_book['asks'].price_ticks(1) == 30 and indexed_book['asks'].amount_string(1) == '2.000'
+indexed_book['asks'].store(0.1 + 0.2, 0, 'c')
+assert indexed_book['asks'] == [[0.3, 3, 'a'], [0.4, 1, 'b']]
+
+# the 'fixed' engine counts in ticks of the precision of the market of the snapshot
+exchange = ccxt.pro.binance({'options': {'watchOrderBook': {'orderBookEngine': 'fixed'}}})
+btc = {'symbol': 'BTC/USDT', 'bids': [[100.01, 0.5]], 'asks': []}
+# without the markets the precision is not known
+assert exchange.fixed_point_decimals(btc) is None
+assert type(exchange.order_book(btc)) is OrderBook
+exchange.markets = {
+    'BTC/USDT': {'precision': {'price': 2, 'amount': 5}},
+    'SHIB/USDT': {'precision': {'price': 8, 'amount': 0}},
+    'NEW/USDT': {'precision': {'price': None, 'amount': None}},
+}
+assert exchange.fixed_point_decimals(btc) == (2, 5)
+assert exchange.fixed_point_decimals({'symbol': 'SHIB/USDT'}) == (8, 0)
+assert exchange.fixed_point_decimals({'symbol': 'NEW/USDT'}) is None
+assert exchange.fixed_point_decimals({}) is None
+book = exchange.order_book(btc, 10)
+assert isinstance(book, FixedPointOrderBook) and book['bids']._price_decimals == 2
+assert book['bids'].price_string(0) == '100.01' and book['bids'].amount_string(0) == '0.50000'
+assert isinstance(exchange.counted_order_book({'symbol': 'SHIB/USDT'}), FixedPointCountedOrderBook)
+assert isinstance(exchange.indexed_order_book({'symbol': 'SHIB/USDT'}), FixedPointIndexedOrderBook)
+# books created without a symbol fall back to the float engine
+assert type(exchange.order_book({}, 10)) is OrderBook
+assert type(exchange.order_book()) is OrderBook
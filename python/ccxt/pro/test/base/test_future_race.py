@@ -0,0 +1,54 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+from ccxt import ExchangeClosedByUser, NetworkError  # noqa: E402
+from ccxt.async_support.base.ws.future import Future  # noqa: E402
+
+
+async def main():
+    tasks = len(asyncio.all_tasks())
+    # the first result wins and no task is created for the race
+    futures = [Future() for i in range(200)]
+    race = Future.race(futures)
+    assert len(asyncio.all_tasks()) == tasks
+    futures[150].resolve('second')
+    assert await race == 'second'
+    # exceptions win over results completed at the same time
+    futures = [Future() for i in range(3)]
+    race = Future.race(futures)
+    futures[0].resolve('first')
+    futures[1].reject(NetworkError('error'))
+    try:
+        await race
+        assert False
+    except NetworkError:
+        pass
+    # futures cancelled by client.close()
+    futures = [Future() for i in range(3)]
+    race = Future.race(futures)
+    for f in futures:
+        f.cancel()
+    try:
+        await race
+        assert False
+    except ExchangeClosedByUser:
+        pass
+    # the consumer gives up waiting
+    futures = [Future() for i in range(3)]
+    race = Future.race(futures)
+    try:
+        await asyncio.wait_for(race, 0.01)
+        assert False
+    except asyncio.TimeoutError:
+        pass
+    futures[0].resolve('late')
+    await asyncio.sleep(0)
+
+
+asyncio.run(main())
@@ -0,0 +1,90 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+from ccxt.async_support.base.ws.heartbeat import Heartbeat, get_heartbeat  # noqa: E402
+
+
+class Client:
+    def __init__(self, keepAlive):
+        self.keepAlive = keepAlive
+        self.pings = 0
+        self.is_closed = False
+
+    def keep_alive(self):
+        self.pings += 1
+
+    def closed(self):
+        return self.is_closed
+
+
+class FailingClient(Client):
+    def __init__(self, keepAlive, failures):
+        super(FailingClient, self).__init__(keepAlive)
+        self.failures = failures
+        self.errors = []
+
+    def keep_alive(self):
+        super(FailingClient, self).keep_alive()
+        if self.pings in self.failures:
+            raise ConnectionError('ping ' + str(self.pings))
+
+    def on_error(self, error):
+        self.errors.append(error)
+
+
+async def main():
+    loop = asyncio.get_running_loop()
+    assert get_heartbeat() is get_heartbeat(loop)
+    heartbeat = Heartbeat(loop)
+    heartbeat.resolution = 10
+    clients = [Client(20 if i % 2 else 50) for i in range(1000)]
+    for client in clients:
+        heartbeat.add(client)
+    # every client pings on add
+    assert all(client.pings == 1 for client in clients)
+    assert len(heartbeat) == 1000
+    await asyncio.sleep(0.23)
+    fast = [client.pings for client in clients[1::2]]
+    slow = [client.pings for client in clients[0::2]]
+    assert all(9 <= pings <= 13 for pings in fast)
+    assert all(4 <= pings <= 6 for pings in slow)
+    # a single timer for all the clients
+    assert heartbeat.ticks <= 25
+    # closed and removed clients are dropped
+    for client in clients[:500]:
+        client.is_closed = True
+    for client in clients[500:]:
+        heartbeat.remove(client)
+    await asyncio.sleep(0.06)
+    assert len(heartbeat) == 0
+    assert heartbeat.timer is None
+    assert len(heartbeat.slots) == 0
+    # keepAlive = 0 disables the pings
+    heartbeat.add(Client(0))
+    assert len(heartbeat) == 0
+    # a failed ping rejects that client, the other clients are still pinged and the timer is rearmed
+    clients = [FailingClient(20, [2]) if i == 1 else Client(20) for i in range(3)]
+    for client in clients:
+        heartbeat.add(client)
+    await asyncio.sleep(0.09)
+    assert [str(error) for error in clients[1].errors] == ['ping 2']
+    assert clients[1].pings == 2
+    assert all(client.pings >= 4 for client in clients[0::2])
+    assert len(heartbeat) == 2
+    assert heartbeat.timer is not None
+    # a failed first ping is not scheduled
+    failing = FailingClient(20, [1])
+    heartbeat.add(failing)
+    assert len(failing.errors) == 1
+    assert len(heartbeat) == 2
+    for client in clients:
+        heartbeat.remove(client)
+
+
+asyncio.run(main())
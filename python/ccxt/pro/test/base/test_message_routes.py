@@ -0,0 +1,83 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+from types import SimpleNamespace  # noqa: E402
+import ccxt.pro  # noqa: E402
+from ccxt.base.exchange import Exchange as BaseExchange  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+
+
+class RoutedExchange(Exchange):
+    built = 0
+
+    def __init__(self, config={}):
+        super(RoutedExchange, self).__init__(config)
+        self.handled = []
+
+    def message_routes(self):
+        self.built += 1
+        return {
+            'trade': self.handle_trade,
+            'aggTrade': self.handle_trade,
+            'depthUpdate': self.handle_order_book,
+        }
+
+    def handle_trade(self, client, message):
+        self.handled.append(('trade', message))
+
+    def handle_order_book(self, client, message):
+        self.handled.append(('order_book', message))
+
+
+class binance(ccxt.pro.binance):
+    def __init__(self, config={}):
+        super(binance, self).__init__(config)
+        self.handled = []
+
+    def handle_trade(self, client, message):
+        self.handled.append(('trade', message['e']))
+
+    def handle_tickers(self, client, message):
+        self.handled.append(('tickers', message[0]['e'] if isinstance(message, list) else None))
+
+    def handle_ticker(self, client, message):
+        self.handled.append(('ticker', message.get('e')))
+
+
+async def main():
+    exchange = RoutedExchange()
+    trade = {'e': 'aggTrade', 'p': '1'}
+    depth = {'e': 'depthUpdate'}
+    assert exchange.route_message(None, trade, 'aggTrade')
+    assert exchange.route_message(None, depth, 'depthUpdate')
+    assert not exchange.route_message(None, {'e': 'unknown'}, 'unknown')
+    assert not exchange.route_message(None, {}, None)
+    assert exchange.handled == [('trade', trade), ('order_book', depth)]
+    # the table is built on the first message
+    assert exchange.built == 1
+    # the transpiled version used by the sync exchanges
+    assert BaseExchange.route_message(exchange, None, trade, 'trade')
+    assert not BaseExchange.route_message(exchange, None, trade, 'unknown')
+    assert not Exchange().route_message(None, trade, 'trade')
+
+    # binance dispatches its events with the table
+    exchange = binance()
+    client = SimpleNamespace(subscriptions={})
+    exchange.handle_message(client, {'e': 'trade', 's': 'BTCUSDT'})
+    exchange.handle_message(client, {'e': 'aggTrade', 's': 'BTCUSDT'})
+    exchange.handle_message(client, [{'e': '24hrTicker', 's': 'BTCUSDT'}])
+    exchange.handle_message(client, {'u': 1, 's': 'BTCUSDT', 'b': '1', 'B': '1', 'a': '2', 'A': '1'})
+    assert exchange.handled == [('trade', 'trade'), ('trade', 'aggTrade'), ('tickers', '24hrTicker'), ('ticker', None), ('tickers', None)]
+    table = exchange.messageRoutesTable
+    exchange.handle_message(client, {'e': 'trade', 's': 'BTCUSDT'})
+    assert exchange.messageRoutesTable is table
+    await exchange.close()
+
+
+asyncio.run(main())
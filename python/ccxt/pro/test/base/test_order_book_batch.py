@@ -0,0 +1,48 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import random  # noqa: E402
+from ccxt.async_support.base.ws.order_book import OrderBook, CountedOrderBook, IndexedOrderBook, SortedOrderBook, QueuedOrderBook  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+book = OrderBook({})
+book['bids'].store_many([10, 9, 11, 9, 8], [1, 2, 3, 0, 4])
+book['asks'].store_many([12, 13, 12], [1, 1, 5])
+assert book['bids'] == [[11, 3], [10, 1], [8, 4]]
+assert book['asks'] == [[12, 5], [13, 1]]
+book = CountedOrderBook({})
+book['bids'].store_many([10, 9, 8], [1, 2, 3], [1, 0, 2])
+assert book['bids'] == [[10, 1, 1], [8, 3, 2]]
+book = QueuedOrderBook({})
+book['bids'].store_many([10, 10, 9], [1, 2, 3], ['a', 'b', 'a'])
+assert book['bids'] == [[10, 2, 'b'], [9, 3, 'a']]
+
+# ----------------------------------------------------------------------------
+# batches must leave the same book as storing the deltas one by one, on both paths of store_deltas
+
+random.seed(1)
+for engine, columns in [(OrderBook, 2), (CountedOrderBook, 3), (IndexedOrderBook, 3), (SortedOrderBook, 2), (QueuedOrderBook, 3)]:
+    batch_book = engine({})
+    one_by_one_book = engine({})
+    for i in range(300):
+        side = random.choice(['bids', 'asks'])
+        deltas = []
+        for j in range(random.choice([1, 2, 5, 50, 500])):
+            delta = [random.randint(1, 400) / 4, random.choice([0, 0, 1, 2.5, 3])]
+            if columns == 3:
+                delta.append(random.randint(0, 3) if engine is CountedOrderBook else str(random.randint(1, 100)))
+            deltas.append(delta)
+        batch_book[side].store_many(*zip(*[list(delta) for delta in deltas]))
+        for delta in deltas:
+            one_by_one_book[side].storeArray(list(delta))
+        assert batch_book[side] == one_by_one_book[side]
+        assert batch_book[side]._index == one_by_one_book[side]._index or engine is SortedOrderBook
+    snapshot = {'bids': [list(delta) for delta in one_by_one_book['bids']], 'asks': [list(delta) for delta in one_by_one_book['asks']]}
+    batch_book.reset(snapshot)
+    assert batch_book == one_by_one_book
@@ -0,0 +1,114 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import random  # noqa: E402
+from types import SimpleNamespace  # noqa: E402
+import ccxt.pro  # noqa: E402
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.base.decimal_to_precision import number_to_string  # noqa: E402
+from ccxt.async_support.base.ws.order_book import OrderBook, FixedPointOrderBook  # noqa: E402
+from ccxt.async_support.base.ws.checksum import OrderBookChecksum, format_ticks  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# the payload that okx and bitget handlers build from scratch on every update
+
+
+def rebuild_checksum(orderbook):
+    bids = orderbook['bids']
+    asks = orderbook['asks']
+    strings = []
+    for i in range(0, 25):
+        if i < len(bids):
+            strings.append(number_to_string(bids[i][0]))
+            strings.append(number_to_string(bids[i][1]))
+        if i < len(asks):
+            strings.append(number_to_string(asks[i][0]))
+            strings.append(number_to_string(asks[i][1]))
+    return Exchange.crc32(':'.join(strings), True)
+
+
+random.seed(1)
+book = OrderBook({})
+checksum = OrderBookChecksum()
+for i in range(3000):
+    side = random.choice(['bids', 'asks'])
+    price = random.randint(1, 60) / 4 + (0 if side == 'bids' else 20)
+    book[side].store(price, random.choice([0, 0, 0.001, 1, 2.5, 1e-8]))
+    assert checksum.checksum(book) == rebuild_checksum(book)
+
+# ----------------------------------------------------------------------------
+# every k updates
+
+checksum = OrderBookChecksum({'every': 3})
+expected = rebuild_checksum(book)
+assert [checksum.verify(book, expected + 1) for i in range(6)] == [True, True, False, True, True, False]
+assert checksum.verify(book, expected)
+
+# ----------------------------------------------------------------------------
+# custom formats and layouts
+
+
+def format_bitfinex(side, levels, index, separator):
+    level = levels[index]
+    amount = level[1] if side == 'bids' else -level[1]
+    return number_to_string(level[0]) + separator + number_to_string(amount)
+
+
+book = OrderBook({'bids': [[2, 1], [1, 3]], 'asks': [[3, 2]]})
+checksum = OrderBookChecksum({'format': format_bitfinex})
+assert checksum.payload(book) == '2:1:3:-2:1:3'
+checksum = OrderBookChecksum({'sides': ['asks', 'bids'], 'interleave': False, 'separator': '|', 'depth': 1})
+assert checksum.payload(book) == '3|2|2|1'
+
+# the example of the okx documentation
+book = OrderBook({'bids': [[3366.1, 7], [3366, 6]], 'asks': [[3366.8, 9], [3368, 8]]})
+assert OrderBookChecksum().payload(book) == '3366.1:7:3366.8:9:3366:6:3368:8'
+
+# the fixed point sides format with the decimals of the market precision
+book = FixedPointOrderBook({'bids': [[0.1 + 0.2, 1.5]], 'asks': [[0.4, 2]]}, None, 2, 3)
+assert OrderBookChecksum().payload(book) == '0.30:1.500:0.40:2.000'
+
+# ----------------------------------------------------------------------------
+# the kraken checksum built from the ticks of a fixed point book
+# must be accepted by the checksum path of the kraken handler
+
+
+def kraken_level(price, amount):
+    return ['%.5f' % price, '%.8f' % amount, '1534614248.123678']
+
+
+exchange = ccxt.pro.kraken()
+exchange.options['marketsByWsName'] = {'XBT/USD': {'symbol': 'BTC/USD'}}
+rejected = []
+client = SimpleNamespace(resolve=lambda result, message_hash: None, reject=lambda error, message_hash: rejected.append(error))
+kraken_checksum = OrderBookChecksum({
+    'depth': 10,
+    'sides': ['asks', 'bids'],
+    'interleave': False,
+    'separator': '',
+    'signed': False,
+    'format': format_ticks,
+})
+random.seed(2)
+asks = [kraken_level(5541.3 + i / 10, random.randint(1, 10 ** 6) / 10 ** 8) for i in range(10)]
+bids = [kraken_level(5541.2 - i / 10, random.randint(1, 10 ** 6) / 10 ** 8) for i in range(10)]
+fixed_book = FixedPointOrderBook({}, 10, 5, 8)
+for side, deltas in [['asks', asks], ['bids', bids]]:
+    fixed_book[side].store_deltas([[float(delta[0]), float(delta[1])] for delta in deltas])
+exchange.handle_order_book(client, [1234, {'as': asks, 'bs': bids}, 'book-10', 'XBT/USD'], None)
+for i in range(300):
+    key, side = random.choice([['a', 'asks'], ['b', 'bids']])
+    price = random.randint(55413, 55600) / 10 if side == 'asks' else random.randint(55200, 55412) / 10
+    delta = kraken_level(price, random.randint(1, 10 ** 9) / 10 ** 8)
+    fixed_book[side].store(float(delta[0]), float(delta[1]))
+    fixed_book.limit()
+    expected = kraken_checksum.checksum(fixed_book)
+    exchange.handle_order_book(client, [1234, {key: [delta], 'c': str(expected)}, 'book-10', 'XBT/USD'], None)
+assert rejected == []
+exchange.handle_order_book(client, [1234, {'a': [kraken_level(5541.3, 1)], 'c': str(expected)}, 'book-10', 'XBT/USD'], None)
+assert len(rejected) == 1
@@ -0,0 +1,45 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.async_support.base.ws.order_book import OrderBook, SortedOrderBook  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+for engine in [OrderBook, SortedOrderBook]:
+    book = engine({
+        'bids': [[10, 1], [9, 2], [8, 3], [7, 4]],
+        'asks': [[11, 1], [12, 2], [13, 3]],
+    })
+    book.limit()
+    assert book.best_bid() == [10, 1]
+    assert book.best_ask() == [11, 1]
+    top = book.top(2)
+    assert top['bids'] == [[10, 1], [9, 2]]
+    assert top['asks'] == [[11, 1], [12, 2]]
+    assert len(top['bids']) == 2
+    assert top['bids'][-1] == [9, 2]
+    assert top['bids'][::-1] == [[9, 2], [10, 1]]
+    assert top['bids'][1:5] == [[9, 2]]
+    assert list(book['bids'].top(10)) == [[10, 1], [9, 2], [8, 3], [7, 4]]
+    try:
+        top['bids'][2]
+        assert False
+    except IndexError:
+        pass
+    # views follow the updates without a limit() and nothing is trimmed
+    book['bids'].store(11, 5)
+    book['asks'].store(11, 0)
+    assert top['bids'] == [[11, 5], [10, 1]]
+    assert top['asks'] == [[12, 2], [13, 3]]
+    assert book.best_ask() == [12, 2]
+    assert len(book['bids']) == 5
+    book['asks'].store(12, 0)
+    book['asks'].store(13, 0)
+    assert book.best_ask() is None
+    assert len(top['asks']) == 0
+    assert list(top['asks']) == []
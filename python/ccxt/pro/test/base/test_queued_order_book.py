@@ -0,0 +1,97 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import json  # noqa: E402
+import random  # noqa: E402
+from ccxt.async_support.base.ws.order_book import IndexedOrderBook, QueuedOrderBook  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+book = QueuedOrderBook({
+    'bids': [[10, 1, 'c'], [10, 2, 'a'], [9, 3, 'b']],
+    'asks': [[11, 1, 'd'], [12, 2, 'e']],
+})
+# orders are queued in arrival order, not by id
+assert book['bids'] == [[10, 1, 'c'], [10, 2, 'a'], [9, 3, 'b']]
+# a new size keeps the place in the queue
+book['bids'].store(10, 5, 'c')
+assert book['bids'].queue(10) == [[10, 5, 'c'], [10, 2, 'a']]
+# a new price moves the order to the back of the other level
+book['bids'].store(9, 5, 'c')
+assert book['bids'] == [[10, 2, 'a'], [9, 3, 'b'], [9, 5, 'c']]
+# updates without a price keep the price of the order
+book['bids'].store(None, 4, 'b')
+assert book['bids'].queue(9) == [[9, 4, 'b'], [9, 5, 'c']]
+# cancels
+book['bids'].store(10, 0, 'a')
+book['asks'].store(None, 0, 'd')
+book['asks'].store(None, 0, 'unknown')
+assert book['bids'] == [[9, 4, 'b'], [9, 5, 'c']]
+assert book['asks'] == [[12, 2, 'e']]
+assert book['bids'].queue(10) == []
+assert book.aggregate() == {'bids': [[9, 9, 2]], 'asks': [[12, 2, 1]]}
+assert book.best_bid() == [9, 4, 'b']
+book.limit()
+assert json.loads(json.dumps(book['bids'])) == [[9, 4, 'b'], [9, 5, 'c']]
+
+# limit() drops the latest orders at the worst prices first
+book = QueuedOrderBook({
+    'bids': [[10, 1, 'a'], [9, 1, 'b'], [9, 1, 'c'], [8, 1, 'd']],
+}, 2)
+book.limit()
+assert book['bids'] == [[10, 1, 'a'], [9, 1, 'b']]
+book.reset({'asks': [[5, 1, 'x']]})
+assert book['bids'] == []
+assert book['asks'] == [[5, 1, 'x']]
+
+# reads after an update walk the queues, the flat list is only rebuilt by limit(), from the first changed level
+book = QueuedOrderBook({'bids': [[100 - i // 10, 1, str(i)] for i in range(1000)]})
+book.limit()
+book['bids'].store(100, 2, '0')
+assert book.best_bid() == [100, 2, '0'] and book['bids'][1] == [100, 1, '1'] and len(book['bids']) == 1000
+assert list(book.top(2)['bids']) == [[100, 2, '0'], [100, 1, '1']] and book['bids'][:2] == [[100, 2, '0'], [100, 1, '1']]
+assert list.__getitem__(book['bids'], 0) == [100, 1, '0']
+book['bids'].store(1, 0, '995')
+book['bids'].store(5, 1, 'new')
+book.limit()
+assert list.__getitem__(book['bids'], 0) == [100, 2, '0']
+assert list(list.__iter__(book['bids'])) == list(book['bids'].orders())
+assert json.loads(json.dumps(book['bids'])) == [list(order) for order in book['bids'].orders()]
+
+# ----------------------------------------------------------------------------
+# random updates must leave the same orders at the same levels as IndexedOrderBook
+
+
+def aggregate(side):
+    levels = {}
+    for price, size, order_id in side:
+        levels.setdefault(price, []).append((order_id, size))
+    return [[price, sorted(orders)] for price, orders in levels.items()]
+
+
+random.seed(1)
+for depth in [None, 20]:
+    queued_book = QueuedOrderBook({}, depth)
+    indexed_book = IndexedOrderBook({}, depth)
+    for i in range(5000):
+        side = random.choice(['bids', 'asks'])
+        price = random.randint(1, 20) / 4
+        delta = [price, random.choice([0, 0, 1, 2.5, 3]), str(random.randint(1, 100))]
+        queued_book[side].storeArray(list(delta))
+        indexed_book[side].storeArray(list(delta))
+        if depth is None and i % 7 == 0:
+            queued_book.limit()
+            indexed_book.limit()
+            assert list(list.__iter__(queued_book[side])) == list(queued_book[side].orders())
+        if depth is None:
+            assert aggregate(queued_book[side]) == aggregate(indexed_book[side])
+    queued_book.limit()
+    indexed_book.limit()
+    for side in ['bids', 'asks']:
+        assert len(queued_book[side]) == len(indexed_book[side])
+        assert [level[0] for level in queued_book[side]] == [level[0] for level in indexed_book[side]]
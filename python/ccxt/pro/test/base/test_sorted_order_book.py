@@ -0,0 +1,54 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import json  # noqa: E402
+import random  # noqa: E402
+from ccxt.async_support.base.ws.order_book import OrderBook, IndexedOrderBook, CountedOrderBook  # noqa: E402
+from ccxt.async_support.base.ws.order_book import SortedOrderBook, SortedIndexedOrderBook, SortedCountedOrderBook  # noqa: E402
+
+# ----------------------------------------------------------------------------
+# the sorted engine must pass the generated order book tests unchanged
+
+path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_order_book.py')
+with open(path) as file:
+    source = file.read()
+imports = 'import OrderBook, IndexedOrderBook, CountedOrderBook'
+assert imports in source
+source = source.replace(imports, 'import SortedOrderBook as OrderBook, SortedIndexedOrderBook as IndexedOrderBook, SortedCountedOrderBook as CountedOrderBook')
+exec(compile(source, path, 'exec'), {'__file__': path})
+
+# ----------------------------------------------------------------------------
+# random updates must leave both engines with the same book
+
+random.seed(1)
+for engine, reference in [(SortedOrderBook, OrderBook), (SortedCountedOrderBook, CountedOrderBook), (SortedIndexedOrderBook, IndexedOrderBook)]:
+    for depth in [None, 10]:
+        sorted_book = engine({}, depth)
+        list_book = reference({}, depth)
+        for i in range(5000):
+            side = random.choice(['bids', 'asks'])
+            price = random.randint(1, 200) / 4
+            size = random.choice([0, 0, 1, 2.5, 3])
+            delta = [price, size]
+            if engine is SortedCountedOrderBook:
+                delta.append(random.randint(0, 3))
+            elif engine is SortedIndexedOrderBook:
+                delta.append(str(random.randint(1, 100)))
+            sorted_book[side].storeArray(list(delta))
+            list_book[side].storeArray(list(delta))
+            if i % 100 == 0:
+                sorted_book.limit()
+                list_book.limit()
+                assert sorted_book == list_book
+                assert json.dumps(sorted_book) == json.dumps(list_book)
+        for side in ['bids', 'asks']:
+            assert len(sorted_book[side]) == len(list_book[side])
+            assert sorted_book[side][0] == list_book[side][0]
+            assert sorted_book[side][-1] == list_book[side][-1]
+            assert sorted_book[side][2:7] == list_book[side][2:7]
+            assert list(sorted_book[side]) == list(list_book[side])
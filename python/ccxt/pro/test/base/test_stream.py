@@ -0,0 +1,205 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+from ccxt import NetworkError, NotSupported  # noqa: E402
+from ccxt.async_support.base.ws.client import Client  # noqa: E402
+from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheByTimestamp, ArrayCacheBySymbolById  # noqa: E402
+from ccxt.async_support.base.ws.order_book import OrderBook  # noqa: E402
+from ccxt.async_support.base.ws.stream import Listener, Stream, Callback, current_listener, get_current_listener  # noqa: E402
+
+
+def callback(*args):
+    pass
+
+
+def new_client():
+    return Client('wss://stream.example.com', callback, callback, callback, callback)
+
+
+async def drain(stream):
+    values = []
+    while stream.queue:
+        values.append(await stream.__anext__())
+    return values
+
+
+async def main():
+    # every update of a cache, as the entries appended since the previous one
+    client = new_client()
+    stream = Stream()
+    stream.attach(client, ['trades:BTC/USDT'])
+    trades = ArrayCache(3)
+    for i in range(5):
+        trades.append({'symbol': 'BTC/USDT', 'id': i})
+        if i != 1:
+            client.resolve(trades, 'trades:BTC/USDT')
+    assert [[trade['id'] for trade in value] for value in await drain(stream)] == [[0], [1, 2], [3], [4]]
+    # other values and other message hashes
+    client.resolve({'bids': []}, 'orderbook:BTC/USDT')
+    assert stream.queue_stats()['received'] == 4
+    # the updates of other symbols in a shared cache
+    orders = ArrayCacheBySymbolById()
+    stream = Stream(symbol='ETH/USDT')
+    stream.attach(client, ['orders'])
+    for i in range(4):
+        orders.append({'symbol': 'BTC/USDT' if i % 2 else 'ETH/USDT', 'id': str(i)})
+        client.resolve(orders, 'orders')
+    assert [[order['id'] for order in value] for value in await drain(stream)] == [['0'], ['2']]
+    # a candle updated in place is passed on once, with the candles added after it
+    ohlcvs = ArrayCacheByTimestamp(10)
+    stream = Stream()
+    stream.attach(client, ['ohlcv'])
+    ohlcvs.append([1000, 1, 2, 0.5, 1.5, 10])
+    client.resolve(ohlcvs, 'ohlcv')
+    for close in [1.6, 1.7, 1.8]:
+        ohlcvs.append([1000, 1, 2, 0.5, close, 10])
+    ohlcvs.append([2000, 1.8, 1.9, 1.7, 1.9, 5])
+    client.resolve(ohlcvs, 'ohlcv')
+    ohlcvs.append([2000, 1.8, 2.1, 1.7, 2.1, 6])
+    client.resolve(ohlcvs, 'ohlcv')
+    assert [[ohlcv[0] for ohlcv in value] for value in await drain(stream)] == [[1000], [1000, 2000], [2000]]
+    stream.detach()
+    # the order books are queued as they were when resolved
+    book = OrderBook({'asks': [[2, 1]], 'bids': [[1, 1]]})
+    stream = Stream()
+    stream.attach(client, ['orderbook'])
+    client.resolve(book, 'orderbook')
+    book['asks'].store(2, 3)
+    book['bids'].store(1.5, 1)
+    client.resolve(book, 'orderbook')
+    values = await drain(stream)
+    assert [value['asks'] for value in values] == [[[2, 1]], [[2, 3]]]
+    assert [value['bids'] for value in values] == [[[1, 1]], [[1.5, 1], [1, 1]]]
+    assert not isinstance(values[0], OrderBook)
+    stream.detach()
+    # under coalesce the book in the newest slot of a full queue is copied once, when it is read
+    class CountedBook(OrderBook):
+        copies = 0
+
+        def snapshot(self):
+            self.copies += 1
+            return super(CountedBook, self).snapshot()
+
+    book = CountedBook({'asks': [[2, 1]], 'bids': [[1, 1]]})
+    stream = Stream(2, 'coalesce')
+    stream.attach(client, ['orderbook', 'ticker'])
+    for amount in range(1, 6):
+        book['asks'].store(2, amount)
+        client.resolve(book, 'orderbook')
+    assert book.copies == 1 and stream.queue_stats()['coalesced'] == 3
+    assert [value['asks'] for value in await drain(stream)] == [[[2, 1]], [[2, 5]]]
+    assert book.copies == 2
+    # and when another value is queued after it
+    client.resolve(book, 'orderbook')
+    client.resolve(book, 'orderbook')
+    assert book.copies == 3
+    await stream.__anext__()
+    client.resolve('ticker', 'ticker')
+    assert book.copies == 4
+    book['asks'].store(2, 6)
+    values = await drain(stream)
+    assert values[0]['asks'] == [[2, 5]] and values[1] == 'ticker'
+    stream.detach()
+    # the tasks started by a watch call do not attach to its listener
+    async def spawned():
+        await asyncio.sleep(0)
+        return get_current_listener()
+
+    stream = Stream()
+    stream.task = asyncio.current_task()
+    token = current_listener.set(stream)
+    assert get_current_listener() is stream
+    task = asyncio.ensure_future(spawned())
+    assert await task is None
+    current_listener.reset(token)
+    # a listener passes the values on to a queue or a callback
+    try:
+        Listener().put(client, 1)
+        assert False
+    except NotSupported:
+        pass
+    # overflow policies
+    for overflow, expected in [['dropOldest', [2, 3, 4]], ['coalesce', [0, 1, 4]]]:
+        stream = Stream(3, overflow)
+        stream.attach(client, ['ticker'])
+        for i in range(5):
+            client.resolve(i, 'ticker')
+        assert await drain(stream) == expected
+        stats = stream.queue_stats()
+        assert stats['received'] == 5 and stats['maxDepth'] == 3
+        assert stats['dropped' if overflow == 'dropOldest' else 'coalesced'] == 2
+        stream.detach()
+    # blocking pauses the reads until the consumer catches up
+    stream = Stream(2, 'block')
+    stream.attach(client, ['ticker'])
+    for i in range(3):
+        client.resolve(i, 'ticker')
+    assert client.paused is not None and stream.queue_stats()['blocked'] == 1
+    assert await stream.__anext__() == 0
+    assert client.paused is not None
+    assert await stream.__anext__() == 1
+    assert client.paused is None
+    assert await stream.__anext__() == 2
+    # a consumer waiting for the next update, then an error after the queued updates
+    consumer = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    client.resolve(3, 'ticker')
+    assert await consumer == 3
+    client.resolve(4, 'ticker')
+    client.reject(NetworkError('disconnected'))
+    assert client.streams == {}
+    assert await stream.__anext__() == 4
+    try:
+        await stream.__anext__()
+        assert False
+    except NetworkError:
+        pass
+    # closed streams end the iteration
+    stream = Stream()
+    stream.attach(client, ['ticker'])
+    client.resolve(5, 'ticker')
+    stream.close()
+    assert [value async for value in stream] == [5]
+
+    # callbacks are called from resolve
+    values = []
+    listener = Callback(values.append)
+    listener.attach(client, ['ticker'])
+    client.resolve(6, 'ticker')
+    assert values == [6]
+    listener.close()
+    client.resolve(7, 'ticker')
+    assert values == [6] and await listener.done == 1
+    # an error raised by the callback ends it
+    listener = Callback(lambda value: 1 / value)
+    listener.attach(client, ['ticker'])
+    client.resolve(0, 'ticker')
+    assert client.streams == {}
+    try:
+        await listener.done
+        assert False
+    except ZeroDivisionError:
+        pass
+    # the listeners after a failing callback still receive the update
+    values = []
+    failing = Callback(lambda value: 1 / value)
+    failing.attach(client, ['ticker'])
+    healthy = Callback(values.append)
+    healthy.attach(client, ['ticker'])
+    client.resolve(0, 'ticker')
+    assert values == [0]
+    assert client.streams == {'ticker': [healthy]}
+    try:
+        await failing.done
+        assert False
+    except ZeroDivisionError:
+        pass
+
+
+asyncio.run(main())
@@ -0,0 +1,49 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import time  # noqa: E402
+from ccxt.async_support.base.ws.aiohttp_client import AiohttpClient  # noqa: E402
+from ccxt.async_support.base.ws.metrics import Histogram  # noqa: E402
+
+histogram = Histogram(100)
+for i in range(1000):
+    histogram.add(i)
+# the last 100 samples
+assert histogram.summary() == {'count': 1000, 'p50': 950, 'p99': 999, 'max': 999}
+assert Histogram().summary() == {'count': 0, 'p50': None, 'p99': None, 'max': None}
+
+
+def on_message(client, message):
+    # an order book handler, the exchange sent the update 5 ms ago
+    client.resolve({'symbol': message['s'], 'timestamp': time.time() * 1000 - 5}, 'orderbook:' + message['s'])
+    client.resolve([{'timestamp': None}], 'trades:' + message['s'])
+
+
+def callback(*args):
+    pass
+
+
+async def main():
+    client = AiohttpClient('wss://stream.example.com', on_message, callback, callback, callback)
+    assert client.metrics is None
+    client = AiohttpClient('wss://stream.example.com', on_message, callback, callback, callback, {'collectMetrics': True})
+    messages = ['{"s":"BTC/USDT"}', b'{"s":"ETH/USDT"}', '{"s":"BTC/USDT"}']
+    for message in messages:
+        client.handle_text_or_binary_message(message)
+    metrics = client.metrics.snapshot()
+    assert metrics['messages'] == 3 and metrics['bytes'] == sum(len(message) for message in messages)
+    assert metrics['decode']['count'] == 3 and metrics['handler']['count'] == 3
+    assert metrics['handler']['p50'] > 0
+    by_hash = metrics['messageHashes']
+    assert by_hash['orderbook:BTC/USDT']['updates'] == 2
+    assert 5 <= by_hash['orderbook:BTC/USDT']['latency']['p50'] < 1000
+    assert by_hash['trades:ETH/USDT'] == {'updates': 1, 'latency': {'count': 0, 'p50': None, 'p99': None, 'max': None}}
+
+
+asyncio.run(main())
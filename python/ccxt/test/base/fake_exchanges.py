@@ -0,0 +1,100 @@
+import asyncio
+import ccxt
+import ccxt.async_support
+
+# ----------------------------------------------------------------------------
+# exchanges with three markets and no network, for the tests of loading the markets
+
+
+def market(base, quote):
+    return {
+        'id': base + quote, 'symbol': base + '/' + quote, 'base': base, 'quote': quote, 'baseId': base, 'quoteId': quote,
+        'type': 'spot', 'spot': True, 'margin': False, 'swap': False, 'future': False, 'option': False, 'contract': False,
+        'linear': None, 'inverse': None, 'active': True, 'precision': {'amount': 0.001, 'price': 0.01},
+    }
+
+
+def fake_markets():
+    return [market('BTC', 'USDT'), market('ETH', 'USDT'), market('ETH', 'BTC')]
+
+
+class fake(ccxt.Exchange):
+    id = 'fake'
+    # the fetches of an instance and of all the instances
+    fetches = 0
+    all_fetches = 0
+
+    def describe(self):
+        return {'urls': {'api': 'https://fake'}, 'options': {'x': 1}}
+
+    def fetch_markets(self, params={}):
+        self.fetches += 1
+        fake.all_fetches += 1
+        return fake_markets()
+
+
+class async_fake(ccxt.async_support.Exchange):
+    id = 'fake'
+    describe = fake.describe
+    fetches = 0
+    all_fetches = 0
+    fail = False
+
+    async def fetch_markets(self, params={}):
+        self.fetches += 1
+        async_fake.all_fetches += 1
+        await asyncio.sleep(0)
+        if self.fail:
+            raise ccxt.NetworkError('down')
+        return fake_markets()
+
+
+# fetching the markets sets options, like binance and bybit with adjustForTimeDifference and htx with the network ids
+class fake_time(fake):
+    id = 'faketime'
+    times = 0
+
+    def describe(self):
+        return {'urls': {'api': 'https://fake'}, 'options': {'x': 1, 'adjustForTimeDifference': True}}
+
+    def fetch_time(self, params={}):
+        self.times += 1
+        return self.milliseconds() - 1000 * self.times
+
+    def fetch_markets(self, params={}):
+        if self.options['adjustForTimeDifference']:
+            self.load_time_difference()
+        return super(fake_time, self).fetch_markets(params)
+
+
+class fake_networks(fake):
+    id = 'fakenetworks'
+
+    def fetch_markets(self, params={}):
+        self.options['networkChainIdsByNames'] = {'USDT': {'TRC20': 'trc20usdt'}}
+        self.options['networkNamesByChainIds'] = {'trc20usdt': 'TRC20'}
+        return super(fake_networks, self).fetch_markets(params)
+
+
+class async_fake_time(async_fake):
+    id = 'faketime'
+    describe = fake_time.describe
+    times = 0
+
+    async def fetch_time(self, params={}):
+        self.times += 1
+        return self.milliseconds() - 1000 * self.times
+
+    async def fetch_markets(self, params={}):
+        if self.options['adjustForTimeDifference']:
+            await self.load_time_difference()
+        return await super(async_fake_time, self).fetch_markets(params)
+
+
+class async_fake_networks(async_fake):
+    id = 'fakenetworks'
+
+    async def fetch_markets(self, params={}):
+        self.options['networkChainIdsByNames'] = {'USDT': {'TRC20': 'trc20usdt'}}
+        self.options['networkNamesByChainIds'] = {'trc20usdt': 'TRC20'}
+        return await super(async_fake_networks, self).fetch_markets(params)
@@ -0,0 +1,49 @@
+import os
+import sys
+import types
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+import ccxt.pro  # noqa: E402
+
+# describe() is built once per class, the settings of every instance are the same as without the cache
+for exchange_class in [ccxt.binance, ccxt.kraken, ccxt.pro.okx]:
+    config = {'apiKey': 'key', 'timeout': 5000, 'options': {'defaultType': 'swap'}}
+    exchange = exchange_class(config)
+    other = exchange_class(config)
+    assert '_describe_skeleton' in exchange_class.__dict__
+    assert exchange.describe_settings(config).keys() == exchange.deep_extend(exchange.describe(), config).keys()
+    assert exchange.apiKey == 'key' and other.timeout == 5000 and exchange.options['defaultType'] == 'swap'
+    # the nested dicts and lists are not shared between the instances nor with the skeleton
+    for key, value in vars(exchange).items():
+        if isinstance(value, (dict, list)) and value and key in exchange.describe():
+            assert other.__dict__[key] is not value, key
+    exchange.options['fetchMarkets'] = ['spot']
+    exchange.urls['api']['changed'] = True
+    fresh = exchange_class()
+    assert 'changed' not in fresh.urls['api'] and fresh.options.get('defaultType') != 'swap'
+    assert fresh.options.get('fetchMarkets') != ['spot']
+
+# the methods of describe() are bound to every instance
+exchange = ccxt.pro.okx()
+other = ccxt.pro.okx({'streaming': {'keepAlive': 1000}})
+assert isinstance(exchange.streaming['ping'], types.MethodType)
+assert exchange.streaming['ping'].__self__ is exchange
+assert other.streaming['ping'].__self__ is other and other.streaming['keepAlive'] == 1000
+
+# camelcase aliases
+exchange = ccxt.kraken()
+assert ccxt.kraken.camelcase('fetch_ohlcv') == 'fetchOHLCV'
+assert ccxt.kraken.camelcase('number_to_le') == 'numberToLE'
+assert exchange.fetchOHLCV.__func__ is exchange.fetch_ohlcv.__func__
+assert exchange.safeString is ccxt.kraken.safe_string
+assert exchange.safeString({'a': 1}, 'a') == '1'
+assert exchange.publicGetTicker.__func__ is exchange.public_get_ticker.__func__
+assert exchange.decimalToPrecision is exchange.decimal_to_precision
+exchange = ccxt.kraken({'some_setting': 1})
+assert exchange.someSetting == 1
+assert not hasattr(ccxt.kraken(), 'someSetting')
@@ -0,0 +1,46 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import json  # noqa: E402
+from ccxt.base.errors import NotSupported  # noqa: E402
+from ccxt.base.json_codec import json_codecs, get_json_codec  # noqa: E402
+
+
+payloads = [
+    '{"symbol":"BTCUSDT","price":"0.10000000","qty":1.10,"time":1679571174472,"list":[1,-2.5e-8,true,null,{"a":"\\u00e9"}]}',
+    '[[1679571174472,"28000.1","28010.0",12.5]]',
+    '{"big":123456789012345678901234567890,"nan":NaN}',
+]
+
+
+def test_json_codec(name):
+    codec = get_json_codec(name)
+    for payload in payloads:
+        # decoding matches the standard library, with and without quoted numbers
+        assert codec.loads(payload) == json.loads(payload) or 'nan' in payload
+        assert codec.loads_quoted(payload) == json.loads(payload, parse_float=str, parse_int=str)
+    data = {'method': 'SUBSCRIBE', 'params': ['btcusdt@depth'], 'id': 1, 1: 'é'}
+    assert json.loads(codec.dumps(data)) == json.loads(json.dumps(data))
+    # the types a codec cannot serialize fall back to the standard library
+    data = {'big': 123456789012345678901234567890, 'list': (1, 2)}
+    assert json.loads(codec.dumps(data)) == json.loads(json.dumps(data))
+
+
+if __name__ == '__main__':
+    assert get_json_codec().name == 'json'
+    try:
+        get_json_codec('unknown')
+        assert False
+    except NotSupported:
+        pass
+    for name, (codec, module) in json_codecs.items():
+        if module is not None:
+            test_json_codec(name)
+            print(name, 'succeeded')
+        else:
+            print(name, 'not installed')
@@ -0,0 +1,34 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+import ccxt.pro  # noqa: E402
+
+# the exchange modules are imported on first access
+assert 'ccxt.kraken' not in sys.modules
+assert 'ccxt.async_support.kraken' not in sys.modules
+assert isinstance(ccxt.kraken, type) and ccxt.kraken.__name__ == 'kraken'
+assert 'ccxt.kraken' in sys.modules
+assert 'ccxt.bitmex' not in sys.modules
+
+# importing the module keeps the class as the attribute of the package
+import ccxt.bitmex  # noqa: E402
+from ccxt.async_support.bitmex import bitmex  # noqa: E402
+assert isinstance(ccxt.bitmex, type) and ccxt.bitmex.__module__ == 'ccxt.bitmex'
+assert ccxt.async_support.bitmex is bitmex
+
+# ccxt.pro exchanges import their async_support base class
+assert issubclass(ccxt.pro.kraken, ccxt.async_support.kraken)
+assert ccxt.pro.exchanges == [id for id in ccxt.pro.exchanges if id in dir(ccxt.pro)]
+
+assert all(id in dir(ccxt) for id in ccxt.exchanges)
+try:
+    ccxt.unknown
+    assert False
+except AttributeError:
+    pass
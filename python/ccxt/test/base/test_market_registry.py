@@ -0,0 +1,85 @@
+import asyncio
+import gc
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.market_registry import market_registry  # noqa: E402
+from ccxt.test.base.fake_exchanges import fake, async_fake, fake_time, fake_networks, async_fake_networks  # noqa: E402
+
+
+# sets the time difference and the network ids
+class fake_options(fake_time, fake_networks):
+    id = 'fakeoptions'
+
+
+# the instances with the same markets share them
+exchanges = [fake({'shareMarkets': True, 'apiKey': str(i)}) for i in range(10)]
+for exchange in exchanges:
+    exchange.load_markets()
+assert fake.all_fetches == 1 and len(market_registry) == 1
+first = exchanges[0]
+for exchange in exchanges:
+    for name in ['markets', 'markets_by_id', 'symbols', 'currencies', 'currencies_by_id', 'codes']:
+        assert getattr(exchange, name) is getattr(first, name), name
+    assert exchange.market_table is first.market_table
+assert first.market('ETH/BTC')['id'] == 'ETHBTC'
+
+# not shared with other options nor without shareMarkets
+fake({'shareMarkets': True, 'options': {'x': 2}}).load_markets()
+unshared = fake()
+unshared.load_markets()
+assert fake.all_fetches == 3 and unshared.markets is not first.markets
+
+# a reload replaces the shared markets for the next instances, the others keep theirs
+markets = first.markets
+exchanges[1].load_markets(True)
+assert fake.all_fetches == 4 and exchanges[1].markets is not markets and first.markets is markets
+late = fake({'shareMarkets': True})
+late.load_markets()
+assert late.markets is exchanges[1].markets and fake.all_fetches == 4
+
+# the options changed by fetching the markets are set on the other instances too, the key does not change with them
+owner = fake_options({'shareMarkets': True})
+key = owner.markets_key()
+owner.load_markets()
+assert owner.markets_key() == key
+fetches = fake.all_fetches
+other = fake_options({'shareMarkets': True})
+other.load_markets()
+assert fake.all_fetches == fetches and other.markets is owner.markets
+assert 999 <= other.options['timeDifference'] <= 1100
+assert other.options['networkNamesByChainIds'] == {'trc20usdt': 'TRC20'}
+assert other.options['networkNamesByChainIds'] is not owner.options['networkNamesByChainIds']
+owner.load_markets(True)
+assert fake_options({'shareMarkets': True}).load_markets() is owner.markets
+del owner, other
+
+# the markets are dropped with the last instance holding them
+del exchanges, first, late, exchange
+gc.collect()
+assert len(market_registry) == 0
+
+
+# async: the instances wait for the markets fetched by another one
+async def test_async():
+    exchanges = [async_fake({'shareMarkets': True}) for i in range(20)]
+    await asyncio.gather(*[exchange.load_markets() for exchange in exchanges])
+    assert async_fake.all_fetches == 1
+    assert all(exchange.markets is exchanges[0].markets for exchange in exchanges)
+    assert not market_registry.loading
+    for exchange in exchanges:
+        await exchange.close()
+    exchanges = [async_fake_networks({'shareMarkets': True}) for i in range(3)]
+    await asyncio.gather(*[exchange.load_markets() for exchange in exchanges])
+    assert async_fake.all_fetches == 2
+    assert all(exchange.options['networkNamesByChainIds'] == {'trc20usdt': 'TRC20'} for exchange in exchanges)
+    for exchange in exchanges:
+        await exchange.close()
+
+
+asyncio.run(test_async())
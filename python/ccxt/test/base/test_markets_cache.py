@@ -0,0 +1,128 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base.markets_cache import get_markets_cache  # noqa: E402
+from ccxt.test.base.fake_exchanges import fake, async_fake, fake_time, fake_networks, async_fake_time, async_fake_networks  # noqa: E402
+
+
+directory = tempfile.mkdtemp()
+settings = {'path': directory, 'ttl': 60000}
+
+assert get_markets_cache(None) is None
+assert get_markets_cache(directory).path == directory
+assert get_markets_cache(True).path.endswith(os.path.join('ccxt', 'markets'))
+
+# the first load fetches the markets and writes them, the next instances read them
+exchange = fake({'marketsCache': settings})
+markets = exchange.load_markets()
+assert exchange.fetches == 1 and len(os.listdir(directory)) == 1
+other = fake({'marketsCache': settings})
+assert other.load_markets() == markets and other.fetches == 0
+for name in ['markets_by_id', 'symbols', 'ids', 'currencies', 'currencies_by_id', 'codes']:
+    assert getattr(other, name) == getattr(exchange, name), name
+assert other.market('ETH/BTC')['id'] == 'ETHBTC' and other.currency('USDT')['code'] == 'USDT'
+# reload fetches them again
+other.load_markets(True)
+assert other.fetches == 1
+
+# other options or params use another file
+fake({'marketsCache': settings, 'options': {'x': 2}}).load_markets()
+assert len(os.listdir(directory)) == 2
+exchange = fake({'marketsCache': settings})
+exchange.load_markets(False, {'type': 'spot'})
+assert exchange.fetches == 1
+
+# expired, another version of ccxt or a corrupted file
+exchange = fake({'marketsCache': {'path': directory, 'ttl': 0}})
+exchange.load_markets()
+assert exchange.fetches == 1
+key = exchange.markets_key()
+cache = exchange.markets_cache
+cache.write('fake', key, '0.0.1', exchange.milliseconds(), {})
+assert cache.read('fake', key, ccxt.__version__) is None
+with open(cache.file('fake', key), 'wb') as f:
+    f.write(b'not a pickle')
+assert cache.read('fake', key, ccxt.__version__) is None
+exchange = fake({'marketsCache': settings})
+exchange.load_markets()
+assert exchange.fetches == 1
+assert not [name for name in os.listdir(directory) if name.startswith('.')]
+
+# the options set by fetching the markets are set again when they are read
+fake_networks({'marketsCache': settings}).load_markets()
+exchange = fake_networks({'marketsCache': settings})
+exchange.load_markets()
+assert exchange.fetches == 0
+assert exchange.options['networkChainIdsByNames'] == {'USDT': {'TRC20': 'trc20usdt'}}
+assert exchange.options['networkNamesByChainIds'] == {'trc20usdt': 'TRC20'}
+# the time difference is loaded again
+exchange = fake_time({'marketsCache': settings})
+exchange.load_markets()
+assert exchange.fetches == 1 and exchange.times == 1
+exchange = fake_time({'marketsCache': settings})
+exchange.load_markets()
+assert exchange.fetches == 0 and exchange.times == 1
+assert 999 <= exchange.options['timeDifference'] <= 1100
+
+
+# async: an expired file is used while the markets are fetched in the background
+async def test_async():
+    exchange = async_fake({'marketsCache': settings})
+    await exchange.load_markets()
+    assert exchange.fetches == 0 and 'ETH/BTC' in exchange.markets
+    # the options set by fetching the markets, also by a refresh
+    exchange = async_fake_networks({'marketsCache': settings})
+    await exchange.load_markets()
+    assert exchange.fetches == 0 and exchange.options['networkNamesByChainIds'] == {'trc20usdt': 'TRC20'}
+    exchange = async_fake_networks({'marketsCache': {'path': directory, 'ttl': 0}})
+    await exchange.load_markets()
+    assert exchange.options['networkNamesByChainIds'] == {'trc20usdt': 'TRC20'}
+    await exchange.markets_refreshing
+    exchange = async_fake_networks({'marketsCache': settings})
+    await exchange.load_markets()
+    assert exchange.fetches == 0 and exchange.options['networkNamesByChainIds'] == {'trc20usdt': 'TRC20'}
+    exchange = async_fake_time({'marketsCache': settings})
+    await exchange.load_markets()
+    assert exchange.fetches == 0 and exchange.times == 1
+    assert 999 <= exchange.options['timeDifference'] <= 1100
+    exchange = async_fake({'marketsCache': {'path': directory, 'ttl': 0}})
+    markets = await exchange.load_markets()
+    assert 'ETH/BTC' in markets and exchange.markets_refreshing is not None
+    refreshing = exchange.markets_refreshing
+    await refreshing
+    assert exchange.fetches == 1 and exchange.markets_refreshing is None
+    # the markets are kept if they cannot be fetched
+    exchange = async_fake({'marketsCache': {'path': directory, 'ttl': 0}})
+    exchange.fail = True
+    await exchange.load_markets()
+    await exchange.markets_refreshing
+    assert exchange.fetches == 1 and 'ETH/BTC' in exchange.markets
+    # without refresh the expired file is not used
+    exchange = async_fake({'marketsCache': {'path': directory, 'ttl': 0, 'refresh': False}})
+    await exchange.load_markets()
+    assert exchange.fetches == 1 and exchange.markets_refreshing is None
+    # close cancels the refresh
+    exchange = async_fake({'marketsCache': {'path': directory, 'ttl': 0}})
+    await exchange.load_markets()
+    refreshing = exchange.markets_refreshing
+    await exchange.close()
+    await asyncio.sleep(0)
+    assert refreshing.cancelled()
+
+
+asyncio.run(test_async())
+
+# reading the file is faster than building the markets
+exchange = fake({'marketsCache': settings})
+start = time.perf_counter()
+exchange.load_markets()
+assert time.perf_counter() - start < 1
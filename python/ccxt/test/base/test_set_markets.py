@@ -0,0 +1,126 @@
+import json
+import os
+import random
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base.decimal_to_precision import DECIMAL_PLACES, TICK_SIZE  # noqa: E402
+
+static = os.path.join(os.path.dirname(root), 'ts', 'src', 'test', 'static')
+
+
+def reference_set_markets(exchange, markets):
+    # set_markets without currencies before the markets defaults were merged once, see Exchange.set_markets
+    values = []
+    markets_by_id = {}
+    for value in exchange.sort_by(exchange.to_array(markets), 'spot', True, True):
+        markets_by_id.setdefault(value['id'], []).append(value)
+        market = exchange.deep_extend(exchange.safe_market_structure(), {
+            'precision': exchange.precision,
+            'limits': exchange.limits,
+        }, exchange.fees['trading'], value)
+        market['subType'] = 'linear' if market['linear'] else ('inverse' if market['inverse'] else None)
+        values.append(market)
+    base_currencies = []
+    quote_currencies = []
+    for market in values:
+        default_precision = 8 if (exchange.precisionMode == DECIMAL_PLACES) else exchange.parse_number('1e-8')
+        precision = exchange.safe_dict(market, 'precision', {})
+        for side, amount in [('base', 'amount'), ('quote', 'price')]:
+            if side in market:
+                currency = exchange.safe_currency_structure({
+                    'id': exchange.safe_string_2(market, side + 'Id', side),
+                    'numericId': exchange.safe_integer(market, side + 'NumericId'),
+                    'code': exchange.safe_string(market, side),
+                    'precision': exchange.safe_value_2(precision, side, amount, default_precision),
+                })
+                (base_currencies if side == 'base' else quote_currencies).append(currency)
+    base_currencies = exchange.sort_by(base_currencies, 'code', False, '')
+    quote_currencies = exchange.sort_by(quote_currencies, 'code', False, '')
+    grouped = exchange.group_by(base_currencies + quote_currencies, 'code')
+    resulting = []
+    for code, group in grouped.items():
+        highest = group[0]
+        for currency in group[1:]:
+            if exchange.precisionMode == TICK_SIZE:
+                highest = currency if currency['precision'] < highest['precision'] else highest
+            else:
+                highest = currency if currency['precision'] > highest['precision'] else highest
+        resulting.append(highest)
+    currencies = exchange.deep_extend(exchange.currencies, exchange.index_by(exchange.sort_by(resulting, 'code'), 'code'))
+    return {
+        'markets': exchange.index_by(values, 'symbol'),
+        'markets_by_id': markets_by_id,
+        'symbols': sorted(exchange.index_by(values, 'symbol').keys()),
+        'ids': sorted(markets_by_id.keys()),
+        'baseCurrencies': exchange.index_by(base_currencies, 'code'),
+        'quoteCurrencies': exchange.index_by(quote_currencies, 'code'),
+        'currencies': currencies,
+        'currencies_by_id': exchange.index_by(currencies, 'id'),
+        'codes': sorted(currencies.keys()),
+    }
+
+
+def random_markets(count, seed):
+    rnd = random.Random(seed)
+    markets = []
+    for i in range(count):
+        base = 'C' + str(rnd.randint(0, count // 3))
+        quote = rnd.choice(['USDT', 'BTC', 'USD', None])
+        spot = rnd.random() < 0.5
+        market = {
+            'id': (base + str(quote)) if rnd.random() < 0.9 else 'SAME',
+            'symbol': base + '/' + str(quote) + ('' if spot else ':' + str(quote)),
+            'base': base,
+            'quote': quote,
+            'baseId': base.lower() if rnd.random() < 0.5 else None,
+            'quoteId': quote,
+            'type': 'spot' if spot else 'swap',
+            'spot': spot,
+            'swap': not spot,
+            'linear': None if spot else rnd.random() < 0.7,
+            'inverse': None if spot else rnd.random() < 0.3,
+            'precision': {'amount': rnd.choice([0.1, 0.01, 0.001, None]), 'price': rnd.choice([0.1, 0.01, 0.0001])},
+            'limits': {'amount': {'min': rnd.random()}, 'leverage': {'max': 100}},
+            'info': {'symbol': base, 'filters': [{'a': 1}], 'nested': {'a': {'b': 1}}},
+        }
+        if rnd.random() < 0.1:
+            market['baseNumericId'] = str(i)
+        if rnd.random() < 0.05:
+            del market['quote']
+        if rnd.random() < 0.05:
+            market['symbol'] = None
+        markets.append(market)
+    return markets
+
+
+def check(exchange, markets):
+    expected = reference_set_markets(exchange, markets)
+    assert exchange.set_markets(markets) is exchange.markets
+    for name, value in expected.items():
+        actual = getattr(exchange, name)
+        assert actual == value, name
+        if isinstance(value, dict):
+            assert list(actual.keys()) == list(value.keys()), name
+            assert type(actual) is type(value), name
+    # the markets do not share their nested dicts
+    precisions = [id(market['precision']) for market in exchange.markets.values()]
+    assert len(set(precisions)) == len(precisions)
+
+
+for exchange_id in ['binance', 'okx', 'kraken', 'bitfinex2', 'gate']:
+    with open(os.path.join(static, 'markets', exchange_id + '.json')) as f:
+        markets = json.load(f)
+    check(getattr(ccxt, exchange_id)(), markets)
+
+for seed in range(4):
+    for exchange_id in ['binance', 'kraken', 'deribit']:
+        exchange = getattr(ccxt, exchange_id)()
+        if seed == 3:
+            exchange.precisionMode = DECIMAL_PLACES
+        check(exchange, random_markets(1000, seed))
@@ -0,0 +1,64 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import multiprocessing  # noqa: E402
+import tempfile  # noqa: E402
+import time  # noqa: E402
+from ccxt.base.token_bucket import SharedMemoryTokenBucket  # noqa: E402
+from ccxt.async_support.base.throttler import Throttler  # noqa: E402
+
+
+delta = 15
+refill_rate = 1 / 50
+processes = 3
+runs = 10
+
+
+def sync_worker(path):
+    # what the sync Exchange.throttle does with a backend
+    bucket = SharedMemoryTokenBucket(path, {'refillRate': refill_rate})
+    for i in range(runs):
+        delay = bucket.reserve(1)
+        if delay > 0:
+            time.sleep(delay / 1000)
+    bucket.close()
+
+
+def async_worker(path):
+    async def main():
+        bucket = SharedMemoryTokenBucket(path, {'refillRate': refill_rate})
+        throttle = Throttler({'backend': bucket})
+        for i in range(runs):
+            await throttle(1)
+        bucket.close()
+    asyncio.run(main())
+
+
+def check_shared_token_bucket(worker):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bucket')
+        SharedMemoryTokenBucket(path, {'refillRate': refill_rate}).close()
+        start = time.perf_counter_ns()
+        workers = [multiprocessing.Process(target=worker, args=(path,)) for i in range(processes)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+        elapsed_ms = (time.perf_counter_ns() - start) / 1000000
+    # all processes together are limited to one request per 1 / refill_rate ms
+    expected = (processes * runs - 1) / refill_rate
+    # process startup time is counted in elapsed_ms but the bucket refills while they start
+    result = elapsed_ms >= expected - delta and elapsed_ms < expected + 250
+    print(f'{worker.__name__} {"succeeded" if result else "failed"} in {elapsed_ms}ms expected {expected}ms')
+    assert result
+
+
+if __name__ == '__main__':
+    check_shared_token_bucket(sync_worker)
+    check_shared_token_bucket(async_worker)
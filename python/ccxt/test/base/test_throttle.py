@@ -8,7 +8,11 @@ sys.path.append(root)
 
 import asyncio  # noqa: E402
 import time  # noqa: E402
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+from ccxt.abstract.binance import ImplicitAPI  # noqa: E402
 from ccxt.async_support.base.throttler import Throttler as Throttle  # noqa: E402
+from ccxt.async_support.base.throttler import MultiThrottler, shared_throttler  # noqa: E402
 # from ccxt.async_support.base.throttle import throttle as Throttle
 
 
@@ -90,10 +94,11 @@ for i, case in enumerate(test_cases, 1):
     case['expected'] = remaining * case['cost'] / case['refillRate']
 
 
-async def schedule(case):
+async def schedule(case, mode):
     throttle = Throttle({
         'tokens': case['tokens'],
         'refillRate': case['refillRate'],
+        'mode': mode,
     })
     start = time.perf_counter_ns()
     for i in range(case['runs']):
@@ -101,15 +106,159 @@ async def schedule(case):
     end = time.perf_counter_ns()
     elapsed_ms = (end - start) / 1000000
     result = abs(case['expected'] - elapsed_ms) < delta
-    print(f'case {case["number"]} {"succeeded" if result else "failed"} in {elapsed_ms}ms expected {case["expected"]}ms')
+    print(f'{mode} case {case["number"]} {"succeeded" if result else "failed"} in {elapsed_ms}ms expected {case["expected"]}ms')
+    assert result
+
+
+async def schedule_shared(instances, runs, refill_rate):
+    # several instances spending one named bucket take as long as one instance doing all the runs
+    config = {'refillRate': refill_rate, 'mode': 'timer'}
+    throttles = [shared_throttler('test_shared_bucket', config) for i in range(instances)]
+    assert all(throttle is throttles[0] for throttle in throttles)
+
+    async def run(throttle):
+        for i in range(runs):
+            await throttle(1)
+
+    start = time.perf_counter_ns()
+    await asyncio.gather(*[run(throttle) for throttle in throttles])
+    elapsed_ms = (time.perf_counter_ns() - start) / 1000000
+    expected = (instances * runs - 1) / refill_rate
+    result = abs(expected - elapsed_ms) < delta
+    print(f'shared bucket {"succeeded" if result else "failed"} in {elapsed_ms}ms expected {expected}ms')
+    assert result
+
+
+async def schedule_multi(runs):
+    # the 'orders' bucket is the bottleneck, the default bucket is only charged for the weight
+    throttle = MultiThrottler({
+        'default': Throttle({'refillRate': 1 / 10, 'mode': 'timer'}),
+        'orders': Throttle({'refillRate': 1 / 50, 'mode': 'timer'}),
+    })
+    start = time.perf_counter_ns()
+    for i in range(runs):
+        await throttle({'default': 2, 'orders': 1})
+    elapsed_ms = (time.perf_counter_ns() - start) / 1000000
+    expected = (runs - 1) * 50
+    result = abs(expected - elapsed_ms) < delta
+    print(f'multi bucket {"succeeded" if result else "failed"} in {elapsed_ms}ms expected {expected}ms')
+    assert result
+
+
+async def schedule_multi_waiting():
+    # the default bucket is not charged while the request waits on the 'orders' bucket
+    default = Throttle({'refillRate': 1 / 10, 'tokens': 5, 'mode': 'timer'})
+    orders = Throttle({'refillRate': 1 / 100, 'tokens': -1, 'mode': 'timer'})
+    throttle = MultiThrottler({'default': default, 'orders': orders})
+    future = throttle({'default': 2, 'orders': 1})
+    await asyncio.sleep(0.05)
+    assert not future.done() and default.config['tokens'] == 5
+    await future
+    assert default.config['tokens'] == 3 and orders.config['tokens'] < 0
+
+
+def test_token_buckets_cost():
+    # the endpoints list the costs of the extra buckets in their api config
+    config = ImplicitAPI.__dict__['private_post_order'].config
+    exchange = ccxt.async_support.binance({'tokenBuckets': {'orders': {'refillRate': 1 / 200}}})
+    assert exchange.token_buckets_cost(0.2, config) == {'default': 0.2, 'orders': 1}
+    assert exchange.token_buckets_cost(1, {'cost': 1}) == 1
+    assert ccxt.async_support.binance().token_buckets_cost(0.2, config) == 0.2
+    assert ccxt.binance().token_buckets_cost(0.2, config) == 0.2
+
+
+def test_sync_adapt():
+    # the sync rate limiter slows down near the limit and waits out the retry-after
+    exchange = ccxt.binance()
+    spot = 'https://api.binance.com/api/v3/order'
+    exchange.adapt_rate_limiter(200, {'x-mbx-used-weight-1m': '5700'}, spot)
+    assert abs(exchange.rateLimitFactor - 0.5) < 1e-9 and exchange.rateLimitPausedUntil == 0
+    exchange.adapt_rate_limiter(200, {'x-mbx-used-weight-1m': '60'}, spot)
+    assert exchange.rateLimitFactor == 1
+    exchange.adapt_rate_limiter(429, {'Retry-After': '0.2'}, spot)
+    start = time.perf_counter_ns()
+    exchange.throttle(1)
+    elapsed_ms = (time.perf_counter_ns() - start) / 1000000
+    assert abs(200 - elapsed_ms) < delta
+
+
+def test_rate_limit_endpoints():
+    # each pool of weight is read with its own header and limit, the other endpoints are ignored
+    exchange = ccxt.binanceusdm()
+    assert not exchange.adaptiveRateLimit
+
+    def factor(url, headers):
+        return exchange.parse_rate_limit_headers(200, headers, url)[0]
+
+    headers = {'x-mbx-used-weight-1m': '2280', 'x-sapi-used-ip-weight-1m': '600'}
+    assert abs(factor('https://fapi.binance.com/fapi/v1/order', headers) - 0.5) < 1e-9
+    assert abs(factor('https://api.binance.com/api/v3/order', headers) - 1) < 1e-9
+    assert abs(factor('https://api.binance.com/sapi/v1/capital/config/getall', headers) - 1) < 1e-9
+    assert exchange.parse_rate_limit_headers(200, headers, 'https://eapi.binance.com/eapi/v1/order') == (None, None)
+    assert abs(factor('https://proxy.example.com/https://fapi.binance.com/fapi/v1/order', headers) - 0.5) < 1e-9
+    exchange = ccxt.binanceus()
+    assert abs(factor('https://api.binance.us/api/v3/order', {'x-mbx-used-weight-1m': '1140'}) - 0.5) < 1e-9
+
+
+def test_shared_loop():
+    # a shared bucket is bound to one running event loop, it moves to the next one once that loop is closed
+    throttle = shared_throttler('test_shared_loop', {})
+    first = asyncio.new_event_loop()
+    second = asyncio.new_event_loop()
+    throttle.bind(first)
+    try:
+        throttle.bind(second)
+        assert False
+    except RuntimeError:
+        pass
+    first.close()
+    throttle.bind(second)
+    assert throttle.loop is second
+    second.close()
+
+
+async def schedule_pause(mode):
+    # a retry-after pause holds back the queue even if the bucket has tokens
+    throttle = Throttle({'refillRate': 1 / 10, 'tokens': 0, 'mode': mode})
+    throttle.pause(300)
+    start = time.perf_counter_ns()
+    await throttle(1)
+    throttle.set_refill_rate(1 / 20)
+    for i in range(10):
+        await throttle(1)
+    elapsed_ms = (time.perf_counter_ns() - start) / 1000000
+    expected = 300 + 10 * 20
+    result = abs(expected - elapsed_ms) < delta
+    print(f'{mode} pause {"succeeded" if result else "failed"} in {elapsed_ms}ms expected {expected}ms')
+    assert result
+
+
+async def schedule_adapt(factor):
+    # a 429 with a retry-after pauses for that time, whatever the refill rate is rescaled to
+    exchange = ccxt.async_support.binance({'tokenBucket': {'mode': 'timer'}})
+    used = 6000 - 6000 * 0.1 * factor
+    start = time.perf_counter_ns()
+    exchange.adapt_rate_limiter(429, {'Retry-After': '0.3', 'X-MBX-USED-WEIGHT-1M': str(used)}, 'https://api.binance.com/api/v3/order')
+    assert abs(exchange.throttle.config['refillRate'] - exchange.tokenBucket['refillRate'] * min(factor, 1)) < 1e-9
+    await exchange.throttle(1)
+    elapsed_ms = (time.perf_counter_ns() - start) / 1000000
+    result = abs(300 - elapsed_ms) < delta
+    print(f'adapt {factor} {"succeeded" if result else "failed"} in {elapsed_ms}ms expected 300ms')
     assert result
 
 
 async def main():
-    await asyncio.wait([schedule(case) for case in test_cases], return_when=asyncio.ALL_COMPLETED)
+    for mode in ['polling', 'timer']:
+        await asyncio.gather(*[schedule(case, mode) for case in test_cases])
+    await asyncio.gather(schedule_shared(3, 10, 1 / 50), schedule_multi(20), schedule_multi_waiting(), schedule_pause('polling'), schedule_pause('timer'))
+    await asyncio.gather(schedule_adapt(0.1), schedule_adapt(2))
 
 
 asyncio.run(main())
+test_token_buckets_cost()
+test_sync_adapt()
+test_rate_limit_endpoints()
+test_shared_loop()
 
 # output
 
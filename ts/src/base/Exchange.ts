@@ -356,6 +356,7 @@ export default class Exchange {
     clients = {}
     newUpdates = true
     streaming = {}
+    messageRoutesTable = undefined
 
     alias = false;
 
@@ -1884,6 +1885,25 @@ export default class Exchange {
         return -1;
     }
 
+    messageRoutes () {
+        // event -> handler method, for the exchanges that dispatch their messages with routeMessage
+        return {};
+    }
+
+    routeMessage (client, message, event) {
+        // calls the handler of the event, the table of messageRoutes () is built once on the first message
+        // returns false if there is no handler for the event
+        if (this.messageRoutesTable === undefined) {
+            this.messageRoutesTable = this.messageRoutes ();
+        }
+        const handler = this.safeValue (this.messageRoutesTable, event);
+        if (handler === undefined) {
+            return false;
+        }
+        handler.call (this, client, message);
+        return true;
+    }
+
     findTimeframe (timeframe, timeframes = undefined) {
         if (timeframes === undefined) {
             timeframes = this.timeframes;
@@ -2625,10 +2645,16 @@ export default class Exchange {
 
     setMarkets (markets, currencies = undefined) {
         const values = [];
+        this.markets = {};
         this.markets_by_id = {};
         // handle marketId conflicts
         // we insert spot markets first
         const marketValues = this.sortBy (this.toArray (markets), 'spot', true, true);
+        // the defaults shared by all the markets are merged once
+        const marketStructure = this.deepExtend (this.safeMarketStructure (), {
+            'precision': this.precision,
+            'limits': this.limits,
+        }, this.fees['trading']);
         for (let i = 0; i < marketValues.length; i++) {
             const value = marketValues[i];
             if (value['id'] in this.markets_by_id) {
@@ -2636,10 +2662,7 @@ export default class Exchange {
             } else {
                 this.markets_by_id[value['id']] = [ value ] as any;
             }
-            const market = this.deepExtend (this.safeMarketStructure (), {
-                'precision': this.precision,
-                'limits': this.limits,
-            }, this.fees['trading'], value);
+            const market = this.deepExtend (marketStructure, value);
             if (market['linear']) {
                 market['subType'] = 'linear';
             } else if (market['inverse']) {
@@ -2648,8 +2671,10 @@ export default class Exchange {
                 market['subType'] = undefined;
             }
             values.push (market);
+            if (market['symbol'] !== undefined) {
+                this.markets[market['symbol']] = market;
+            }
         }
-        this.markets = this.indexBy (values, 'symbol') as any;
         const marketsSortedBySymbol = this.keysort (this.markets);
         const marketsSortedById = this.keysort (this.markets_by_id);
         this.symbols = Object.keys (marketsSortedBySymbol);
@@ -2658,11 +2683,14 @@ export default class Exchange {
             // currencies is always undefined when called in constructor but not when called from loadMarkets
             this.currencies = this.deepExtend (this.currencies, currencies);
         } else {
-            let baseCurrencies = [];
-            let quoteCurrencies = [];
+            // the currency with the highest precision of each code, the base currencies first
+            const baseCurrencies = {};
+            const quoteCurrencies = {};
+            const baseCodes = {};
+            const quoteCodes = {};
+            const defaultCurrencyPrecision = (this.precisionMode === DECIMAL_PLACES) ? 8 : this.parseNumber ('1e-8');
             for (let i = 0; i < values.length; i++) {
                 const market = values[i];
-                const defaultCurrencyPrecision = (this.precisionMode === DECIMAL_PLACES) ? 8 : this.parseNumber ('1e-8');
                 const marketPrecision = this.safeDict (market, 'precision', {});
                 if ('base' in market) {
                     const currency = this.safeCurrencyStructure ({
@@ -2671,7 +2699,7 @@ export default class Exchange {
                         'code': this.safeString (market, 'base'),
                         'precision': this.safeValue2 (marketPrecision, 'base', 'amount', defaultCurrencyPrecision),
                     });
-                    baseCurrencies.push (currency);
+                    this.setMarketCurrency (currency, baseCurrencies, baseCodes);
                 }
                 if ('quote' in market) {
                     const currency = this.safeCurrencyStructure ({
@@ -2680,33 +2708,24 @@ export default class Exchange {
                         'code': this.safeString (market, 'quote'),
                         'precision': this.safeValue2 (marketPrecision, 'quote', 'price', defaultCurrencyPrecision),
                     });
-                    quoteCurrencies.push (currency);
+                    this.setMarketCurrency (currency, quoteCurrencies, quoteCodes);
                 }
             }
-            baseCurrencies = this.sortBy (baseCurrencies, 'code', false, '');
-            quoteCurrencies = this.sortBy (quoteCurrencies, 'code', false, '');
             this.baseCurrencies = this.indexBy (baseCurrencies, 'code');
             this.quoteCurrencies = this.indexBy (quoteCurrencies, 'code');
-            const allCurrencies = this.arrayConcat (baseCurrencies, quoteCurrencies);
-            const groupedCurrencies = this.groupBy (allCurrencies, 'code');
-            const codes = Object.keys (groupedCurrencies);
-            const resultingCurrencies = [];
+            const codes = Object.keys (this.keysort (this.extend (baseCodes, quoteCodes)));
+            const resultingCurrencies = {};
             for (let i = 0; i < codes.length; i++) {
                 const code = codes[i];
-                const groupedCurrenciesCode = this.safeList (groupedCurrencies, code, []);
-                let highestPrecisionCurrency = this.safeValue (groupedCurrenciesCode, 0);
-                for (let j = 1; j < groupedCurrenciesCode.length; j++) {
-                    const currentCurrency = groupedCurrenciesCode[j];
-                    if (this.precisionMode === TICK_SIZE) {
-                        highestPrecisionCurrency = (currentCurrency['precision'] < highestPrecisionCurrency['precision']) ? currentCurrency : highestPrecisionCurrency;
-                    } else {
-                        highestPrecisionCurrency = (currentCurrency['precision'] > highestPrecisionCurrency['precision']) ? currentCurrency : highestPrecisionCurrency;
-                    }
+                const baseCurrency = this.safeDict (baseCodes, code);
+                const quoteCurrency = this.safeDict (quoteCodes, code);
+                if ((baseCurrency === undefined) || ((quoteCurrency !== undefined) && this.isHigherCurrencyPrecision (quoteCurrency, baseCurrency))) {
+                    resultingCurrencies[code] = quoteCurrency;
+                } else {
+                    resultingCurrencies[code] = baseCurrency;
                 }
-                resultingCurrencies.push (highestPrecisionCurrency);
             }
-            const sortedCurrencies = this.sortBy (resultingCurrencies, 'code');
-            this.currencies = this.deepExtend (this.currencies, this.indexBy (sortedCurrencies, 'code'));
+            this.currencies = this.deepExtend (this.currencies, resultingCurrencies);
         }
         this.currencies_by_id = this.indexBy (this.currencies, 'id');
         const currenciesSortedByCode = this.keysort (this.currencies);
@@ -2714,6 +2733,26 @@ export default class Exchange {
         return this.markets;
     }
 
+    setMarketCurrency (currency, currenciesByCode, highestPrecisionByCode) {
+        // the last currency of a code and the first one with its highest precision
+        const code = currency['code'];
+        if (code === undefined) {
+            return;
+        }
+        currenciesByCode[code] = currency;
+        const highestPrecision = this.safeDict (highestPrecisionByCode, code);
+        if ((highestPrecision === undefined) || this.isHigherCurrencyPrecision (currency, highestPrecision)) {
+            highestPrecisionByCode[code] = currency;
+        }
+    }
+
+    isHigherCurrencyPrecision (currency, other) {
+        if (this.precisionMode === TICK_SIZE) {
+            return currency['precision'] < other['precision'];
+        }
+        return currency['precision'] > other['precision'];
+    }
+
     getDescribeForExtendedWsExchange (currentRestInstance: any, parentRestInstance: any, wsBaseDescribe: Dictionary<any>) {
         const extendedRestDescribe = this.deepExtend (parentRestInstance.describe (), currentRestInstance.describe ());
         const superWithRestDescribe = this.deepExtend (extendedRestDescribe, wsBaseDescribe);
@@ -4008,7 +4047,7 @@ export default class Exchange {
     async fetch2 (path, api: any = 'public', method = 'GET', params = {}, headers: any = undefined, body: any = undefined, config = {}) {
         if (this.enableRateLimit) {
             const cost = this.calculateRateLimiterCost (api, method, path, params, config);
-            await this.throttle (cost);
+            await this.throttle (this.tokenBucketsCost (cost, config));
         }
         this.lastRestRequestTimestamp = this.milliseconds ();
         const request = this.sign (path, api, method, params, headers, body);
@@ -4532,6 +4571,11 @@ export default class Exchange {
         return this.safeValue (config, 'cost', 1);
     }
 
+    tokenBucketsCost (cost, config = {}) {
+        // the async python exchanges with extra tokenBuckets also charge the costs in config['tokenBuckets']
+        return cost;
+    }
+
     async fetchTicker (symbol: string, params = {}): Promise<Ticker> {
         if (this.has['fetchTickers']) {
             await this.loadMarkets ();
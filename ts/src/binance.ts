@@ -24,6 +24,19 @@ export default class binance extends Exchange {
             'name': 'Binance',
             'countries': [ 'JP', 'MT' ], // Japan, Malta
             'rateLimit': 50,
+            // the used request weight reported in the responses, the python rate limiter follows it with adaptiveRateLimit
+            // each pool of weight has its own limit and header, by the url prefix of its endpoints
+            'rateLimitHeaders': {
+                'usedHeader': 'x-mbx-used-weight-1m',
+                'window': 60000,
+                'maxFactor': 1,
+                'endpoints': {
+                    'api.binance.com/api/': { 'limit': 6000 },
+                    'api.binance.com/sapi/': { 'usedHeader': 'x-sapi-used-ip-weight-1m', 'limit': 12000 },
+                    'fapi.binance.com/fapi/': { 'limit': 2400 },
+                    'dapi.binance.com/dapi/': { 'limit': 2400 },
+                },
+            },
             'certified': true,
             'pro': true,
             // new metainfo2 interface
@@ -968,11 +981,12 @@ export default class binance extends Exchange {
                         'account/commission': 4,
                     },
                     'post': {
-                        'order/oco': 0.2,
-                        'sor/order': 0.2,
+                        // the placed orders also count towards the order rate limits of the account, see tokenBuckets
+                        'order/oco': { 'cost': 0.2, 'tokenBuckets': { 'orders': 2 } },
+                        'sor/order': { 'cost': 0.2, 'tokenBuckets': { 'orders': 1 } },
                         'sor/order/test': 0.2,
-                        'order': 0.2,
-                        'order/cancelReplace': 0.2,
+                        'order': { 'cost': 0.2, 'tokenBuckets': { 'orders': 1 } },
+                        'order/cancelReplace': { 'cost': 0.2, 'tokenBuckets': { 'orders': 1 } },
                         'order/test': 0.2,
                     },
                     'delete': {
@@ -13,6 +13,11 @@ export default class binanceus extends binance {
             'countries': [ 'US' ], // US
             'hostname': 'binance.us',
             'rateLimit': 50, // 1200 req per min
+            'rateLimitHeaders': {
+                'endpoints': {
+                    'api.binance.us/api/': { 'limit': 1200 },
+                },
+            },
             'certified': false,
             'pro': true,
             'urls': {
@@ -3006,23 +3006,8 @@ export default class binance extends binanceRest {
         }
     }
 
-    handleMessage (client: Client, message) {
-        // handle WebSocketAPI
-        const status = this.safeString (message, 'status');
-        const error = this.safeValue (message, 'error');
-        if ((error !== undefined) || (status !== undefined && status !== '200')) {
-            this.handleWsError (client, message);
-            return;
-        }
-        const id = this.safeString (message, 'id');
-        const subscriptions = this.safeValue (client.subscriptions, id);
-        let method = this.safeValue (subscriptions, 'method');
-        if (method !== undefined) {
-            method.call (this, client, message);
-            return;
-        }
-        // handle other APIs
-        const methods = {
+    messageRoutes () {
+        return {
             'depthUpdate': this.handleOrderBook,
             'trade': this.handleTrade,
             'aggTrade': this.handleTrade,
@@ -3040,13 +3025,30 @@ export default class binance extends binanceRest {
             'executionReport': this.handleOrderUpdate,
             'ORDER_TRADE_UPDATE': this.handleOrderUpdate,
         };
+    }
+
+    handleMessage (client: Client, message) {
+        // handle WebSocketAPI
+        const status = this.safeString (message, 'status');
+        const error = this.safeValue (message, 'error');
+        if ((error !== undefined) || (status !== undefined && status !== '200')) {
+            this.handleWsError (client, message);
+            return;
+        }
+        const id = this.safeString (message, 'id');
+        const subscriptions = this.safeValue (client.subscriptions, id);
+        const method = this.safeValue (subscriptions, 'method');
+        if (method !== undefined) {
+            method.call (this, client, message);
+            return;
+        }
+        // handle other APIs
         let event = this.safeString (message, 'e');
         if (Array.isArray (message)) {
             const data = message[0];
             event = this.safeString (data, 'e') + '@arr';
         }
-        method = this.safeValue (methods, event);
-        if (method === undefined) {
+        if (!this.routeMessage (client, message, event)) {
             const requestId = this.safeString (message, 'id');
             if (requestId !== undefined) {
                 this.handleSubscriptionStatus (client, message);
@@ -3067,8 +3069,6 @@ export default class binance extends binanceRest {
                 this.handleTicker (client, message);
                 this.handleTickers (client, message);
             }
-        } else {
-            method.call (this, client, message);
         }
     }
 }